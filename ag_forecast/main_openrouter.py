@@ -12,6 +12,7 @@ from ag_forecast.src.workflows.iterative_research import IterativeResearchWorkfl
 from ag_forecast.src.community.community import Community
 from ag_forecast.src.consensus.base import MeanConsensus
 from ag_forecast.src.utils.logger import ForecastLogger
+from ag_forecast.src.utils.http_clients import close_shared_http_clients
 
 from ag_forecast.src.workflows.schema_agent import SchemaAgent
 from ag_forecast.src.utils.report_generator import ReportGenerator
@@ -98,6 +99,7 @@ async def main():
         
         # Generate Report
         print("\nGenerating Report...")
+        logger.flush()
         report_gen = ReportGenerator(logger.get_run_dir())
         report_gen.generate()
         
@@ -106,6 +108,8 @@ async def main():
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        await close_shared_http_clients()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,11 +1,14 @@
 import os
 import json
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, AsyncIterator, Union, Optional
 from pydantic import BaseModel
 from anthropic import AsyncAnthropic
 from .base import BaseBackend
 
 class AnthropicBackend(BaseBackend):
+    provider = "anthropic"
+    supports_streaming = True
+
     def __init__(self, model_name: str = "claude-3-5-sonnet-20240620", api_key: Optional[str] = None, **kwargs):
         super().__init__(model_name, api_key, **kwargs)
         self.client = AsyncAnthropic(api_key=self.api_key or os.getenv("ANTHROPIC_API_KEY"))
@@ -28,10 +31,28 @@ class AnthropicBackend(BaseBackend):
             kwargs_call["system"] = system_prompt
         kwargs_call.update(kwargs)
 
-        response = await self.client.messages.create(**kwargs_call)
+        async with self._limited():
+            response = await self.client.messages.create(**kwargs_call)
         return response.content[0].text
 
     async def generate_structured(self, messages: List[Dict[str, str]], response_model: type[BaseModel], **kwargs) -> BaseModel:
+        async with self._limited():
+            response = await self.client.messages.create(**self._structured_call_kwargs(messages, response_model, **kwargs))
+        
+        for block in response.content:
+            if block.type == "tool_use" and block.name == "return_structured_output":
+                return response_model.model_validate(block.input)
+        
+        raise ValueError("Model did not call the structured output tool.")
+
+    async def stream_structured(self, messages: List[Dict[str, str]], response_model: type[BaseModel], **kwargs) -> AsyncIterator[str]:
+        # The forced tool call is the only content block, so every JSON delta belongs to it
+        async with self._limited(), self.client.messages.stream(**self._structured_call_kwargs(messages, response_model, **kwargs)) as stream:
+            async for event in stream:
+                if event.type == "input_json":
+                    yield event.partial_json
+
+    def _structured_call_kwargs(self, messages: List[Dict[str, str]], response_model: type[BaseModel], **kwargs) -> Dict[str, Any]:
         # Anthropic doesn't have a native 'parse' like OpenAI yet, so we use tool use to enforce structure
         tool_schema = {
             "name": "return_structured_output",
@@ -60,14 +81,7 @@ class AnthropicBackend(BaseBackend):
         if system_prompt:
             kwargs_call["system"] = system_prompt
         kwargs_call.update(kwargs)
-
-        response = await self.client.messages.create(**kwargs_call)
-        
-        for block in response.content:
-            if block.type == "tool_use" and block.name == "return_structured_output":
-                return response_model.model_validate(block.input)
-        
-        raise ValueError("Model did not call the structured output tool.")
+        return kwargs_call
 
     async def tool_call(self, messages: List[Dict[str, str]], tools: List[Dict[str, Any]], **kwargs) -> Union[str, Dict[str, Any]]:
         # Convert OpenAI-style tools to Anthropic format if necessary, or assume Anthropic format input
@@ -92,7 +106,8 @@ class AnthropicBackend(BaseBackend):
             kwargs_call["system"] = system_prompt
         kwargs_call.update(kwargs)
 
-        response = await self.client.messages.create(**kwargs_call)
+        async with self._limited():
+            response = await self.client.messages.create(**kwargs_call)
         
         if response.stop_reason == "tool_use":
             tool_calls = []
@@ -1,15 +1,38 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional, Union
 from pydantic import BaseModel
+from forecasting_tools.ai_models.resource_managers.adaptive_concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    get_shared_concurrency_limiter,
+)
+from ag_forecast.src.backends.streaming import StructuredStreamParser
 
 class BaseBackend(ABC):
     """Abstract base class for LLM backends."""
 
-    def __init__(self, model_name: str, api_key: Optional[str] = None, **kwargs):
+    # Prefix of the concurrency limiter key, matching the litellm model prefix GeneralLlm uses
+    provider: str = ""
+    # Backends that set this implement `stream_structured`: an async iterator yielding the JSON of a
+    # structured response (matching `response_model`) piece by piece. Closing it early should stop the generation.
+    supports_streaming: bool = False
+    stream_structured: Callable[..., AsyncIterator[str]]
+
+    def __init__(self, model_name: str, api_key: Optional[str] = None,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None, **kwargs):
         self.model_name = model_name
         self.api_key = api_key
+        # Shared with every other backend and GeneralLlm, so all calls to a provider/model back off together
+        self.concurrency_limiter = concurrency_limiter or get_shared_concurrency_limiter()
         self.config = kwargs
 
+    @property
+    def concurrency_key(self) -> str:
+        return f"{self.provider}/{self.model_name}" if self.provider else self.model_name
+
+    def _limited(self):
+        """Holds a concurrency slot for this provider/model around an API call. 429s lower the limit."""
+        return self.concurrency_limiter.slot(self.concurrency_key)
+
     @abstractmethod
     async def generate(self, messages: List[Dict[str, str]], **kwargs) -> str:
         """
@@ -38,6 +61,37 @@ class BaseBackend(ABC):
             An instance of response_model.
         """
         pass
+
+    async def generate_structured_streaming(self, messages: List[Dict[str, str]], response_model: type[BaseModel],
+                                            field_validators: Optional[Dict[str, Callable[[Any], None]]] = None,
+                                            **kwargs) -> BaseModel:
+        """
+        Like `generate_structured`, but each top level field is validated as soon as it is complete.
+        
+        Args:
+            messages: List of message dicts.
+            response_model: The Pydantic model class to enforce structure.
+            field_validators: Checks to run on completed field values. Raising ValueError or SyntaxError
+                aborts the response (raised as StreamValidationError), saving the tokens still to come.
+            **kwargs: Additional parameters.
+            
+        Returns:
+            An instance of response_model. Backends that cannot stream validate it once it is complete.
+        """
+        parser = StructuredStreamParser(response_model, field_validators)
+        if not self.supports_streaming:
+            output = await self.generate_structured(messages, response_model, **kwargs)
+            parser.validate_model(output)
+            return output
+        
+        stream = self.stream_structured(messages, response_model, **kwargs)
+        try:
+            async for delta in stream:
+                parser.feed(delta)
+        finally:
+            # Closes the connection when aborting, so the provider stops generating
+            await stream.aclose()
+        return parser.finish()
     
     @abstractmethod
     async def tool_call(self, messages: List[Dict[str, str]], tools: List[Dict[str, Any]], **kwargs) -> Union[str, Dict[str, Any]]:
@@ -1,10 +1,13 @@
 import os
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, AsyncIterator, Union, Optional
 from pydantic import BaseModel
 from openai import AsyncOpenAI
 from .base import BaseBackend
 
 class OpenAIBackend(BaseBackend):
+    provider = "openai"
+    supports_streaming = True
+
     def __init__(self, model_name: str = "gpt-4o", api_key: Optional[str] = None, base_url: Optional[str] = None, **kwargs):
         super().__init__(model_name, api_key, **kwargs)
         client_kwargs = {"api_key": self.api_key or os.getenv("OPENAI_API_KEY")}
@@ -13,30 +16,44 @@ class OpenAIBackend(BaseBackend):
         self.client = AsyncOpenAI(**client_kwargs)
 
     async def generate(self, messages: List[Dict[str, str]], **kwargs) -> str:
-        response = await self.client.chat.completions.create(
-            model=self.model_name,
-            messages=messages,
-            **kwargs
-        )
+        async with self._limited():
+            response = await self.client.chat.completions.create(
+                model=self.model_name,
+                messages=messages,
+                **kwargs
+            )
         return response.choices[0].message.content
 
     async def generate_structured(self, messages: List[Dict[str, str]], response_model: type[BaseModel], **kwargs) -> BaseModel:
-        response = await self.client.beta.chat.completions.parse(
+        async with self._limited():
+            response = await self.client.beta.chat.completions.parse(
+                model=self.model_name,
+                messages=messages,
+                response_format=response_model,
+                **kwargs
+            )
+        return response.choices[0].message.parsed
+
+    async def stream_structured(self, messages: List[Dict[str, str]], response_model: type[BaseModel], **kwargs) -> AsyncIterator[str]:
+        async with self._limited(), self.client.beta.chat.completions.stream(
             model=self.model_name,
             messages=messages,
             response_format=response_model,
             **kwargs
-        )
-        return response.choices[0].message.parsed
+        ) as stream:
+            async for event in stream:
+                if event.type == "content.delta":
+                    yield event.delta
 
     async def tool_call(self, messages: List[Dict[str, str]], tools: List[Dict[str, Any]], **kwargs) -> Union[str, Dict[str, Any]]:
-        response = await self.client.chat.completions.create(
-            model=self.model_name,
-            messages=messages,
-            tools=tools,
-            tool_choice="auto",
-            **kwargs
-        )
+        async with self._limited():
+            response = await self.client.chat.completions.create(
+                model=self.model_name,
+                messages=messages,
+                tools=tools,
+                tool_choice="auto",
+                **kwargs
+            )
         message = response.choices[0].message
         if message.tool_calls:
             return {
@@ -3,6 +3,8 @@ from typing import Optional
 from .openai_backend import OpenAIBackend
 
 class OpenRouterBackend(OpenAIBackend):
+    provider = "openrouter"
+
     def __init__(self, model_name: str = "openai/gpt-4o", api_key: Optional[str] = None, **kwargs):
         # OpenRouter uses the OpenAI client but with a different base URL
         api_key = api_key or os.getenv("OPENROUTER_API_KEY")
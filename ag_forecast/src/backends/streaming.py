@@ -0,0 +1,81 @@
+from typing import Any, Callable, Dict, Optional, Set
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import from_json
+
+# Re-parsing the whole buffer on every token would be quadratic, so it is done every this many characters
+DEFAULT_PARSE_EVERY_CHARS = 200
+
+
+class StreamValidationError(ValueError):
+    """Raised while a structured response is still streaming, so the rest of it is not generated."""
+
+    def __init__(self, field: str, error: Exception):
+        super().__init__(f"Field `{field}` failed validation: {error}")
+        self.field = field
+        self.error = error
+
+
+class StructuredStreamParser:
+    """
+    Incrementally parses the JSON of a structured response as it streams in.
+
+    A top level field is complete once the next field has started (or the response has ended).
+    Each completed field is checked against its type on `response_model` and passed to its
+    validator in `field_validators`, if any. A failure raises `StreamValidationError` right away.
+    """
+
+    def __init__(
+        self,
+        response_model: type[BaseModel],
+        field_validators: Optional[Dict[str, Callable[[Any], None]]] = None,
+        parse_every_chars: int = DEFAULT_PARSE_EVERY_CHARS,
+    ):
+        self.response_model = response_model
+        self.field_validators = field_validators or {}
+        self.parse_every_chars = parse_every_chars
+        self.buffer = ""
+        self.completed_fields: Set[str] = set()
+        self._parsed_length = 0
+
+    def feed(self, delta: str):
+        self.buffer += delta
+        if len(self.buffer) - self._parsed_length < self.parse_every_chars:
+            return
+        self._parsed_length = len(self.buffer)
+        try:
+            # Keeps a trailing incomplete string, so a field shows up as soon as its value starts
+            partial = from_json(self.buffer, allow_partial="trailing-strings")
+        except ValueError:
+            # Not decidable mid-token (e.g. a half written escape), the final parse reports real errors
+            return
+        if not isinstance(partial, dict):
+            raise StreamValidationError("<root>", ValueError("Response is not a JSON object."))
+        # Keys come in generation order, all but the last one are finished
+        for field in list(partial)[:-1]:
+            self._complete_field(field, partial[field])
+
+    def finish(self) -> BaseModel:
+        """Parses and validates the whole response once the stream has ended."""
+        output = self.response_model.model_validate_json(self.buffer)
+        self.validate_model(output)
+        return output
+
+    def validate_model(self, output: BaseModel):
+        """Runs the validators of every field that has not been validated yet."""
+        for field in self.field_validators:
+            if field not in self.completed_fields:
+                self._complete_field(field, getattr(output, field))
+
+    def _complete_field(self, field: str, value: Any):
+        if field in self.completed_fields:
+            return
+        self.completed_fields.add(field)
+        model_field = self.response_model.model_fields.get(field)
+        try:
+            if model_field is not None:
+                value = TypeAdapter(model_field.annotation).validate_python(value)
+            if field in self.field_validators:
+                self.field_validators[field](value)
+        except (ValidationError, ValueError, TypeError, SyntaxError) as e:
+            raise StreamValidationError(field, e) from e
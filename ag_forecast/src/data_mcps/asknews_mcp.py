@@ -1,5 +1,7 @@
 from typing import Any
 
+from asknews_sdk import AsyncAskNewsSDK
+
 from forecasting_tools.helpers.asknews_searcher import AskNewsSearcher
 
 from .base import BaseDataMCP
@@ -11,7 +13,17 @@ class AskNewsMCP(BaseDataMCP):
         self.searcher = AskNewsSearcher(client_id=client_id, client_secret=client_secret)
 
     async def search(self, query: str, **kwargs: Any) -> list[dict[str, Any]]:
-        formatted_news = await self.searcher.get_formatted_news_async(query)
+        # One SDK client per loop keeps its connections and OAuth token between queries
+        sdk = self.http_clients.get_or_create(
+            f"asknews:{self.searcher.client_id}",
+            lambda: AsyncAskNewsSDK(
+                client_id=self.searcher.client_id,
+                client_secret=self.searcher.client_secret,
+                scopes={"news"},
+            ),
+            lambda sdk: sdk.close(),
+        )
+        formatted_news = await self.searcher.get_formatted_news_async(query, sdk=sdk)
         return [
             {
                 "content": formatted_news,
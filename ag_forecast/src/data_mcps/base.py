@@ -1,13 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import httpx
+from ag_forecast.src.utils.http_clients import HttpClientRegistry, get_shared_http_clients
 
 class BaseDataMCP(ABC):
     """Abstract base class for Data MCPs (Search APIs)."""
 
-    def __init__(self, api_key: str = None, **kwargs):
+    def __init__(self, api_key: str = None, http_clients: Optional[HttpClientRegistry] = None, **kwargs):
         self.api_key = api_key
+        self.http_clients = http_clients or get_shared_http_clients()
         self.config = kwargs
 
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Pooled client to make requests with. Do not close it, the registry owns it."""
+        return self.http_clients.get_client()
+
     @abstractmethod
     async def search(self, query: str, **kwargs) -> List[Dict[str, Any]]:
         """
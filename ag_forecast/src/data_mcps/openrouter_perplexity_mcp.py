@@ -1,5 +1,4 @@
 import os
-import httpx
 from typing import List, Dict, Any
 from .base import BaseDataMCP
 from ag_forecast.src.prompts import PERPLEXITY_SYSTEM_PROMPT
@@ -33,33 +32,32 @@ class OpenRouterPerplexityMCP(BaseDataMCP):
             **kwargs
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(self.base_url, json=payload, headers=headers)
-            if response.status_code != 200:
-                error_msg = f"OpenRouter Error {response.status_code}: {response.text}"
-                raise Exception(error_msg)
-            
-            data = response.json()
-            
-            message = data["choices"][0]["message"]
-            content = message["content"]
-            
-            # Citation Parsing Logic
-            citations = []
-            
-            # 1. Check for OpenAI Search 'annotations' format
-            if "annotations" in message:
-                for annotation in message["annotations"]:
-                    if annotation.get("type") == "url_citation":
-                        cit = annotation.get("url_citation", {})
-                        citations.append(cit.get("url"))
-            
-            # 2. Check for Perplexity 'citations' format (top-level)
-            elif "citations" in data:
-                citations = data["citations"]
-            
-            return [{
-                "content": content,
-                "citations": citations,
-                "source": "perplexity_openrouter"
-            }]
+        response = await self.http_client.post(self.base_url, json=payload, headers=headers, timeout=30.0)
+        if response.status_code != 200:
+            error_msg = f"OpenRouter Error {response.status_code}: {response.text}"
+            raise Exception(error_msg)
+        
+        data = response.json()
+        
+        message = data["choices"][0]["message"]
+        content = message["content"]
+        
+        # Citation Parsing Logic
+        citations = []
+        
+        # 1. Check for OpenAI Search 'annotations' format
+        if "annotations" in message:
+            for annotation in message["annotations"]:
+                if annotation.get("type") == "url_citation":
+                    cit = annotation.get("url_citation", {})
+                    citations.append(cit.get("url"))
+        
+        # 2. Check for Perplexity 'citations' format (top-level)
+        elif "citations" in data:
+            citations = data["citations"]
+        
+        return [{
+            "content": content,
+            "citations": citations,
+            "source": "perplexity_openrouter"
+        }]
@@ -1,5 +1,4 @@
 import os
-import httpx
 from typing import List, Dict, Any
 from .base import BaseDataMCP
 
@@ -28,17 +27,16 @@ class PerplexityMCP(BaseDataMCP):
             **kwargs
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(self.base_url, json=payload, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            
-            content = data["choices"][0]["message"]["content"]
-            citations = data.get("citations", [])
-            
-            # Return as a structured result
-            return [{
-                "content": content,
-                "citations": citations,
-                "source": "perplexity"
-            }]
+        response = await self.http_client.post(self.base_url, json=payload, headers=headers)
+        response.raise_for_status()
+        data = response.json()
+        
+        content = data["choices"][0]["message"]["content"]
+        citations = data.get("citations", [])
+        
+        # Return as a structured result
+        return [{
+            "content": content,
+            "citations": citations,
+            "source": "perplexity"
+        }]
@@ -103,3 +103,11 @@ SCHEMA_AGENT_SYSTEM_PROMPT = (
 )
 
 SCHEMA_AGENT_USER_PROMPT = "Question: {question}\n\nGlobal Context: {context}\n\nDefine the prediction schema."
+
+# Context Compaction Prompts
+CONTEXT_COMPACTION_SYSTEM_PROMPT = (
+    "You condense research notes for forecasters. Merge the notes into one summary of at most {max_tokens} tokens. "
+    "Keep every concrete fact, number, date, source and open question. Drop repetition and filler."
+)
+
+CONTEXT_COMPACTION_USER_PROMPT = "Research Notes:\n\n{notes}"
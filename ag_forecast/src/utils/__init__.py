@@ -1,3 +1,6 @@
 from .logger import ForecastLogger
+from .code_sandbox import CodeSandbox
+from .search_cache import SearchCache
+from .context_compactor import ContextCompactor
 
-__all__ = ['ForecastLogger']
+__all__ = ['ForecastLogger', 'CodeSandbox', 'SearchCache', 'ContextCompactor']
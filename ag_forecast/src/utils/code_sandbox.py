@@ -0,0 +1,245 @@
+import asyncio
+import atexit
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Dict, Any, List, Optional, Sequence, Set, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+DEFAULT_PRELOADED_MODULES = ("numpy", "scipy.stats")
+
+
+class SandboxTimeoutError(TimeoutError):
+    """Raised when generated code runs past its CPU or wall-clock time limit."""
+
+
+def _raise_cpu_time_exceeded(signum, frame):
+    raise SandboxTimeoutError("`predict` exceeded its CPU time limit.")
+
+
+def _initialize_worker(preloaded_modules: Sequence[str], memory_limit_mb: Optional[int]):
+    """Runs once per worker process so each call does not pay for heavy imports."""
+    # One BLAS thread per worker, the pool itself provides the parallelism
+    os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+    os.environ.setdefault("MKL_NUM_THREADS", "1")
+    for module_name in preloaded_modules:
+        try:
+            __import__(module_name)
+        except ImportError:
+            pass
+    if resource is None:
+        return
+    signal.signal(signal.SIGXCPU, _raise_cpu_time_exceeded)
+    if memory_limit_mb:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit_mb * 1024 * 1024, hard))
+
+
+def _set_cpu_time_limit(cpu_time_limit_seconds: Optional[float]):
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if cpu_time_limit_seconds is None:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+        return
+    # RLIMIT_CPU counts the whole life of the worker, so the limit is relative to time already used
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    cpu_time_used = usage.ru_utime + usage.ru_stime
+    soft = int(cpu_time_used + cpu_time_limit_seconds) + 1
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _run_predict(code: str, cpu_time_limit_seconds: Optional[float]) -> Dict[str, Any]:
+    if resource is not None:
+        _set_cpu_time_limit(cpu_time_limit_seconds)
+    try:
+        namespace: Dict[str, Any] = {}
+        exec(code, namespace)
+        if "predict" not in namespace:
+            raise ValueError("Function `predict` not found in generated code.")
+        prediction = namespace["predict"]()
+        if not isinstance(prediction, dict):
+            raise ValueError("`predict` function must return a dictionary.")
+        return prediction
+    finally:
+        if resource is not None:
+            _set_cpu_time_limit(None)
+
+
+def _worker_main(connection: Connection, preloaded_modules: Sequence[str], memory_limit_mb: Optional[int]):
+    """Runs calls sent over `connection` one at a time until it is closed."""
+    _initialize_worker(preloaded_modules, memory_limit_mb)
+    connection.send(True)  # Ready, so start up is not counted against the first call's time limit
+    while True:
+        try:
+            code, cpu_time_limit_seconds = connection.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            reply: Tuple[bool, Any] = (True, _run_predict(code, cpu_time_limit_seconds))
+        except BaseException as e:
+            reply = (False, e)
+        try:
+            connection.send(reply)
+        except Exception as e:
+            # e.g. an exception class defined by the generated code cannot be pickled
+            connection.send((False, RuntimeError(f"`predict` failed with an error that could not be sent back: {reply[1]!r} ({e})")))
+
+
+@dataclass(eq=False)
+class _Worker:
+    process: BaseProcess
+    connection: Connection
+
+
+class CodeSandbox:
+    """
+    Runs LLM-generated `predict()` code in a bounded pool of worker processes.
+
+    Heavy models (e.g. large Monte Carlo simulations) run in parallel across cores
+    without blocking the event loop. Each call gets a CPU time limit, each worker a
+    memory limit, and a wall-clock limit catches code that blocks without using CPU.
+    Workers are started with NumPy/SciPy already imported and are reused between calls.
+    Each worker runs one call at a time, so a call that hits the wall-clock limit or
+    crashes only takes down its own worker, which is replaced on the next call.
+    CPU and memory limits are only enforced where the `resource` module exists (not Windows).
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        cpu_time_limit_seconds: Optional[float] = 60,
+        memory_limit_mb: Optional[int] = 2048,
+        wall_time_limit_seconds: Optional[float] = 120,
+        preloaded_modules: Sequence[str] = DEFAULT_PRELOADED_MODULES,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cpu_time_limit_seconds = cpu_time_limit_seconds
+        self.memory_limit_mb = memory_limit_mb
+        self.wall_time_limit_seconds = wall_time_limit_seconds
+        self.preloaded_modules = tuple(preloaded_modules)
+        # One thread waits on each busy worker, so the thread pool also bounds the number of calls
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._idle_workers: List[_Worker] = []
+        self._workers: Set[_Worker] = set()
+        self._lock = threading.Lock()
+
+    def _get_threads(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="code-sandbox")
+            return self._threads
+
+    async def warm_up(self):
+        """Starts every worker now rather than on the first calls."""
+        with self._lock:
+            missing = self.max_workers - len(self._workers)
+        new_workers = await asyncio.gather(*[asyncio.to_thread(self._start_worker) for _ in range(missing)])
+        with self._lock:
+            self._idle_workers.extend(new_workers)
+
+    async def run_predict(self, code: str) -> Dict[str, Any]:
+        """
+        Executes `code` in a worker and returns the result of its `predict()` function.
+        Errors raised by the code (and limit violations) are raised here.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_threads(), self._call_worker, code)
+
+    def _call_worker(self, code: str) -> Dict[str, Any]:
+        worker = self._take_idle_worker()
+        try:
+            worker.connection.send((code, self.cpu_time_limit_seconds))
+            finished = worker.connection.poll(self.wall_time_limit_seconds)
+            if finished:
+                succeeded, value = worker.connection.recv()
+        except (EOFError, OSError):
+            # Only this call ran in the worker, e.g. it was killed by the OS for running out of memory
+            self._kill_worker(worker)
+            raise RuntimeError("`predict` crashed its worker process, possibly by running out of memory.")
+        if not finished:
+            # The stuck call cannot be interrupted, so its worker is replaced
+            self._kill_worker(worker)
+            raise SandboxTimeoutError(
+                f"`predict` did not finish within {self.wall_time_limit_seconds} seconds."
+            )
+        self._return_idle_worker(worker)
+        if not succeeded:
+            raise value
+        return value
+
+    def _start_worker(self) -> _Worker:
+        # Forking a process with a running event loop and threads is unsafe
+        context = multiprocessing.get_context("spawn")
+        parent_connection, child_connection = context.Pipe()
+        process = context.Process(
+            target=_worker_main,
+            args=(child_connection, self.preloaded_modules, self.memory_limit_mb),
+            daemon=True,
+        )
+        process.start()
+        child_connection.close()
+        worker = _Worker(process, parent_connection)
+        with self._lock:
+            self._workers.add(worker)
+        try:
+            worker.connection.recv()
+        except (EOFError, OSError):
+            self._kill_worker(worker)
+            raise RuntimeError("A sandbox worker process failed to start.")
+        return worker
+
+    def _take_idle_worker(self) -> _Worker:
+        with self._lock:
+            while self._idle_workers:
+                worker = self._idle_workers.pop()
+                if worker.process.is_alive():
+                    return worker
+                self._workers.discard(worker)
+        return self._start_worker()
+
+    def _return_idle_worker(self, worker: _Worker):
+        with self._lock:
+            if worker in self._workers:
+                self._idle_workers.append(worker)
+
+    def _kill_worker(self, worker: _Worker):
+        with self._lock:
+            self._workers.discard(worker)
+            if worker in self._idle_workers:
+                self._idle_workers.remove(worker)
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join()
+        worker.connection.close()
+
+    def shutdown(self):
+        with self._lock:
+            threads, self._threads = self._threads, None
+            workers = list(self._workers)
+        for worker in workers:
+            self._kill_worker(worker)
+        if threads is not None:
+            threads.shutdown(wait=True, cancel_futures=True)
+
+
+_shared_sandbox: Optional[CodeSandbox] = None
+
+
+def get_shared_sandbox() -> CodeSandbox:
+    """Sandbox shared by all researchers that are not given their own. It is shut down on exit."""
+    global _shared_sandbox
+    if _shared_sandbox is None:
+        _shared_sandbox = CodeSandbox()
+        atexit.register(_shared_sandbox.shutdown)
+    return _shared_sandbox
@@ -0,0 +1,266 @@
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from ag_forecast.src.backends.base import BaseBackend
+from ag_forecast.src.prompts import CONTEXT_COMPACTION_SYSTEM_PROMPT, CONTEXT_COMPACTION_USER_PROMPT
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Shorter lines (headers, separators, "Q: ...") are never dropped as duplicates
+MIN_DEDUPLICATED_LINE_LENGTH = 40
+# Used when no tokenizer is available
+APPROX_CHARS_PER_TOKEN = 4
+# A chunk is only cut to fit a budget if at least this much of it would be kept
+MIN_TRUNCATED_CHUNK_TOKENS = 50
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(encoding_name: str):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception:
+        # The encoding is downloaded on first use, which fails offline
+        return None
+
+
+@dataclass(eq=False)
+class ContextChunk:
+    text: str
+    tokens: int
+    round_num: int
+    # Tokens of the text as added, before deduplication
+    raw_tokens: int
+    is_summary: bool = False
+
+
+@dataclass
+class CompactionStats:
+    tokens_added: int = 0
+    tokens_deduplicated: int = 0
+    tokens_summarized: int = 0
+    summaries: int = 0
+    prompts: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    tokens_sent: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    # Compared with sending every chunk in full, as before compaction
+    tokens_saved: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tokens_added": self.tokens_added,
+            "tokens_deduplicated": self.tokens_deduplicated,
+            "tokens_summarized": self.tokens_summarized,
+            "summaries": self.summaries,
+            "agents": {
+                agent: {
+                    "prompts": self.prompts[agent],
+                    "tokens_sent": self.tokens_sent[agent],
+                    "tokens_saved": self.tokens_saved[agent],
+                }
+                for agent in self.prompts
+            },
+        }
+
+
+class ContextCompactor:
+    """
+    Settings and metrics shared by the `ResearchContext` of every question.
+
+    Research context grows every round and is sent in full to several agents, so
+    prompt size grows quadratically with rounds. A context built here:
+    - drops lines already seen earlier in the same context (overlapping search results)
+    - replaces older rounds with one LLM summary once it is over `summarize_after_tokens`
+      (only when a `summarizer` backend is given)
+    - is cut to the token budget of the agent it is rendered for, keeping summaries and
+      the newest rounds first (agents without a budget get everything)
+
+    Tokens are counted with tiktoken when it and its encoding are available, otherwise estimated.
+    """
+
+    def __init__(
+        self,
+        summarizer: Optional[BaseBackend] = None,
+        agent_token_budgets: Optional[Dict[str, int]] = None,
+        summarize_after_tokens: int = 8000,
+        summary_max_tokens: int = 1500,
+        keep_recent_rounds: int = 1,
+        deduplicate: bool = True,
+        encoding_name: str = "o200k_base",
+    ):
+        self.summarizer = summarizer
+        self.agent_token_budgets = agent_token_budgets or {}
+        self.summarize_after_tokens = summarize_after_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.keep_recent_rounds = keep_recent_rounds
+        self.deduplicate = deduplicate
+        self.encoding_name = encoding_name
+        self.stats = CompactionStats()
+
+    def count_tokens(self, text: str) -> int:
+        encoding = _get_encoding(self.encoding_name)
+        if encoding is None:
+            return (len(text) + APPROX_CHARS_PER_TOKEN - 1) // APPROX_CHARS_PER_TOKEN
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Keeps the first `max_tokens` tokens of `text`."""
+        encoding = _get_encoding(self.encoding_name)
+        if encoding is None:
+            return text[:max_tokens * APPROX_CHARS_PER_TOKEN]
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+
+    def new_context(self) -> "ResearchContext":
+        return ResearchContext(self)
+
+    def summary(self) -> Dict[str, Any]:
+        return self.stats.to_dict()
+
+
+class ResearchContext:
+    """The research gathered for one question, as chunks added round by round."""
+
+    def __init__(self, compactor: ContextCompactor):
+        self.compactor = compactor
+        self.chunks: List[ContextChunk] = []
+        self._seen_lines = set()
+        self._compacting = False
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def tokens(self) -> int:
+        return sum(chunk.tokens for chunk in self.chunks)
+
+    def add(self, text: str, round_num: int = 0) -> ContextChunk:
+        raw_tokens = self.compactor.count_tokens(text)
+        if self.compactor.deduplicate:
+            text = self._deduplicate(text)
+        tokens = self.compactor.count_tokens(text)
+        self.compactor.stats.tokens_added += raw_tokens
+        self.compactor.stats.tokens_deduplicated += raw_tokens - tokens
+        chunk = ContextChunk(text=text, tokens=tokens, round_num=round_num, raw_tokens=raw_tokens)
+        self.chunks.append(chunk)
+        return chunk
+
+    def replace(self, chunk: ContextChunk, text: str) -> ContextChunk:
+        """Puts `text` where `chunk` was (or at the end if it has been summarized away)."""
+        if chunk in self.chunks:
+            # Lines of the replaced chunk are no longer in the context, so the new text may repeat them
+            for line in chunk.text.split("\n"):
+                self._seen_lines.discard(self._line_digest(line))
+        new_chunk = self.add(text, chunk.round_num)
+        if chunk in self.chunks:
+            self.chunks.remove(new_chunk)
+            self.chunks[self.chunks.index(chunk)] = new_chunk
+        return new_chunk
+
+    def render(self, agent: str) -> str:
+        """The context to send to `agent`, within its token budget."""
+        budget = self.compactor.agent_token_budgets.get(agent)
+        chunks = self.chunks
+        if budget is not None and self.tokens > budget:
+            chunks = self._fit(budget)
+        text = "\n\n".join(chunk.text for chunk in chunks)
+
+        stats = self.compactor.stats
+        tokens_sent = sum(chunk.tokens for chunk in chunks)
+        stats.prompts[agent] += 1
+        stats.tokens_sent[agent] += tokens_sent
+        stats.tokens_saved[agent] += max(0, sum(chunk.raw_tokens for chunk in self.chunks) - tokens_sent)
+        return text
+
+    async def compact(self) -> bool:
+        """
+        Replaces the chunks of all but the `keep_recent_rounds` latest rounds with one summary,
+        if the context is over `summarize_after_tokens`. Returns whether anything was summarized.
+        """
+        compactor = self.compactor
+        if compactor.summarizer is None or self._compacting or self.tokens <= compactor.summarize_after_tokens:
+            return False
+        latest_round = max(chunk.round_num for chunk in self.chunks)
+        old_chunks = [chunk for chunk in self.chunks if chunk.round_num <= latest_round - compactor.keep_recent_rounds]
+        if not old_chunks or (len(old_chunks) == 1 and old_chunks[0].is_summary):
+            return False
+
+        self._compacting = True
+        try:
+            messages = [
+                {"role": "system", "content": CONTEXT_COMPACTION_SYSTEM_PROMPT.format(
+                    max_tokens=compactor.summary_max_tokens
+                )},
+                {"role": "user", "content": CONTEXT_COMPACTION_USER_PROMPT.format(
+                    notes="\n\n".join(chunk.text for chunk in old_chunks)
+                )},
+            ]
+            summary = await compactor.summarizer.generate(messages)
+        finally:
+            self._compacting = False
+
+        summary_text = f"--- Summary of Earlier Research ---\n{summary}"
+        summary_tokens = compactor.count_tokens(summary_text)
+        old_tokens = sum(chunk.tokens for chunk in old_chunks)
+        if summary_tokens >= old_tokens:
+            return False
+        # Chunks added while the summary was being written are kept
+        self.chunks = [chunk for chunk in self.chunks if chunk not in old_chunks]
+        self.chunks.insert(0, ContextChunk(
+            text=summary_text,
+            tokens=summary_tokens,
+            round_num=max(chunk.round_num for chunk in old_chunks),
+            raw_tokens=sum(chunk.raw_tokens for chunk in old_chunks),
+            is_summary=True,
+        ))
+        compactor.stats.tokens_summarized += old_tokens - summary_tokens
+        compactor.stats.summaries += 1
+        return True
+
+    def _deduplicate(self, text: str) -> str:
+        kept_lines = []
+        for line in text.split("\n"):
+            digest = self._line_digest(line)
+            if digest is not None:
+                if digest in self._seen_lines:
+                    continue
+                self._seen_lines.add(digest)
+            kept_lines.append(line)
+        return "\n".join(kept_lines)
+
+    @staticmethod
+    def _line_digest(line: str) -> Optional[bytes]:
+        """Short lines (e.g. blank lines and headers) are not deduplicated, so they have no digest."""
+        normalized = " ".join(line.lower().split())
+        if len(normalized) < MIN_DEDUPLICATED_LINE_LENGTH:
+            return None
+        return hashlib.sha1(normalized.encode()).digest()
+
+    def _fit(self, budget: int) -> List[ContextChunk]:
+        # Summaries first, then the newest rounds. The first chunk that does not fit is cut.
+        by_priority = sorted(
+            range(len(self.chunks)),
+            key=lambda i: (not self.chunks[i].is_summary, -i),
+        )
+        kept: Dict[int, ContextChunk] = {}
+        remaining = budget
+        for i in by_priority:
+            chunk = self.chunks[i]
+            if chunk.tokens <= remaining:
+                kept[i] = chunk
+                remaining -= chunk.tokens
+            elif remaining >= MIN_TRUNCATED_CHUNK_TOKENS:
+                text = self.compactor.truncate(chunk.text, remaining) + "\n[... cut to fit the context budget ...]"
+                kept[i] = ContextChunk(text=text, tokens=remaining, round_num=chunk.round_num, raw_tokens=0)
+                remaining = 0
+        omitted_tokens = sum(chunk.tokens for i, chunk in enumerate(self.chunks) if i not in kept)
+        fitted = [kept[i] for i in sorted(kept)]
+        if omitted_tokens:
+            note = f"[{omitted_tokens} tokens of earlier research omitted to fit the context budget]"
+            fitted.insert(0, ContextChunk(text=note, tokens=0, round_num=0, raw_tokens=0))
+        return fitted
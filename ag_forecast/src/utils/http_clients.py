@@ -0,0 +1,76 @@
+import asyncio
+import importlib.util
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60)
+DEFAULT_TIMEOUT = httpx.Timeout(30.0)
+
+
+class HttpClientRegistry:
+    """
+    Long-lived HTTP clients shared by every data MCP, so repeated searches reuse
+    keep-alive connections (httpx pools connections per host) instead of paying
+    for a new TLS handshake each time. HTTP/2 is used when the `h2` package is installed.
+
+    Clients can only be used on the event loop they were made on, so there is one set
+    per loop. `aclose()` closes the current loop's clients; they are recreated if used again.
+    """
+
+    def __init__(
+        self,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        http2: Optional[bool] = None,
+        **client_kwargs: Any,
+    ):
+        self.limits = limits
+        self.timeout = timeout
+        self.http2 = importlib.util.find_spec("h2") is not None if http2 is None else http2
+        # Passed on to every httpx.AsyncClient (e.g. proxy, headers, transport)
+        self.client_kwargs = client_kwargs
+        self._resources: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, Dict[str, Tuple[Any, Callable[[Any], Awaitable[None]]]]
+        ] = weakref.WeakKeyDictionary()
+
+    def get_client(self, name: str = "default") -> httpx.AsyncClient:
+        return self.get_or_create(
+            f"httpx:{name}",
+            lambda: httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=self.http2, **self.client_kwargs),
+            lambda client: client.aclose(),
+        )
+
+    def get_or_create(self, key: str, factory: Callable[[], T], close: Callable[[T], Awaitable[None]]) -> T:
+        """
+        Returns the resource (e.g. an SDK client that keeps its own connection pool)
+        stored under `key` for the current loop, making it with `factory` if needed.
+        `close` is awaited for it on `aclose()`.
+        """
+        resources = self._resources.setdefault(asyncio.get_running_loop(), {})
+        if key not in resources:
+            resources[key] = (factory(), close)
+        return resources[key][0]
+
+    async def aclose(self):
+        resources = self._resources.pop(asyncio.get_running_loop(), {})
+        await asyncio.gather(
+            *[close(resource) for resource, close in resources.values()],
+            return_exceptions=True,
+        )
+
+
+_shared_registry = HttpClientRegistry()
+
+
+def get_shared_http_clients() -> HttpClientRegistry:
+    """Registry used by all data MCPs unless they are given their own."""
+    return _shared_registry
+
+
+async def close_shared_http_clients():
+    """Call before the event loop ends (e.g. at the end of `main`) to close connections cleanly."""
+    await _shared_registry.aclose()
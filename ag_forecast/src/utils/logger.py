@@ -1,14 +1,128 @@
+import contextvars
+import gzip
+import itertools
 import logging
 import os
 import json
+import queue
+import re
+import threading
+import uuid
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+class _BackgroundWriter:
+    """
+    Writes files from a dedicated thread so logging never blocks the event loop on disk IO.
+    Pending writes are batched: each batch opens every file it touches once.
+    The queue is bounded, so callers wait (rather than memory growing) if the disk falls behind.
+    Paths ending in `.gz` are appended to as gzip.
+    """
+
+    MAX_BATCH_SIZE = 1000
+
+    def __init__(self, max_pending_writes: int = 10_000):
+        self._queue: "queue.Queue[Optional[Tuple[str, Path, str]]]" = queue.Queue(maxsize=max_pending_writes)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="ForecastLoggerWriter", daemon=True)
+        self._thread.start()
+
+    def append(self, path: Path, text: str):
+        self._put(("append", path, text))
+
+    def write(self, path: Path, text: str):
+        self._put(("write", path, text))
+
+    def flush(self):
+        """Blocks until everything queued so far is on disk."""
+        self._queue.join()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _put(self, item: Tuple[str, Path, str]):
+        if self._closed:
+            raise RuntimeError("Cannot write with a closed ForecastLogger")
+        self._queue.put(item)
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while len(batch) < self.MAX_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            items = [item for item in batch if item is not None]
+            stop = len(items) != len(batch)
+            try:
+                self._write_batch(items)
+            except Exception:
+                logging.getLogger("ForecastBot").exception("Failed to write log files")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, items: List[Tuple[str, Path, str]]):
+        pending_appends: Dict[Path, List[str]] = {}
+        for mode, path, text in items:
+            if mode == "append":
+                pending_appends.setdefault(path, []).append(text)
+                continue
+            if path in pending_appends:
+                self._append_to_file(path, pending_appends.pop(path))
+            with open(path, 'w') as f:
+                f.write(text)
+        for path, texts in pending_appends.items():
+            self._append_to_file(path, texts)
+
+    @staticmethod
+    def _append_to_file(path: Path, texts: List[str]):
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, 'at') as f:
+            f.write("".join(texts))
+
+
+class _LogScope:
+    """Where events and data files go, either for the whole run or for a single question."""
+
+    def __init__(self, scope_id: str, directory: Path, events_file_name: str, label: Optional[str] = None):
+        self.scope_id = scope_id
+        self.label = label
+        self.directory = directory
+        self.retrieval_dir = directory / "retrieval"
+        self.consensus_dir = directory / "consensus"
+        self.code_dir = directory / "code"
+        for path in [self.directory, self.retrieval_dir, self.consensus_dir, self.code_dir]:
+            path.mkdir(parents=True, exist_ok=True)
+        self.events_file = directory / events_file_name
+        self._event_numbers = itertools.count()
+
+    def next_event_id(self) -> str:
+        return f"{self.scope_id}-{next(self._event_numbers)}"
+
 
 class ForecastLogger:
-    """Logger for forecasting bot with unique file per execution."""
+    """
+    Logger for forecasting bot with unique file per execution.
+
+    Event and data files are written by a background thread. Call `flush()` before
+    reading them back in the same process (e.g. to generate a report) and `close()` when done.
+
+    Inside `question_scope(...)` (including any tasks started within it) events and data
+    files go to that question's own directory under `questions/`, so concurrent questions
+    do not overwrite each other. Event ids are unique across the whole run.
+    """
     
-    def __init__(self, base_dir: str = "logs"):
+    def __init__(self, base_dir: str = "logs", compress_events: bool = False, max_pending_writes: int = 10_000):
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(exist_ok=True)
         
@@ -17,19 +131,15 @@ class ForecastLogger:
         self.run_dir = self.base_dir / f"run_{timestamp}"
         self.run_dir.mkdir(exist_ok=True)
         
-        # Create subdirectories
-        self.retrieval_dir = self.run_dir / "retrieval"
-        self.retrieval_dir.mkdir(exist_ok=True)
-        
-        self.consensus_dir = self.run_dir / "consensus"
-        self.consensus_dir.mkdir(exist_ok=True)
-        
-        self.code_dir = self.run_dir / "code"
-        self.code_dir.mkdir(exist_ok=True)
+        # Events and data files outside of any question scope
+        self._events_file_name = "events.jsonl.gz" if compress_events else "events.jsonl"
+        self._run_scope = _LogScope("run", self.run_dir, self._events_file_name)
+        self._current_scope: contextvars.ContextVar[Optional[_LogScope]] = contextvars.ContextVar(
+            f"forecast_logger_scope_{id(self)}", default=None
+        )
         
         # Log files
         self.log_file = self.base_dir / f"forecast_{timestamp}.log"
-        self.events_file = self.run_dir / "events.jsonl"
         
         # Setup logging
         self.logger = logging.getLogger("ForecastBot")
@@ -45,11 +155,62 @@ class ForecastLogger:
         ch.setFormatter(logging.Formatter('%(message)s'))
         self.logger.addHandler(ch)
         
-        self.event_count = 0
+        self._writer = _BackgroundWriter(max_pending_writes)
+        # Makes sure queued writes reach disk even if close() is never called
+        self._close_writer = weakref.finalize(self, self._writer.close)
+
+    @property
+    def _scope(self) -> _LogScope:
+        return self._current_scope.get() or self._run_scope
+
+    @property
+    def retrieval_dir(self) -> Path:
+        return self._scope.retrieval_dir
+
+    @property
+    def consensus_dir(self) -> Path:
+        return self._scope.consensus_dir
+
+    @property
+    def code_dir(self) -> Path:
+        return self._scope.code_dir
+
+    @property
+    def events_file(self) -> Path:
+        return self._scope.events_file
+
+    @contextmanager
+    def question_scope(self, question: str) -> Iterator[str]:
+        """
+        Sends everything logged in this context to a directory for this question.
+        Yields the question's scope id, which prefixes all of its event ids.
+        """
+        scope_id = uuid.uuid4().hex[:12]
+        slug = re.sub(r"[^a-zA-Z0-9]+", "_", question).strip("_")[:40]
+        scope = _LogScope(
+            scope_id,
+            self.run_dir / "questions" / f"{slug}_{scope_id}",
+            self._events_file_name,
+            label=slug,
+        )
+        # Lets the events of every question be found from the run's own events file
+        self.log_event("ForecastLogger", "question_started",
+                       input_data={"question": question},
+                       output_data={"question_id": scope_id,
+                                    "events_file": str(scope.events_file.relative_to(self.run_dir))})
+        token = self._current_scope.set(scope)
+        try:
+            yield scope_id
+        finally:
+            self._current_scope.reset(token)
 
     def log_event(self, source: str, event_type: str, input_data: Any = None, output_data: Any = None, parent_ids: list[str] = None) -> str:
         """Log a structured event for the report generator."""
+        scope = self._scope
+        event_id = scope.next_event_id()
         event = {
+            "event_id": event_id,
+            "question_id": scope.scope_id if scope is not self._run_scope else None,
             "timestamp": datetime.now().isoformat(),
             "source": source,
             "event_type": event_type,
@@ -57,42 +218,34 @@ class ForecastLogger:
             "output": output_data,
             "parent_ids": parent_ids or []
         }
-        with open(self.events_file, 'a') as f:
-            f.write(json.dumps(event) + "\n")
-        
-        event_id = str(self.event_count)
-        self.event_count += 1
+        self._writer.append(scope.events_file, json.dumps(event) + "\n")
         return event_id
 
+    def _with_question_label(self, message: str) -> str:
+        label = self._scope.label
+        return f"[{label}] {message}" if label else message
+
     def info(self, msg: str):
-        self.logger.info(msg)
+        self.logger.info(self._with_question_label(msg))
     
     def error(self, msg: str):
         """Log error message."""
-        self.logger.error(msg)
+        self.logger.error(self._with_question_label(msg))
     
     def section(self, title: str):
         """Log a major section header."""
-        self.logger.info(f"\n{'='*80}\n  {title}\n{'='*80}")
+        self.logger.info(f"\n{'='*80}\n  {self._with_question_label(title)}\n{'='*80}")
     
     def subsection(self, title: str):
         """Log a subsection header."""
         separator = "-" * 80
         self.logger.info(f"\n{separator}")
-        self.logger.info(f"  {title}")
+        self.logger.info(f"  {self._with_question_label(title)}")
         self.logger.info(separator)
     
-    def info(self, message: str):
-        """Log info message."""
-        self.logger.info(message)
-    
-    def error(self, message: str):
-        """Log error message."""
-        self.logger.error(message)
-    
     def researcher(self, researcher_num: int, message: str):
         """Log researcher-specific message."""
-        self.logger.info(f"[Researcher #{researcher_num}] {message}")
+        self.info(f"[Researcher #{researcher_num}] {message}")
     
     def save_retrieval_data(self, query: str, retrieved_data: list, summary: str):
         """Save retrieval data to structured folder."""
@@ -105,8 +258,7 @@ class ForecastLogger:
         }
         
         file_path = self.retrieval_dir / "retrieval_data.json"
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        self._writer.write(file_path, json.dumps(data, indent=2))
         
         self.info(f"Saved retrieval data to {file_path}")
     
@@ -122,8 +274,7 @@ class ForecastLogger:
         }
         
         file_path = self.retrieval_dir / f"round_{round_num}_query_{query_num}.json"
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        self._writer.write(file_path, json.dumps(data, indent=2))
     
     def save_researcher_code(self, researcher_id: int, code: str, prediction: dict, analysis: str, followup_queries: list = None):
         """Save researcher's code and prediction."""
@@ -137,13 +288,11 @@ class ForecastLogger:
         }
         
         file_path = self.code_dir / f"researcher_{researcher_id}_code.json"
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        self._writer.write(file_path, json.dumps(data, indent=2))
         
         # Also save just the code as a .py file for easy viewing
         code_file = self.code_dir / f"researcher_{researcher_id}_model.py"
-        with open(code_file, 'w') as f:
-            f.write(code)
+        self._writer.write(code_file, code)
     
     def save_consensus_data(self, query: str, individual_predictions: list, aggregated_prediction: dict):
         """Save consensus aggregation data."""
@@ -156,11 +305,18 @@ class ForecastLogger:
         }
         
         file_path = self.consensus_dir / "consensus_data.json"
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        self._writer.write(file_path, json.dumps(data, indent=2))
         
         self.info(f"Saved consensus data to {file_path}")
     
+    def flush(self):
+        """Wait until all queued events and data files are written."""
+        self._writer.flush()
+    
+    def close(self):
+        """Write everything still queued and stop the background writer."""
+        self._close_writer()
+    
     def get_log_path(self) -> str:
         """Get the path to the current log file."""
         return str(self.log_file)
@@ -1,3 +1,4 @@
+import gzip
 import json
 from pathlib import Path
 from typing import List, Dict, Any
@@ -6,6 +7,8 @@ class ReportGenerator:
     def __init__(self, run_dir: str):
         self.run_dir = Path(run_dir)
         self.events_file = self.run_dir / "events.jsonl"
+        if not self.events_file.exists() and (self.run_dir / "events.jsonl.gz").exists():
+            self.events_file = self.run_dir / "events.jsonl.gz"
         self.report_file = self.run_dir / "report.md"
 
     def generate(self):
@@ -15,10 +18,11 @@ class ReportGenerator:
             return
 
         events = []
-        with open(self.events_file, 'r') as f:
-            for line in f:
-                if line.strip():
-                    events.append(json.loads(line))
+        for event in self._load_events(self.events_file):
+            events.append(event)
+            # Events of each question are in that question's own file
+            if event["event_type"] == "question_started":
+                events.extend(self._load_events(self.run_dir / event["output"]["events_file"]))
 
         report_content = self._build_report(events)
         
@@ -27,6 +31,18 @@ class ReportGenerator:
         
         print(f"Report generated at: {self.report_file}")
 
+    @staticmethod
+    def _load_events(events_file: Path) -> List[Dict[str, Any]]:
+        if not events_file.exists():
+            return []
+        events = []
+        opener = gzip.open if events_file.suffix == ".gz" else open
+        with opener(events_file, 'rt') as f:
+            for line in f:
+                if line.strip():
+                    events.append(json.loads(line))
+        return events
+
     def _build_report(self, events: List[Dict[str, Any]]) -> str:
         md = "# Forecasting Execution Report\n\n"
         
@@ -0,0 +1,219 @@
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+SearchResults = List[Dict[str, Any]]
+
+# News moves fastest, so AskNews answers are reused for less time than web search answers
+DEFAULT_TTL_SECONDS: Dict[str, float] = {
+    "asknews": 60 * 60,
+    "perplexity": 6 * 60 * 60,
+    "duckduckgo": 6 * 60 * 60,
+}
+DEFAULT_FALLBACK_TTL_SECONDS = 3 * 60 * 60
+
+
+
+def normalize_query(query: str) -> str:
+    """
+    Case, punctuation and spacing are ignored, so that "Latest X news?" and
+    "latest  x news" share one entry. Word order is kept, since it changes the meaning.
+    """
+    return " ".join(re.findall(r"\w+", query.lower()))
+
+
+@dataclass
+class _InFlightSearch:
+    loop: asyncio.AbstractEventLoop
+    task: asyncio.Task
+    waiters: int = 0
+
+
+@dataclass
+class SearchCacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of searches that did not need their own call (cache hits and coalesced waits)."""
+        total = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class SearchCache:
+    """
+    Cache in front of `BaseDataMCP.search`, keyed on (source, normalized query, date bucket).
+
+    Sibling sub-questions and the sub-questions of a group question often ask for
+    nearly the same search. Those share one result while it is younger than the
+    source's TTL, and concurrent identical searches share one in-flight call. That call
+    runs in its own task, so it is only cancelled once every caller waiting on it is.
+    The date bucket (UTC day by default) stops an answer from crossing into the next day.
+    Failed searches are not cached.
+
+    Entries live in memory. Give a `directory` to also keep them on disk, so that
+    the next scheduled run (a new process) can reuse them.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[Dict[str, float]] = None,
+        default_ttl_seconds: float = DEFAULT_FALLBACK_TTL_SECONDS,
+        directory: Optional[str] = None,
+        date_bucket_format: str = "%Y-%m-%d",
+        max_entries: int = 10_000,
+    ):
+        self.ttl_seconds = {**DEFAULT_TTL_SECONDS, **(ttl_seconds or {})}
+        self.default_ttl_seconds = default_ttl_seconds
+        self.directory = directory
+        self.date_bucket_format = date_bucket_format
+        self.max_entries = max_entries
+        self.stats: Dict[str, SearchCacheStats] = {}
+        self._entries: Dict[str, Tuple[float, SearchResults]] = {}
+        self._in_flight: Dict[str, _InFlightSearch] = {}
+
+    def make_key(self, source: str, query: str) -> str:
+        date_bucket = datetime.now(timezone.utc).strftime(self.date_bucket_format)
+        serialized = json.dumps([source, normalize_query(query), date_bucket])
+        return hashlib.sha256(serialized.encode()).hexdigest()
+
+    def get_ttl(self, source: str) -> float:
+        return self.ttl_seconds.get(source, self.default_ttl_seconds)
+
+    async def search(
+        self,
+        source: str,
+        query: str,
+        search: Callable[[str], Awaitable[SearchResults]],
+    ) -> Tuple[SearchResults, bool]:
+        """
+        Returns the results for `query` and whether they were reused rather than
+        fetched by this call. `search` is only called when nothing can be reused.
+        """
+        stats = self.stats.setdefault(source, SearchCacheStats())
+        key = self.make_key(source, query)
+
+        cached = self._get(key, source)
+        if cached is not None:
+            stats.hits += 1
+            return cached, True
+
+        loop = asyncio.get_running_loop()
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None and in_flight.loop is loop:
+            stats.coalesced += 1
+            return copy.deepcopy(await self._wait_for(key, in_flight)), True
+
+        stats.misses += 1
+        task = loop.create_task(self._search_and_store(key, stats, query, search))
+        in_flight = _InFlightSearch(loop, task)
+        self._in_flight[key] = in_flight
+        return await self._wait_for(key, in_flight), False
+
+    async def _search_and_store(
+        self,
+        key: str,
+        stats: SearchCacheStats,
+        query: str,
+        search: Callable[[str], Awaitable[SearchResults]],
+    ) -> SearchResults:
+        try:
+            results = await search(query)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            self._forget_in_flight(key, asyncio.current_task())
+        self._set(key, results)
+        return results
+
+    async def _wait_for(self, key: str, in_flight: _InFlightSearch) -> SearchResults:
+        in_flight.waiters += 1
+        try:
+            # Shielded, so one cancelled caller does not cancel the search for the others
+            return await asyncio.shield(in_flight.task)
+        finally:
+            in_flight.waiters -= 1
+            if in_flight.waiters == 0 and not in_flight.task.done():
+                # Nobody wants the result any more
+                self._forget_in_flight(key, in_flight.task)
+                in_flight.task.cancel()
+
+    def _forget_in_flight(self, key: str, task: Optional[asyncio.Task]):
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None and in_flight.task is task:
+            del self._in_flight[key]
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Hit-rate metrics per source."""
+        return {source: stats.to_dict() for source, stats in self.stats.items()}
+
+    def clear(self):
+        self._entries.clear()
+
+    def _get(self, key: str, source: str) -> Optional[SearchResults]:
+        entry = self._entries.get(key)
+        if entry is None and self.directory:
+            entry = self._load(key)
+        if entry is None:
+            return None
+        created_at, results = entry
+        if time.time() - created_at > self.get_ttl(source):
+            self._entries.pop(key, None)
+            return None
+        self._entries[key] = entry
+        # Callers may edit what they get back, so the cached copy is never handed out
+        return copy.deepcopy(results)
+
+    def _set(self, key: str, results: SearchResults):
+        entry = (time.time(), copy.deepcopy(results))
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            # Dicts keep insertion order, so this drops the oldest entry
+            del self._entries[next(iter(self._entries))]
+        if self.directory:
+            self._save(key, entry)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _load(self, key: str) -> Optional[Tuple[float, SearchResults]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data["created_at"], data["results"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save(self, key: str, entry: Tuple[float, SearchResults]):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary_path = f"{path}.{os.getpid()}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                json.dump({"created_at": entry[0], "results": entry[1]}, f, default=str)
+            # Atomic, so a concurrent run never reads half a file
+            os.replace(temporary_path, path)
+        except (OSError, TypeError, ValueError):
+            # The in-memory entry is still used, a failed write only loses persistence
+            pass
@@ -3,6 +3,8 @@ from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 from ag_forecast.src.backends.base import BaseBackend
 from ag_forecast.src.data_mcps.base import BaseDataMCP
+from ag_forecast.src.utils.context_compactor import ContextCompactor
+from ag_forecast.src.utils.search_cache import SearchCache
 from ag_forecast.src.prompts import (
     AGENTIC_RETRIEVAL_SYSTEM_PROMPT,
     AGENTIC_RETRIEVAL_USER_PROMPT,
@@ -21,11 +23,19 @@ class RetrievalStep(BaseModel):
     is_sufficient: bool
 
 class AgenticRetrieval:
-    def __init__(self, backend: BaseBackend, data_mcps: Dict[str, BaseDataMCP], max_rounds: int = 3, logger=None):
+    def __init__(self, backend: BaseBackend, data_mcps: Dict[str, BaseDataMCP], max_rounds: int = 3, logger=None,
+                 search_cache: Optional[SearchCache] = None, context_compactor: Optional[ContextCompactor] = None):
         self.backend = backend
         self.data_mcps = data_mcps
         self.max_rounds = max_rounds
         self.logger = logger
+        # One cache per retrieval, so repeated searches across the questions it runs are shared
+        self.search_cache = search_cache or SearchCache()
+        self.context_compactor = context_compactor or ContextCompactor()
+
+    async def _search(self, search_query: SearchQuery):
+        mcp = self.data_mcps[search_query.source]
+        return await self.search_cache.search(search_query.source, search_query.query, mcp.search)
 
     async def run(self, user_query: str, current_date: str = None, parent_ids: List[str] = None) -> Dict[str, Any]:
         from datetime import datetime
@@ -41,6 +51,8 @@ class AgenticRetrieval:
         
         # Build context as Q&A pairs
         qa_pairs = []
+        # Same pairs without repeated search content, cut to the token budgets
+        qa_context = self.context_compactor.new_context()
         all_retrieved_data = []
         
         # Track the last set of node IDs to connect the next step to
@@ -51,10 +63,7 @@ class AgenticRetrieval:
                 self.logger.info(f"\n--- Round {round_num + 1}/{self.max_rounds} ---")
             
             # Build context string from Q&A pairs
-            context_str = "\n\n".join([
-                f"Q: {qa['query']}\nA: {qa['answer']}" 
-                for qa in qa_pairs
-            ]) if qa_pairs else "No information retrieved yet."
+            context_str = qa_context.render("retrieval") if qa_pairs else "No information retrieved yet."
             
             # 1. Reason and generate search queries
             messages = [
@@ -98,17 +107,17 @@ class AgenticRetrieval:
             search_tasks = []
             for i, search_query in enumerate(step_plan.search_queries):
                 if search_query.source in self.data_mcps:
-                    mcp = self.data_mcps[search_query.source]
-                    search_tasks.append((i, search_query, mcp.search(search_query.query)))
+                    search_tasks.append((i, search_query, self._search(search_query)))
             
             results = await asyncio.gather(*[task for _, _, task in search_tasks], return_exceptions=True)
             
             # Process results and build Q&A pairs
-            for (query_idx, search_query, _), result in zip(search_tasks, results):
-                if isinstance(result, Exception):
+            for (query_idx, search_query, _), search_outcome in zip(search_tasks, results):
+                if isinstance(search_outcome, Exception):
                     if self.logger:
-                        self.logger.error(f"Search failed: {result}")
+                        self.logger.error(f"Search failed: {search_outcome}")
                     continue
+                result, from_cache = search_outcome
                 
                 # Save individual query data
                 if self.logger:
@@ -122,7 +131,8 @@ class AgenticRetrieval:
                     self.logger.info(f"Retrieved {len(result)} results from search {query_idx + 1}")
                     self.logger.info(f"Retrieved {len(result)} results from search {query_idx + 1}")
                     search_node_id = self.logger.log_event("AgenticRetrieval", "search_result",
-                                          input_data={"query": search_query.query, "source": search_query.source},
+                                          input_data={"query": search_query.query, "source": search_query.source,
+                                                      "from_cache": from_cache},
                                           output_data=result,
                                           parent_ids=[reasoning_node_id]) # Search connects to Reasoning
                     
@@ -140,16 +150,15 @@ class AgenticRetrieval:
                     "answer": answer,
                     "source": search_query.source
                 })
+                qa_context.add(f"Q: {search_query.query}\nA: {answer}", round_num + 1)
         
         # 3. Generate final summary
         if self.logger:
+            self.logger.info(f"Search cache: {self.search_cache.summary()}")
             self.logger.info(f"\nGenerating final summary from {len(all_retrieved_data)} total results...")
         
         # Build final context with all Q&A pairs
-        final_context = "\n\n".join([
-            f"Q: {qa['query']}\nA: {qa['answer']}" 
-            for qa in qa_pairs
-        ])
+        final_context = qa_context.render("analyst")
         
         summary_messages = [
             {"role": "system", "content": AGENTIC_RETRIEVAL_SUMMARY_SYSTEM_PROMPT},
@@ -1,10 +1,11 @@
 import asyncio
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from ag_forecast.src.workflows.agentic_retrieval import AgenticRetrieval
 from ag_forecast.src.workflows.analyst_agent import AnalystAgent
 from ag_forecast.src.workflows.supervisor_agent import SupervisorAgent
 from ag_forecast.src.community.community import Community
 from ag_forecast.src.consensus.base import BaseConsensus
+from ag_forecast.src.utils.context_compactor import ContextCompactor, ResearchContext
 
 from ag_forecast.src.workflows.schema_agent import SchemaAgent
 
@@ -17,7 +18,10 @@ class IterativeResearchWorkflow:
                  community: Community, 
                  consensus: BaseConsensus,
                  max_loop_rounds: int = 3,
-                 logger=None):
+                 logger=None,
+                 speculative: bool = False,
+                 latency_budget_seconds: Optional[float] = None,
+                 context_compactor: Optional[ContextCompactor] = None):
         self.retrieval = retrieval
         self.analyst_agent = analyst_agent
         self.supervisor = supervisor
@@ -26,6 +30,12 @@ class IterativeResearchWorkflow:
         self.consensus = consensus
         self.max_loop_rounds = max_loop_rounds
         self.logger = logger
+        # Overlap research stages in `run_research_only` (see `_run_research_speculatively`)
+        self.speculative = speculative
+        # Research still running this long after it started is cancelled and the context so far is used
+        self.latency_budget_seconds = latency_budget_seconds
+        # Deduplicates, summarizes and budgets the growing global context per agent
+        self.context_compactor = context_compactor or ContextCompactor()
 
     async def run(self, user_query: str) -> Dict[str, Any]:
         from datetime import datetime
@@ -36,7 +46,7 @@ class IterativeResearchWorkflow:
             self.logger.info(f"Main Query: {user_query}")
             self.logger.info(f"Max Loop Rounds: {self.max_loop_rounds}")
         
-        global_context = []
+        global_context = self.context_compactor.new_context()
         
         # --- Initial Phase ---
         if self.logger:
@@ -53,7 +63,7 @@ class IterativeResearchWorkflow:
              last_node_ids = [analysis_result["last_node_id"]]
         
         # Add to global context
-        global_context.append(f"--- Initial Research ---\nQuery: {user_query}\nAnalysis: {analysis_result['analysis']}")
+        global_context.add(f"--- Initial Research ---\nQuery: {user_query}\nAnalysis: {analysis_result['analysis']}")
         
         # --- Iterative Loop ---
         for round_num in range(self.max_loop_rounds):
@@ -61,8 +71,7 @@ class IterativeResearchWorkflow:
                 self.logger.subsection(f"PHASE 2: ITERATIVE LOOP (Round {round_num + 1}/{self.max_loop_rounds})")
             
             # 1. Supervisor Review
-            context_str = "\n\n".join(global_context)
-            supervisor_result = await self.supervisor.run(user_query, context_str, current_date, parent_ids=last_node_ids)
+            supervisor_result = await self._review(user_query, global_context, current_date, last_node_ids)
             
             if supervisor_result.get("last_node_id"):
                 last_node_ids = [supervisor_result["last_node_id"]]
@@ -89,7 +98,7 @@ class IterativeResearchWorkflow:
             # 3. Update Global Context
             new_parent_ids = []
             for res in sub_query_results:
-                global_context.append(f"--- Sub-query: {res['query']} ---\nAnalysis: {res['analysis']}")
+                global_context.add(f"--- Sub-query: {res['query']} ---\nAnalysis: {res['analysis']}", round_num + 1)
                 if res.get("last_node_id"):
                     new_parent_ids.append(res["last_node_id"])
             
@@ -103,10 +112,10 @@ class IterativeResearchWorkflow:
         if self.logger:
             self.logger.subsection("PHASE 3: FINAL FORECAST")
         
-        final_context_str = "\n\n".join(global_context)
+        final_context_str = global_context.render("researchers")
         
         # 1. Define Prediction Schema
-        schema_result = await self.schema_agent.run(user_query, final_context_str, current_date)
+        schema_result = await self.schema_agent.run(user_query, global_context.render("schema"), current_date)
         
         # 2. Run Community of Researchers (Forecasters)
         if self.logger:
@@ -120,6 +129,7 @@ class IterativeResearchWorkflow:
         
         if self.logger:
             self.logger.info(f"\nFinal Aggregated Prediction: {aggregated_prediction}")
+            self.logger.info(f"Context compaction: {self.context_compactor.summary()}")
             self.logger.save_consensus_data(aggregated_prediction)
             self.logger.log_event("Consensus", "final_forecast",
                                   input_data={"schema": schema_result},
@@ -147,43 +157,62 @@ class IterativeResearchWorkflow:
         
         return analysis_result
 
-    async def run_research_only(self, user_query: str) -> str:
-        """Runs only the research phases (Initial + Iterative) and returns the context."""
+    async def run_research_only(self, user_query: str) -> Tuple[str, List[str]]:
+        """Runs only the research phases (Initial + Iterative) and returns the context and last node ids."""
         from datetime import datetime
         current_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        deadline = None
+        if self.latency_budget_seconds is not None:
+            deadline = asyncio.get_running_loop().time() + self.latency_budget_seconds
         
         if self.logger:
             self.logger.section("ITERATIVE RESEARCH WORKFLOW (RESEARCH ONLY)")
             self.logger.info(f"Main Query: {user_query}")
             self.logger.info(f"Max Loop Rounds: {self.max_loop_rounds}")
+            self.logger.info(f"Speculative: {self.speculative}, Latency Budget: {self.latency_budget_seconds}s")
         
-        global_context = []
+        if self.speculative:
+            return await self._run_research_speculatively(user_query, current_date, deadline)
+        
+        global_context = self.context_compactor.new_context()
         
         # --- Initial Phase ---
         if self.logger:
             self.logger.subsection("PHASE 1: INITIAL RESEARCH")
         
         # 1. Initial Retrieval
-        retrieval_result = await self.retrieval.run(user_query, current_date, parent_ids=[])
+        retrieval_result = await self._run_until(self.retrieval.run(user_query, current_date, parent_ids=[]), deadline)
+        if retrieval_result is None:
+            return self._render_without_research(global_context, user_query), []
         initial_context = retrieval_result.get("context_for_researchers", retrieval_result["summary"])
         last_node_ids = [retrieval_result["last_node_id"]] if retrieval_result.get("last_node_id") else []
         
         # 2. Initial Analysis
-        analysis_result = await self.analyst_agent.run(user_query, initial_context, current_date, parent_ids=last_node_ids)
+        analysis_result = await self._run_until(
+            self.analyst_agent.run(user_query, initial_context, current_date, parent_ids=last_node_ids), deadline
+        )
+        if analysis_result is None:
+            # Out of time, so the raw retrieval is all the context there is
+            global_context.add(f"--- Initial Research (not analysed) ---\nQuery: {user_query}\nRetrieved: {initial_context}")
+            return global_context.render("researchers"), last_node_ids
         if analysis_result.get("last_node_id"):
              last_node_ids = [analysis_result["last_node_id"]]
         
         # Add to global context
-        global_context.append(f"--- Initial Research ---\nQuery: {user_query}\nAnalysis: {analysis_result['analysis']}")
+        global_context.add(f"--- Initial Research ---\nQuery: {user_query}\nAnalysis: {analysis_result['analysis']}")
         
         # --- Iterative Loop ---
         for round_num in range(self.max_loop_rounds):
+            if self._is_past(deadline):
+                if self.logger:
+                    self.logger.info("Latency budget reached. Stopping research.")
+                break
+            
             if self.logger:
                 self.logger.subsection(f"PHASE 2: ITERATIVE LOOP (Round {round_num + 1}/{self.max_loop_rounds})")
             
             # 1. Supervisor Review
-            context_str = "\n\n".join(global_context)
-            supervisor_result = await self.supervisor.run(user_query, context_str, current_date, parent_ids=last_node_ids)
+            supervisor_result = await self._review(user_query, global_context, current_date, last_node_ids)
             
             if supervisor_result.get("last_node_id"):
                 last_node_ids = [supervisor_result["last_node_id"]]
@@ -201,22 +230,189 @@ class IterativeResearchWorkflow:
             if self.logger:
                 self.logger.info(f"Processing {len(sub_query_tasks)} sub-queries in parallel...")
             
-            sub_query_results = await asyncio.gather(*sub_query_tasks, return_exceptions=True)
+            sub_query_results = await self._gather_until(sub_query_tasks, deadline)
             
             # 3. Update Global Context
             new_parent_ids = []
             for i, res in enumerate(sub_query_results):
-                if isinstance(res, Exception):
+                if isinstance(res, BaseException):
                     if self.logger:
                         self.logger.error(f"Sub-query {i+1} failed with error: {res}")
                     continue
                 
-                global_context.append(f"--- Sub-query: {res['query']} ---\nAnalysis: {res['analysis']}")
+                global_context.add(f"--- Sub-query: {res['query']} ---\nAnalysis: {res['analysis']}", round_num + 1)
                 if res.get("last_node_id"):
                     new_parent_ids.append(res["last_node_id"])
             
             if new_parent_ids:
                 last_node_ids = new_parent_ids
         
-        final_context_str = "\n\n".join(global_context)
-        return final_context_str, last_node_ids
+        if self.logger:
+            self.logger.info(f"Context compaction: {self.context_compactor.summary()}")
+        return global_context.render("researchers"), last_node_ids
+
+    async def _run_research_speculatively(self, user_query: str, current_date: str,
+                                          deadline: Optional[float]) -> Tuple[str, List[str]]:
+        """
+        Same research as the sequential loop, with the stages overlapped instead of alternated:
+        - the supervisor reviews the raw initial retrieval while the analyst works on it
+        - sub-queries start as soon as a review asks for them, without waiting for the rest of the round
+        - a new review starts as soon as an analysis lands (one review at a time, at most `max_loop_rounds`)
+        - a review that finds the context sufficient cancels the sub-queries and reviews still running
+        - at the deadline all remaining work is cancelled and the context gathered so far is returned
+        """
+        loop = asyncio.get_running_loop()
+        
+        if self.logger:
+            self.logger.subsection("PHASE 1: INITIAL RESEARCH")
+        
+        global_context = self.context_compactor.new_context()
+        retrieval_result = await self._run_until(self.retrieval.run(user_query, current_date, parent_ids=[]), deadline)
+        if retrieval_result is None:
+            return self._render_without_research(global_context, user_query), []
+        initial_context = retrieval_result.get("context_for_researchers", retrieval_result["summary"])
+        retrieval_node_ids = [retrieval_result["last_node_id"]] if retrieval_result.get("last_node_id") else []
+        
+        # The raw retrieval stands in for the initial analysis until it lands
+        initial_chunk = global_context.add(
+            f"--- Initial Research (not yet analysed) ---\nQuery: {user_query}\nRetrieved: {initial_context}"
+        )
+        # Each analysis bumps the version, so a review knows which analyses it has seen
+        context_version = 0
+        reviewed_version = -1
+        reviews_started = 0
+        review_node_ids = retrieval_node_ids
+        analysis_node_ids: List[Tuple[int, str]] = []
+        launched_queries = set()
+        converged = False
+        # Task -> (kind, context version it was started on)
+        tasks: Dict[asyncio.Task, Tuple[str, int]] = {}
+        
+        def parent_ids() -> List[str]:
+            # Analyses the last review has not seen yet, else that review
+            return [node_id for _, node_id in analysis_node_ids] or review_node_ids
+        
+        def start_review():
+            nonlocal reviews_started, reviewed_version
+            reviews_started += 1
+            reviewed_version = context_version
+            if self.logger:
+                self.logger.subsection(f"PHASE 2: SPECULATIVE REVIEW ({reviews_started}/{self.max_loop_rounds})")
+            task = asyncio.create_task(self._review(user_query, global_context, current_date, parent_ids()))
+            tasks[task] = ("review", context_version)
+        
+        initial_analysis = self.analyst_agent.run(user_query, initial_context, current_date, parent_ids=retrieval_node_ids)
+        tasks[asyncio.create_task(initial_analysis)] = ("initial_analysis", context_version)
+        if self.max_loop_rounds > 0:
+            start_review()
+        
+        try:
+            while tasks:
+                timeout = None if deadline is None else deadline - loop.time()
+                if timeout is not None and timeout <= 0:
+                    if self.logger:
+                        self.logger.info(f"Latency budget reached. Cancelling {len(tasks)} unfinished research tasks.")
+                    break
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    kind, version = tasks.pop(task)
+                    if task.cancelled():
+                        continue
+                    if task.exception() is not None:
+                        if self.logger:
+                            self.logger.error(f"Speculative {kind} failed with error: {task.exception()}")
+                        continue
+                    result = task.result()
+                    
+                    if kind == "review":
+                        if result.get("last_node_id"):
+                            review_node_ids = [result["last_node_id"]]
+                            analysis_node_ids = [(v, node_id) for v, node_id in analysis_node_ids if v > version]
+                        if result["is_sufficient"] or not result["sub_queries"]:
+                            converged = True
+                            unnecessary = [t for t, (k, _) in tasks.items() if k != "initial_analysis" and not t.done()]
+                            if self.logger:
+                                self.logger.info(f"Supervisor determined information is sufficient. "
+                                                 f"Cancelling {len(unnecessary)} speculative tasks.")
+                            for t in unnecessary:
+                                t.cancel()
+                                del tasks[t]
+                            await asyncio.gather(*unnecessary, return_exceptions=True)
+                            continue
+                        new_queries = [q["query"] for q in result["sub_queries"]
+                                       if q["query"].strip().lower() not in launched_queries]
+                        if self.logger:
+                            self.logger.info(f"Starting {len(new_queries)} sub-queries without waiting for the round.")
+                        for query in new_queries:
+                            launched_queries.add(query.strip().lower())
+                            sub_query = self._process_sub_query(query, current_date, parent_ids=review_node_ids)
+                            tasks[asyncio.create_task(sub_query)] = ("sub_query", context_version)
+                    else:
+                        context_version += 1
+                        if kind == "initial_analysis":
+                            global_context.replace(
+                                initial_chunk,
+                                f"--- Initial Research ---\nQuery: {user_query}\nAnalysis: {result['analysis']}",
+                            )
+                        else:
+                            global_context.add(
+                                f"--- Sub-query: {result['query']} ---\nAnalysis: {result['analysis']}", reviews_started
+                            )
+                        if result.get("last_node_id"):
+                            analysis_node_ids.append((context_version, result["last_node_id"]))
+                
+                review_running = any(kind == "review" for kind, _ in tasks.values())
+                if (not converged and not review_running and reviews_started < self.max_loop_rounds
+                        and context_version > reviewed_version):
+                    start_review()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        if self.logger:
+            self.logger.info(f"Context compaction: {self.context_compactor.summary()}")
+        return global_context.render("researchers"), parent_ids()
+
+    async def _review(self, user_query: str, global_context: ResearchContext, current_date: str,
+                      parent_ids: List[str]) -> Dict[str, Any]:
+        """Supervisor review of the context, compacted first if it has grown past its limit."""
+        try:
+            if await global_context.compact() and self.logger:
+                self.logger.info(f"Summarized earlier rounds. Context is now {global_context.tokens} tokens.")
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Context compaction failed, reviewing the full context: {e}")
+        return await self.supervisor.run(user_query, global_context.render("supervisor"), current_date,
+                                         parent_ids=parent_ids)
+
+    async def _gather_until(self, coroutines: List[Any], deadline: Optional[float]) -> List[Any]:
+        """Like `gather(..., return_exceptions=True)`, but anything still running at `deadline` is cancelled."""
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        if tasks and deadline is not None:
+            _, pending = await asyncio.wait(tasks, timeout=max(0.0, deadline - asyncio.get_running_loop().time()))
+            for task in pending:
+                task.cancel()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_until(self, coroutine: Any, deadline: Optional[float]) -> Optional[Any]:
+        """Awaits `coroutine`, cancelling it and returning None if it is still running at `deadline`."""
+        if deadline is None:
+            return await coroutine
+        try:
+            return await asyncio.wait_for(coroutine, timeout=max(0.0, deadline - asyncio.get_running_loop().time()))
+        except asyncio.TimeoutError:
+            if self.logger:
+                self.logger.info("Latency budget reached during initial research.")
+            return None
+
+    def _render_without_research(self, global_context: ResearchContext, user_query: str) -> str:
+        global_context.add(f"--- Initial Research ---\nQuery: {user_query}\nNo research finished within the latency budget.")
+        if self.logger:
+            self.logger.info(f"Context compaction: {self.context_compactor.summary()}")
+        return global_context.render("researchers")
+
+    @staticmethod
+    def _is_past(deadline: Optional[float]) -> bool:
+        return deadline is not None and asyncio.get_running_loop().time() >= deadline
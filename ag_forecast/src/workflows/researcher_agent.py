@@ -1,8 +1,9 @@
 import asyncio
 import traceback
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pydantic import BaseModel
 from ag_forecast.src.backends.base import BaseBackend
+from ag_forecast.src.utils.code_sandbox import CodeSandbox, get_shared_sandbox
 from ag_forecast.src.prompts import (
     RESEARCHER_AGENT_SYSTEM_PROMPT,
     RESEARCHER_AGENT_USER_PROMPT,
@@ -15,18 +16,25 @@ class FollowUpQuery(BaseModel):
     rationale: str
 
 class ResearchOutput(BaseModel):
+    # Fields are generated in this order. The code comes before the follow-up queries so that,
+    # when streaming, it can be checked and run while the queries are still being written.
     analysis: str
     sources_used: List[str]
-    followup_queries: List[FollowUpQuery]  # 5 queries the researcher would like to look up
     math_model_description: str
     python_code: str  # The code must define a function `predict() -> Dict[str, float]`
+    followup_queries: List[FollowUpQuery]  # 5 queries the researcher would like to look up
 
 class ResearcherAgent:
-    def __init__(self, backend: BaseBackend, max_retries: int = 3, logger=None, agent_id: int = 0):
+    def __init__(self, backend: BaseBackend, max_retries: int = 3, logger=None, agent_id: int = 0, sandbox: Optional[CodeSandbox] = None,
+                 streaming: bool = False):
         self.backend = backend
         self.max_retries = max_retries
         self.logger = logger
         self.agent_id = agent_id
+        # Generated code runs in worker processes so it cannot block or hang the event loop
+        self.sandbox = sandbox or get_shared_sandbox()
+        # Verify code while the rest of the output streams, and abort the output early if it cannot compile
+        self.streaming = streaming
 
     async def run(self, question: str, context: str, current_date: str = None, prediction_schema: Dict[str, Any] = None, parent_ids: List[str] = None) -> Dict[str, Any]:
         from datetime import datetime
@@ -65,25 +73,17 @@ class ResearcherAgent:
                 if self.logger:
                     self.logger.researcher(self.agent_id, f"Attempt {attempt + 1}/{self.max_retries}")
                 
-                # 1. Generate Analysis and Code
-                output = await self.backend.generate_structured(messages, ResearchOutput)
+                # 1. Generate Analysis and Code, 2. Verify Code
+                if self.streaming:
+                    output, prediction = await self._generate_and_verify_streaming(messages)
+                else:
+                    output = await self.backend.generate_structured(messages, ResearchOutput)
+                    prediction = await self.sandbox.run_predict(output.python_code)
                 
                 if self.logger:
                     self.logger.researcher(self.agent_id, f"Analysis: {output.analysis[:200]}...")
                     self.logger.researcher(self.agent_id, f"Model: {output.math_model_description[:200]}...")
                 
-                # 2. Verify Code
-                local_scope = {}
-                exec(output.python_code, {}, local_scope)
-                
-                if "predict" not in local_scope:
-                    raise ValueError("Function `predict` not found in generated code.")
-                
-                prediction = local_scope["predict"]()
-                
-                if not isinstance(prediction, dict):
-                    raise ValueError("`predict` function must return a dictionary.")
-                
                 if self.logger:
                     self.logger.researcher(self.agent_id, f"Prediction: {prediction}")
                     self.logger.researcher(self.agent_id, f"Follow-up queries: {len(output.followup_queries)}")
@@ -125,3 +125,29 @@ class ResearcherAgent:
         if self.logger:
             self.logger.researcher(self.agent_id, "✗ Max retries reached - FAILED")
         raise RuntimeError("Max retries reached for ResearcherAgent.")
+
+    async def _generate_and_verify_streaming(self, messages: List[Dict[str, str]]) -> Tuple[ResearchOutput, Dict[str, Any]]:
+        """
+        Streams the output and starts running `python_code` in the sandbox as soon as that field is complete.
+        Code that does not compile or lacks `predict` stops the stream before the remaining fields are generated.
+        """
+        verification: Optional[asyncio.Task] = None
+
+        def check_code(code: str):
+            nonlocal verification
+            compile(code, "<generated predict>", "exec")
+            if "def predict" not in code:
+                raise ValueError("Function `predict` not found in generated code.")
+            verification = asyncio.create_task(self.sandbox.run_predict(code))
+
+        try:
+            output = await self.backend.generate_structured_streaming(
+                messages, ResearchOutput, field_validators={"python_code": check_code}
+            )
+            prediction = await verification
+        except BaseException:
+            if verification is not None:
+                verification.cancel()
+                await asyncio.gather(verification, return_exceptions=True)
+            raise
+        return output, prediction
@@ -3,6 +3,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from pydantic import BaseModel
 from ag_forecast.src.backends.openai_backend import OpenAIBackend
 from ag_forecast.src.backends.anthropic_backend import AnthropicBackend
+from ag_forecast.src.backends.base import BaseBackend
+from ag_forecast.src.backends.streaming import StreamValidationError
 
 class SampleModel(BaseModel):
     reasoning: str
@@ -44,3 +46,57 @@ async def test_anthropic_backend_generate():
         backend = AnthropicBackend(api_key="test")
         response = await backend.generate([{"role": "user", "content": "Hello"}])
         assert response == "Claude response"
+
+class StreamingBackend(BaseBackend):
+    """Streams a fixed JSON response a few characters at a time."""
+
+    supports_streaming = True
+
+    def __init__(self, response_json: str):
+        super().__init__("fake")
+        self.response_json = response_json
+        self.chunks_sent = 0
+
+    async def generate(self, messages, **kwargs):
+        raise NotImplementedError
+
+    async def generate_structured(self, messages, response_model, **kwargs):
+        return response_model.model_validate_json(self.response_json)
+
+    async def tool_call(self, messages, tools, **kwargs):
+        raise NotImplementedError
+
+    async def stream_structured(self, messages, response_model, **kwargs):
+        for start in range(0, len(self.response_json), 10):
+            self.chunks_sent += 1
+            yield self.response_json[start:start + 10]
+
+@pytest.mark.asyncio
+async def test_streaming_validates_fields_before_the_response_ends():
+    response_json = SampleModel(reasoning="x" * 500, answer="y" * 5000).model_dump_json()
+    seen_before_end = []
+    backend = StreamingBackend(response_json)
+
+    def check_reasoning(value):
+        seen_before_end.append(backend.chunks_sent < len(response_json) / 10)
+
+    output = await backend.generate_structured_streaming([], SampleModel, field_validators={"reasoning": check_reasoning})
+    assert output.answer == "y" * 5000
+    assert seen_before_end == [True]
+
+    def reject(value):
+        raise ValueError("bad reasoning")
+
+    aborted = StreamingBackend(response_json)
+    with pytest.raises(StreamValidationError):
+        await aborted.generate_structured_streaming([], SampleModel, field_validators={"reasoning": reject})
+    assert aborted.chunks_sent < len(response_json) / 10 / 2
+
+@pytest.mark.asyncio
+async def test_backends_without_streaming_validate_the_complete_response():
+    class NonStreamingBackend(StreamingBackend):
+        supports_streaming = False
+
+    backend = NonStreamingBackend(SampleModel(reasoning="r", answer="a").model_dump_json())
+    with pytest.raises(StreamValidationError):
+        await backend.generate_structured_streaming([], SampleModel, field_validators={"answer": int})
@@ -1,15 +1,20 @@
+import asyncio
+
+import httpx
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from ag_forecast.src.data_mcps.perplexity_mcp import PerplexityMCP
 from ag_forecast.src.data_mcps.asknews_mcp import AskNewsMCP
 from ag_forecast.src.data_mcps.duckduckgo_mcp import DuckDuckGoMCP
+from ag_forecast.src.data_mcps.openrouter_perplexity_mcp import OpenRouterPerplexityMCP
+from ag_forecast.src.utils.http_clients import HttpClientRegistry
 
 
 @pytest.mark.asyncio
 async def test_perplexity_search() -> None:
-    with patch("ag_forecast.src.data_mcps.perplexity_mcp.httpx.AsyncClient") as MockClient:
-        mock_instance = MockClient.return_value.__aenter__.return_value
+    with patch.object(HttpClientRegistry, "get_client") as mock_get_client:
+        mock_instance = mock_get_client.return_value
         mock_response = MagicMock()
         mock_response.json.return_value = {
             "choices": [{"message": {"content": "Perplexity answer"}}],
@@ -49,3 +54,27 @@ async def test_duckduckgo_search() -> None:
         results = await mcp.search("query")
         assert len(results) == 1
         assert results[0]["title"] == "DDG Result"
+
+
+@pytest.mark.asyncio
+async def test_searches_share_one_pooled_client() -> None:
+    requested_hosts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested_hosts.append(request.url.host)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "answer"}}]})
+
+    registry = HttpClientRegistry(transport=httpx.MockTransport(handler))
+    perplexity = PerplexityMCP(api_key="test", http_clients=registry)
+    openrouter = OpenRouterPerplexityMCP(api_key="test", http_clients=registry)
+    await asyncio.gather(*[
+        mcp.search(f"query {i}") for i in range(5) for mcp in [perplexity, openrouter]
+    ])
+    client = registry.get_client()
+
+    assert sorted(set(requested_hosts)) == ["api.perplexity.ai", "openrouter.ai"]
+    assert len(requested_hosts) == 10
+    assert perplexity.http_client is client and openrouter.http_client is client
+    await registry.aclose()
+    assert client.is_closed
+    assert registry.get_client() is not client
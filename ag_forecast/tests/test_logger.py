@@ -0,0 +1,63 @@
+import asyncio
+import gzip
+import json
+import pytest
+from ag_forecast.src.utils.logger import ForecastLogger
+
+def test_events_are_written_in_order_after_flush(tmp_path):
+    logger = ForecastLogger(base_dir=str(tmp_path))
+    event_ids = [logger.log_event("Source", "step", input_data={"i": i}) for i in range(500)]
+    logger.save_researcher_code(1, "def predict(): return {}", {}, "analysis")
+    logger.flush()
+
+    with open(logger.events_file) as f:
+        events = [json.loads(line) for line in f]
+    assert [event["input"]["i"] for event in events] == list(range(500))
+    assert event_ids == [event["event_id"] for event in events]
+    assert (logger.code_dir / "researcher_1_model.py").read_text() == "def predict(): return {}"
+    logger.close()
+
+def test_compressed_events_are_written_on_close(tmp_path):
+    logger = ForecastLogger(base_dir=str(tmp_path), compress_events=True, max_pending_writes=10)
+    for i in range(100):
+        logger.log_event("Source", "step", output_data=i)
+    logger.close()
+
+    assert logger.events_file.name == "events.jsonl.gz"
+    with gzip.open(logger.events_file, "rt") as f:
+        assert [json.loads(line)["output"] for line in f] == list(range(100))
+
+@pytest.mark.asyncio
+async def test_concurrent_questions_log_to_their_own_directories(tmp_path):
+    logger = ForecastLogger(base_dir=str(tmp_path))
+
+    async def run_question(question: str):
+        with logger.question_scope(question) as question_id:
+            parent_id = logger.log_event("AgenticRetrieval", "reasoning")
+            await asyncio.sleep(0.01)
+            child_ids = await asyncio.gather(*[
+                asyncio.to_thread(logger.log_event, "AgenticRetrieval", "search_result", parent_ids=[parent_id])
+                for _ in range(3)
+            ])
+            logger.save_retrieval_data(question, [], f"Summary of {question}")
+            return question_id, logger.events_file, parent_id, child_ids
+
+    results = await asyncio.gather(run_question("Question A"), run_question("Question B"))
+    logger.close()
+
+    all_event_ids = []
+    for question, (question_id, events_file, parent_id, child_ids) in zip(["Question A", "Question B"], results):
+        with open(events_file) as f:
+            events = [json.loads(line) for line in f]
+        assert {event["question_id"] for event in events} == {question_id}
+        assert events[0]["event_id"] == parent_id
+        assert {event["event_id"] for event in events[1:]} == set(child_ids)
+        assert all(event["parent_ids"] == [parent_id] for event in events[1:])
+        retrieval_data = json.loads((events_file.parent / "retrieval" / "retrieval_data.json").read_text())
+        assert retrieval_data["summary"] == f"Summary of {question}"
+        all_event_ids += [event["event_id"] for event in events]
+    assert len(set(all_event_ids)) == len(all_event_ids)
+
+    with open(logger.events_file) as f:
+        run_events = [json.loads(line) for line in f]
+    assert [event["output"]["question_id"] for event in run_events] == [result[0] for result in results]
@@ -1,7 +1,13 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from ag_forecast.src.workflows.agentic_retrieval import AgenticRetrieval, RetrievalStep, SearchQuery
 from ag_forecast.src.workflows.researcher_agent import ResearcherAgent, ResearchOutput
+from ag_forecast.src.workflows.iterative_research import IterativeResearchWorkflow
+from ag_forecast.src.utils.code_sandbox import CodeSandbox, SandboxTimeoutError
+from ag_forecast.src.utils.search_cache import SearchCache
+from ag_forecast.src.utils.context_compactor import ContextCompactor
+from ag_forecast.tests.test_backends import StreamingBackend
 
 @pytest.mark.asyncio
 async def test_agentic_retrieval():
@@ -67,3 +73,248 @@ async def test_researcher_agent_retry():
     
     assert result["prediction"]["yes"] == 0.8
     assert result["attempt"] == 2
+
+@pytest.mark.asyncio
+async def test_code_sandbox_runs_models_off_the_event_loop():
+    sandbox = CodeSandbox(max_workers=2, cpu_time_limit_seconds=1, wall_time_limit_seconds=10)
+    await sandbox.warm_up()
+    heavy_code = (
+        "import time\n"
+        "def predict():\n"
+        "    end = time.time() + 0.5\n"
+        "    while time.time() < end: pass\n"
+        "    return {'yes': 0.6}"
+    )
+    ticks = 0
+
+    async def count_ticks():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.create_task(count_ticks())
+    try:
+        predictions = await asyncio.gather(sandbox.run_predict(heavy_code), sandbox.run_predict(heavy_code))
+    finally:
+        ticker.cancel()
+
+    assert predictions == [{'yes': 0.6}, {'yes': 0.6}]
+    assert ticks >= 20
+
+    with pytest.raises(SandboxTimeoutError):
+        await sandbox.run_predict("def predict():\n    while True: pass")
+    with pytest.raises(ValueError):
+        await sandbox.run_predict("def predict(): return 'not a dict'")
+    assert await sandbox.run_predict("def predict(): return {'yes': 0.1}") == {'yes': 0.1}
+    sandbox.shutdown()
+
+@pytest.mark.asyncio
+async def test_code_sandbox_timeout_only_kills_its_own_worker():
+    sandbox = CodeSandbox(max_workers=2, wall_time_limit_seconds=2)
+    await sandbox.warm_up()
+    stuck_code = "import time\ndef predict():\n    time.sleep(30)\n    return {}"
+    slow_code = "import time\ndef predict():\n    time.sleep(1)\n    return {'yes': 0.3}"
+    try:
+        stuck = asyncio.create_task(sandbox.run_predict(stuck_code))
+        await asyncio.sleep(1.5)
+        # Still running when the stuck call is killed
+        slow = asyncio.create_task(sandbox.run_predict(slow_code))
+        with pytest.raises(SandboxTimeoutError):
+            await stuck
+        assert await slow == {'yes': 0.3}
+        assert await sandbox.run_predict("def predict(): return {'yes': 0.1}") == {'yes': 0.1}
+    finally:
+        sandbox.shutdown()
+
+@pytest.mark.asyncio
+async def test_agentic_retrieval_shares_near_duplicate_searches(tmp_path):
+    mock_backend = MagicMock()
+    mock_backend.generate = AsyncMock(return_value="Summary")
+    duplicate_queries = RetrievalStep(
+        reasoning="Need info",
+        search_queries=[
+            SearchQuery(query="Latest X news?", rationale="r", source="mock"),
+            SearchQuery(query="latest  x news", rationale="r", source="mock"),
+        ],
+        is_sufficient=False,
+    )
+    done = RetrievalStep(reasoning="Done", search_queries=[], is_sufficient=True)
+    mock_backend.generate_structured = AsyncMock(side_effect=[duplicate_queries, done, duplicate_queries, done])
+
+    calls = 0
+
+    async def search(query):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [{"content": "result"}]
+
+    mock_mcp = MagicMock()
+    mock_mcp.search = search
+    cache = SearchCache(directory=str(tmp_path))
+    workflow = AgenticRetrieval(mock_backend, {"mock": mock_mcp}, logger=MagicMock(), search_cache=cache)
+
+    first = await workflow.run("question 1")
+    second = await workflow.run("question 2")
+
+    assert calls == 1
+    assert len(first["retrieved_data"]) == 2 and len(second["retrieved_data"]) == 2
+    assert cache.summary()["mock"] == {"hits": 2, "misses": 1, "coalesced": 1, "errors": 0, "hit_rate": 0.75}
+
+    # A new process only sees the entry on disk, an expired entry is fetched again
+    assert (await SearchCache(directory=str(tmp_path)).search("mock", "latest X news", search))[1] is True
+    assert (await SearchCache(ttl_seconds={"mock": -1}, directory=str(tmp_path)).search("mock", "latest X news", search))[1] is False
+    assert calls == 2
+
+@pytest.mark.asyncio
+async def test_search_cache_survives_the_first_caller_being_cancelled():
+    calls = 0
+
+    async def search(query):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return [{"content": query}]
+
+    cache = SearchCache()
+    first = asyncio.create_task(cache.search("mock", "Will Russia attack Ukraine", search))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(cache.search("mock", "will russia attack ukraine?", search))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == ([{"content": "Will Russia attack Ukraine"}], True)
+    assert first.cancelled()
+    # Word order changes the question, so this is not served from the cache
+    assert (await cache.search("mock", "Will Ukraine attack Russia", search))[1] is False
+    assert calls == 2
+
+def _make_research_workflow(supervisor_results, analysis_seconds, **kwargs):
+    retrieval = MagicMock()
+    retrieval.run = AsyncMock(side_effect=lambda query, *args, **kw: {"summary": "s", "context_for_researchers": f"ctx {query}"})
+
+    async def analyse(query, context, current_date=None, parent_ids=None):
+        await asyncio.sleep(analysis_seconds.get(query, 0.1))
+        return {"query": query, "analysis": f"analysis of {query}"}
+
+    async def review(user_query, context, current_date=None, parent_ids=None):
+        await asyncio.sleep(0.05)
+        return supervisor_results.pop(0)
+
+    analyst, supervisor = MagicMock(), MagicMock()
+    analyst.run = analyse
+    supervisor.run = review
+    return IterativeResearchWorkflow(retrieval, analyst, supervisor, MagicMock(), MagicMock(), MagicMock(), **kwargs)
+
+@pytest.mark.asyncio
+async def test_speculative_research_cancels_work_the_supervisor_does_not_need():
+    more = {"critique": "", "is_sufficient": False, "sub_queries": [{"query": "slow", "rationale": "r"}]}
+    enough = {"critique": "", "is_sufficient": True, "sub_queries": []}
+    workflow = _make_research_workflow([more, enough], {"slow": 10}, speculative=True)
+
+    start = asyncio.get_running_loop().time()
+    context, _ = await workflow.run_research_only("q")
+
+    assert asyncio.get_running_loop().time() - start < 1
+    assert "Analysis: analysis of q" in context
+    assert "slow" not in context
+
+@pytest.mark.asyncio
+async def test_latency_budget_forces_research_to_converge():
+    more = [{"critique": "", "is_sufficient": False, "sub_queries": [{"query": f"sub {i}", "rationale": "r"}]}
+            for i in range(3)]
+    for speculative in [False, True]:
+        workflow = _make_research_workflow(list(more), {"sub 0": 10}, speculative=speculative, latency_budget_seconds=0.5)
+
+        start = asyncio.get_running_loop().time()
+        context, _ = await workflow.run_research_only("q")
+
+        assert asyncio.get_running_loop().time() - start < 1
+        assert "Analysis: analysis of q" in context
+        assert "sub 0" not in context
+
+    for speculative in [False, True]:
+        workflow = _make_research_workflow([], {}, speculative=speculative, latency_budget_seconds=0.3)
+
+        async def slow_retrieval(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        workflow.retrieval.run = slow_retrieval
+        start = asyncio.get_running_loop().time()
+        context, parent_ids = await workflow.run_research_only("q")
+
+        assert asyncio.get_running_loop().time() - start < 1
+        assert "Query: q" in context and parent_ids == []
+
+@pytest.mark.asyncio
+async def test_context_compactor_deduplicates_summarizes_and_budgets():
+    summarizer = MagicMock()
+    summarizer.generate = AsyncMock(return_value="Short summary of rounds 0 and 1.")
+    compactor = ContextCompactor(
+        summarizer=summarizer,
+        agent_token_budgets={"schema": 60},
+        summarize_after_tokens=100,
+    )
+    context = compactor.new_context()
+    shared_article = "Reuters reports that the vote was postponed until next March."
+
+    context.add(f"--- Initial Research ---\n{shared_article}\n" + "detail " * 50)
+    context.add(f"--- Sub-query: a ---\n{shared_article}\n" + "more " * 50, round_num=1)
+    context.add("--- Sub-query: b ---\nlatest finding", round_num=2)
+
+    full = context.render("supervisor")
+    assert full.count(shared_article) == 1
+    assert compactor.stats.tokens_deduplicated > 0
+
+    assert await context.compact()
+    assert len(context) == 2
+    assert context.chunks[0].is_summary
+    assert "latest finding" in context.render("supervisor")
+    assert "omitted" not in context.render("supervisor")
+
+    context.add("--- Sub-query: c ---\n" + "newest " * 100, round_num=3)
+    budgeted = context.render("schema")
+    assert compactor.count_tokens(budgeted) <= 100
+    assert "Short summary" in budgeted and "omitted" in budgeted
+
+    metrics = compactor.summary()
+    assert metrics["summaries"] == 1
+    assert metrics["agents"]["schema"]["tokens_saved"] > 0
+    assert metrics["agents"]["supervisor"]["prompts"] == 3
+
+def test_research_context_replace_keeps_lines_of_the_replaced_chunk():
+    context = ContextCompactor().new_context()
+    query_line = "Query: Will the vote be postponed until next March?"
+    raw = context.add(f"{query_line}\nraw retrieval notes that are long enough")
+    context.add("--- Sub-query: a ---\nsomething else entirely", round_num=1)
+
+    replaced = context.replace(raw, f"{query_line}\nanalysis of the retrieval")
+
+    assert context.chunks[0] is replaced
+    assert query_line in replaced.text
+    assert context.render("supervisor").count(query_line) == 1
+
+@pytest.mark.asyncio
+async def test_researcher_agent_streaming_runs_code_before_output_ends():
+    def output_json(code):
+        return ResearchOutput(
+            analysis="Analysis", sources_used=[], math_model_description="Desc", python_code=code,
+            followup_queries=[{"query": "q" * 100, "type": "short-form", "rationale": "r" * 500}] * 5,
+        ).model_dump_json()
+
+    sandbox = MagicMock()
+    sandbox.run_predict = AsyncMock(return_value={"yes": 0.7, "no": 0.3})
+    backend = StreamingBackend(output_json("def predict(): return {'yes': 0.7, 'no': 0.3}"))
+    agent = ResearcherAgent(backend, sandbox=sandbox, streaming=True)
+
+    result = await agent.run("q", "ctx")
+    assert result["prediction"] == {"yes": 0.7, "no": 0.3}
+    assert len(result["followup_queries"]) == 5
+
+    broken = StreamingBackend(output_json("def predict(: return"))
+    agent = ResearcherAgent(broken, sandbox=sandbox, streaming=True, max_retries=1)
+    with pytest.raises(RuntimeError):
+        await agent.run("q", "ctx")
+    assert broken.chunks_sent < len(broken.response_json) / 10 / 2
+    assert sandbox.run_predict.call_count == 1
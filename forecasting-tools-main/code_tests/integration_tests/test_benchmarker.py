@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -11,7 +12,7 @@ from code_tests.unit_tests.forecasting_test_manager import (
 )
 from forecasting_tools.cp_benchmarking.benchmark_for_bot import BenchmarkForBot
 from forecasting_tools.cp_benchmarking.benchmarker import Benchmarker
-from forecasting_tools.data_models.questions import BinaryQuestion
+from forecasting_tools.data_models.questions import BinaryQuestion, MetaculusQuestion
 from forecasting_tools.forecast_bots.official_bots.q2_template_bot import (
     Q2TemplateBot2025,
 )
@@ -314,3 +315,71 @@ async def test_failed_and_missing_forecasts_are_tracked(mocker: Mock) -> None:
     assert len(benchmark.forecast_reports) == 2
     assert benchmark.num_failed_forecasts == 2
     assert all("Simulated failure" in err for err in benchmark.failed_report_errors)
+
+
+class SlowResearchBot(MockBot):
+    questions_in_flight: int = 0
+    max_questions_in_flight: int = 0
+    bots_that_started: set[str] = set()
+
+    async def run_research(self, question: MetaculusQuestion) -> str:
+        cls = SlowResearchBot
+        cls.bots_that_started.add(self.__class__.__name__)
+        cls.questions_in_flight += 1
+        cls.max_questions_in_flight = max(
+            cls.max_questions_in_flight, cls.questions_in_flight
+        )
+        await asyncio.sleep(0.05)
+        cls.questions_in_flight -= 1
+        return "Mock research"
+
+
+@pytest.mark.parametrize(
+    "max_concurrent_questions, expected_max_in_flight", [(None, 6), (4, 4), (3, 2)]
+)
+async def test_bots_are_benchmarked_concurrently_within_budget(
+    max_concurrent_questions: int | None, expected_max_in_flight: int
+) -> None:
+    class SlowBot1(SlowResearchBot):
+        pass
+
+    class SlowBot2(SlowResearchBot):
+        pass
+
+    class SlowBot3(SlowResearchBot):
+        pass
+
+    SlowResearchBot.max_questions_in_flight = 0
+    SlowResearchBot.bots_that_started = set()
+    questions = [ForecastingTestManager.get_fake_binary_question() for _ in range(6)]
+    benchmarks = await Benchmarker(
+        forecast_bots=[SlowBot1(), SlowBot2(), SlowBot3()],
+        questions_to_use=questions,
+        concurrent_question_batch_size=2,
+        max_concurrent_questions=max_concurrent_questions,
+    ).run_benchmark()
+
+    assert [len(benchmark.forecast_reports) for benchmark in benchmarks] == [6, 6, 6]
+    assert SlowResearchBot.max_questions_in_flight == expected_max_in_flight
+    assert len(SlowResearchBot.bots_that_started) == 3
+
+
+async def test_provider_budget_limits_bots_sharing_a_provider() -> None:
+    class ProviderBot1(SlowResearchBot):
+        pass
+
+    class ProviderBot2(SlowResearchBot):
+        pass
+
+    SlowResearchBot.max_questions_in_flight = 0
+    questions = [ForecastingTestManager.get_fake_binary_question() for _ in range(4)]
+    bots = [ProviderBot1(), ProviderBot2()]
+    provider = Benchmarker._get_provider_of_bot(bots[0])
+    await Benchmarker(
+        forecast_bots=bots,
+        questions_to_use=questions,
+        concurrent_question_batch_size=2,
+        max_concurrent_questions_per_provider={provider: 2},
+    ).run_benchmark()
+
+    assert SlowResearchBot.max_questions_in_flight == 2
@@ -0,0 +1,117 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from forecasting_tools.ai_models.ai_utils.response_types import TextTokenCostResponse
+from forecasting_tools.ai_models.general_llm import GeneralLlm
+from forecasting_tools.ai_models.llm_response_cache import (
+    InMemoryLlmResponseCache,
+    LlmResponseCache,
+    ShardedDirectoryLlmResponseCache,
+    SqliteLlmResponseCache,
+)
+from forecasting_tools.ai_models.resource_managers.monetary_cost_manager import (
+    MonetaryCostManager,
+)
+
+
+def _make_caches(tmp_path: Path) -> list[LlmResponseCache]:
+    return [
+        InMemoryLlmResponseCache(),
+        SqliteLlmResponseCache(db_path=str(tmp_path / "responses.sqlite3")),
+        ShardedDirectoryLlmResponseCache(directory=str(tmp_path / "responses")),
+    ]
+
+
+def _mock_direct_call(mocker: Mock) -> Mock:
+    call_count = 0
+
+    async def fake_direct_call(self: GeneralLlm, prompt: str) -> TextTokenCostResponse:
+        nonlocal call_count
+        call_count += 1
+        return TextTokenCostResponse(
+            data=f"Answer {call_count} to {prompt}",
+            prompt_tokens_used=1,
+            completion_tokens_used=1,
+            total_tokens_used=2,
+            model=self.model,
+            cost=0.5,
+        )
+
+    return mocker.patch.object(
+        GeneralLlm,
+        "_mockable_direct_call_to_model",
+        autospec=True,
+        side_effect=fake_direct_call,
+    )
+
+
+@pytest.mark.parametrize("cache_index", [0, 1, 2])
+async def test_repeated_prompts_are_replayed_from_cache(
+    mocker: Mock, tmp_path: Path, cache_index: int
+) -> None:
+    direct_call = _mock_direct_call(mocker)
+    cache = _make_caches(tmp_path)[cache_index]
+    llm = GeneralLlm(model="gpt-4o-mini", response_cache=cache)
+
+    first_run = [await llm.invoke("Hi"), await llm.invoke("Hi")]
+    assert first_run == ["Answer 1 to Hi", "Answer 2 to Hi"]
+
+    cache._times_key_requested.clear()  # Simulates a rerun in a new process
+    with MonetaryCostManager() as cost_manager:
+        second_run = [await llm.invoke("Hi"), await llm.invoke("Hi")]
+
+    assert second_run == first_run
+    assert direct_call.call_count == 2
+    assert cost_manager.current_usage == 0
+    assert cost_manager.saved_usage == pytest.approx(1.0)
+
+
+async def test_different_kwargs_and_prompts_are_not_shared(mocker: Mock) -> None:
+    direct_call = _mock_direct_call(mocker)
+    cache = InMemoryLlmResponseCache(distinct_responses_for_repeated_prompts=False)
+    cold_llm = GeneralLlm(model="gpt-4o-mini", temperature=0, response_cache=cache)
+    hot_llm = GeneralLlm(model="gpt-4o-mini", temperature=1, response_cache=cache)
+
+    await cold_llm.invoke("Hi")
+    await cold_llm.invoke("Hi")
+    await cold_llm.invoke("Hello")
+    await hot_llm.invoke("Hi")
+
+    assert direct_call.call_count == 3
+
+
+def test_in_memory_cache_evicts_least_recently_used() -> None:
+    cache = InMemoryLlmResponseCache(max_entries=2)
+    response = TextTokenCostResponse(
+        data="a",
+        prompt_tokens_used=0,
+        completion_tokens_used=0,
+        total_tokens_used=0,
+        model="m",
+        cost=0,
+    )
+    cache.set("first", response)
+    cache.set("second", response)
+    cache.get("first")
+    cache.set("third", response)
+    assert cache.get("first") is not None
+    assert cache.get("second") is None
+    assert cache.get("third") is not None
+
+
+@pytest.mark.parametrize("cache_index", [0, 1, 2])
+def test_expired_entries_are_not_returned(tmp_path: Path, cache_index: int) -> None:
+    cache = _make_caches(tmp_path)[cache_index]
+    cache.ttl_seconds = -1
+    response = TextTokenCostResponse(
+        data="a",
+        prompt_tokens_used=0,
+        completion_tokens_used=0,
+        total_tokens_used=0,
+        model="m",
+        cost=0,
+    )
+    cache.set("key", response)
+    assert cache.get("key") is None
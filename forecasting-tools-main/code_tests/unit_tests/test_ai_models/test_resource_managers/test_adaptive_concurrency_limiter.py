@@ -0,0 +1,107 @@
+import asyncio
+from unittest.mock import Mock
+
+import httpx
+
+from forecasting_tools.ai_models.ai_utils.response_types import TextTokenCostResponse
+from forecasting_tools.ai_models.general_llm import GeneralLlm
+from forecasting_tools.ai_models.resource_managers.adaptive_concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    get_retry_after_seconds,
+)
+
+
+class RateLimitError(Exception):
+    def __init__(self, retry_after: str | None = None) -> None:
+        super().__init__("429")
+        headers = {"retry-after": retry_after} if retry_after else {}
+        self.response = httpx.Response(429, headers=headers)
+        self.status_code = 429
+
+
+async def test_concurrency_stays_within_limit_and_grows_on_success() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=3)
+    running = 0
+    most_running = 0
+
+    async def call() -> None:
+        nonlocal running, most_running
+        async with limiter.slot("model"):
+            running += 1
+            most_running = max(most_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*[call() for _ in range(20)])
+
+    assert most_running == 3
+    assert limiter.get_limit("model") == 3
+    summary = limiter.summary()["model"]
+    assert summary["requests"] == 20
+    assert summary["max_queue_seconds"] > 0
+
+
+async def test_rate_limits_decrease_once_per_window_and_pause() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+
+    async def rate_limited_call() -> None:
+        async with limiter.slot("model"):
+            await asyncio.sleep(0.01)
+            raise RateLimitError(retry_after="0.2")
+
+    results = await asyncio.gather(
+        *[rate_limited_call() for _ in range(8)], return_exceptions=True
+    )
+    assert all(isinstance(result, RateLimitError) for result in results)
+    assert limiter.get_limit("model") == 4
+    assert limiter.summary()["model"]["rate_limited"] == 8
+
+    start = asyncio.get_running_loop().time()
+    async with limiter.slot("model"):
+        pass
+    assert asyncio.get_running_loop().time() - start >= 0.15
+    assert limiter.get_limit("other model") == 8
+
+
+def test_retry_after_is_read_from_seconds_and_milliseconds() -> None:
+    assert get_retry_after_seconds(RateLimitError(retry_after="3")) == 3
+    error = RateLimitError()
+    error.response = httpx.Response(429, headers={"retry-after-ms": "1500"})
+    assert get_retry_after_seconds(error) == 1.5
+    assert get_retry_after_seconds(ValueError()) is None
+
+
+async def test_general_llm_calls_share_the_limiter(mocker: Mock) -> None:
+    running = 0
+    most_running = 0
+
+    async def fake_direct_call(self: GeneralLlm, prompt: str) -> TextTokenCostResponse:
+        nonlocal running, most_running
+        running += 1
+        most_running = max(most_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return TextTokenCostResponse(
+            data="answer",
+            prompt_tokens_used=1,
+            completion_tokens_used=1,
+            total_tokens_used=2,
+            model=self.model,
+            cost=0,
+        )
+
+    mocker.patch.object(
+        GeneralLlm,
+        "_mockable_direct_call_to_model",
+        autospec=True,
+        side_effect=fake_direct_call,
+    )
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    llms = [
+        GeneralLlm(model="gpt-4o-mini", concurrency_limiter=limiter) for _ in range(2)
+    ]
+
+    await asyncio.gather(*[llm.invoke("Hi") for llm in llms for _ in range(3)])
+
+    assert most_running == 1
+    assert limiter.summary()["gpt-4o-mini"]["requests"] == 6
@@ -0,0 +1,88 @@
+import asyncio
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from forecasting_tools.ai_models.ai_utils.response_types import TextTokenCostResponse
+from forecasting_tools.ai_models.general_llm import GeneralLlm
+from forecasting_tools.ai_models.resource_managers.llm_rate_limiter import (
+    LlmRateLimit,
+    LlmRateLimiter,
+)
+
+
+async def test_requests_wait_for_the_longest_matching_prefix_budget() -> None:
+    limiter = LlmRateLimiter({"openrouter/": LlmRateLimit(requests_per_minute=600)})
+    limiter.set_limit("openrouter/openai/", LlmRateLimit(requests_per_minute=60000))
+
+    start = time.monotonic()
+    await asyncio.gather(
+        *[limiter.wait_for_capacity("openrouter/anthropic/claude") for _ in range(600)],
+        *[limiter.wait_for_capacity("openrouter/google/gemini") for _ in range(2)],
+    )
+    # Both models share the "openrouter/" budget of 600, so 2 requests wait 0.1s each
+    assert time.monotonic() - start >= 0.15
+
+    start = time.monotonic()
+    await limiter.wait_for_capacity("openrouter/openai/gpt-4o")
+    assert time.monotonic() - start < 0.05
+    assert await limiter.wait_for_capacity("unlimited/model") == 0
+
+    summary = limiter.summary()
+    assert summary["openrouter/"]["requests"] == 602
+    assert summary["openrouter/"]["delayed_requests"] >= 1
+    assert "unlimited/model" not in summary
+
+
+async def test_tokens_wait_for_budget_and_large_prompts_are_clamped() -> None:
+    limit = LlmRateLimit(tokens_per_minute=600)
+    limiter = LlmRateLimiter()
+    assert limiter.needs_token_count("model", limit)
+    assert not limiter.needs_token_count("model")
+
+    assert await limiter.wait_for_capacity("model", 10_000, limit) < 0.05
+    waited = await limiter.wait_for_capacity("model", 10, limit)
+    assert 0.5 <= waited < 2
+    assert limiter.summary()["model"]["tokens"] == 10_010
+
+    with pytest.raises(ValueError):
+        LlmRateLimit(requests_per_minute=0)
+
+
+async def test_general_llm_waits_for_shared_budget_before_calling(
+    mocker: Mock,
+) -> None:
+    async def fake_direct_call(self: GeneralLlm, prompt: str) -> TextTokenCostResponse:
+        return TextTokenCostResponse(
+            data="answer",
+            prompt_tokens_used=1,
+            completion_tokens_used=1,
+            total_tokens_used=2,
+            model=self.model,
+            cost=0,
+        )
+
+    direct_call = mocker.patch.object(
+        GeneralLlm,
+        "_mockable_direct_call_to_model",
+        autospec=True,
+        side_effect=fake_direct_call,
+    )
+    limiter = LlmRateLimiter()
+    limit = LlmRateLimit(requests_per_minute=600, tokens_per_minute=100_000)
+    llms = [
+        GeneralLlm(model="gpt-4o-mini", rate_limit=limit, rate_limiter=limiter)
+        for _ in range(2)
+    ]
+    mocker.patch.object(GeneralLlm, "input_to_tokens", return_value=100)
+    limiter._get_budget("gpt-4o-mini", limit).requests.zero_out_resources()
+
+    start = time.monotonic()
+    await asyncio.gather(*[llm.invoke("Hi") for llm in llms])
+
+    assert time.monotonic() - start >= 0.15
+    assert direct_call.call_count == 2
+    summary = limiter.summary()["gpt-4o-mini"]
+    assert summary["requests"] == 2
+    assert summary["tokens"] == 200
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import pytest
+
+from forecasting_tools.ai_models.resource_managers.refreshing_bucket_rate_limiter import (
+    LimitReachedResponse,
+    ResourceUnavailableError,
+)
+from forecasting_tools.ai_models.resource_managers.token_bucket_rate_limiter import (
+    TokenBucketRateLimiter,
+)
+
+
+async def test_bursts_to_capacity_then_refills_continuously() -> None:
+    limiter = TokenBucketRateLimiter(capacity=2, refresh_rate=20)
+    start = time.monotonic()
+    acquired_at = []
+    for _ in range(6):
+        await limiter.wait_till_able_to_acquire_resources(1)
+        acquired_at.append(time.monotonic() - start)
+
+    assert acquired_at[1] < 0.02
+    # Each later request waits for one resource (0.05s), not for a full bucket
+    gaps = [later - earlier for earlier, later in zip(acquired_at[1:], acquired_at[2:])]
+    assert all(0.03 < gap < 0.09 for gap in gaps)
+    assert limiter.total_resources_acquired == 6
+
+
+async def test_waiters_are_served_in_order() -> None:
+    limiter = TokenBucketRateLimiter(capacity=10, refresh_rate=200)
+    limiter.zero_out_resources()
+    finished: list[str] = []
+
+    async def acquire(name: str, resources: int) -> None:
+        await limiter.wait_till_able_to_acquire_resources(resources)
+        finished.append(name)
+
+    await asyncio.gather(
+        acquire("large", 10), acquire("small 1", 1), acquire("small 2", 1)
+    )
+
+    assert finished == ["large", "small 1", "small 2"]
+
+
+async def test_cancelled_waiter_gives_up_its_place() -> None:
+    limiter = TokenBucketRateLimiter(capacity=10, refresh_rate=100)
+    limiter.zero_out_resources()
+    large = asyncio.create_task(limiter.wait_till_able_to_acquire_resources(10))
+    await asyncio.sleep(0)
+    small = asyncio.create_task(limiter.wait_till_able_to_acquire_resources(1))
+    await asyncio.sleep(0)
+
+    large.cancel()
+    await asyncio.wait_for(small, timeout=0.05)
+
+    assert large.cancelled()
+    assert limiter.total_resources_acquired == 1
+
+
+async def test_synchronous_api_works_inside_a_running_loop() -> None:
+    limiter = TokenBucketRateLimiter(capacity=3, refresh_rate=1, history_size=2)
+
+    assert limiter.try_acquire(2)
+    assert not limiter.try_acquire(2)
+    assert limiter.get_available_resources() == pytest.approx(1, abs=0.01)
+    assert limiter.try_acquire(1)
+    limiter.zero_out_resources()
+    assert limiter.seconds_until_available(1) == pytest.approx(1, abs=0.01)
+    assert len(limiter.history) == 2
+    assert limiter.resources_used_in_last(60) == 3
+
+
+async def test_raises_when_limit_reached_and_configured_to() -> None:
+    limiter = TokenBucketRateLimiter(
+        capacity=1,
+        refresh_rate=1,
+        limit_reached_response=LimitReachedResponse.RAISE_EXCEPTION,
+    )
+    await limiter.wait_till_able_to_acquire_resources(1)
+    with pytest.raises(ResourceUnavailableError):
+        await limiter.wait_till_able_to_acquire_resources(1)
+    with pytest.raises(ValueError):
+        await limiter.wait_till_able_to_acquire_resources(2)
@@ -4,6 +4,7 @@ from code_tests.unit_tests.forecasting_test_manager import ForecastingTestManage
 from forecasting_tools.auto_optimizers.question_plus_research import (
     QuestionPlusResearch,
     ResearchItem,
+    ResearchSnapshotIndex,
     ResearchType,
 )
 
@@ -41,3 +42,40 @@ def test_get_research_for_type_multiple_found() -> None:
 
     with pytest.raises(ValueError):
         snapshot.get_research_for_type(ResearchType.ASK_NEWS_SUMMARIES)
+
+
+def test_snapshot_index_finds_research_by_question_identity() -> None:
+    questions = [
+        ForecastingTestManager.get_fake_binary_question(question_text=f"Q{i}")
+        for i in range(3)
+    ]
+    snapshots = [
+        QuestionPlusResearch(
+            question=question,
+            research_items=[
+                ResearchItem(
+                    research=f"news {question.question_text}",
+                    type=ResearchType.ASK_NEWS_SUMMARIES,
+                ),
+                ResearchItem(research="a", type=ResearchType.ASK_NEWS_DEEP_RESEARCH),
+                ResearchItem(research="b", type=ResearchType.ASK_NEWS_DEEP_RESEARCH),
+            ],
+        )
+        for question in questions
+    ]
+    index = ResearchSnapshotIndex(snapshots)
+
+    same_question = questions[1].model_copy(deep=True)
+    assert same_question in index
+    assert (
+        index.get_research(same_question, ResearchType.ASK_NEWS_SUMMARIES) == "news Q1"
+    )
+    with pytest.raises(ValueError):
+        index.get_research(same_question, ResearchType.ASK_NEWS_DEEP_RESEARCH)
+    with pytest.raises(ValueError):
+        index.get_research(
+            ForecastingTestManager.get_fake_binary_question(question_text="Q3"),
+            ResearchType.ASK_NEWS_SUMMARIES,
+        )
+    with pytest.raises(ValueError):
+        ResearchSnapshotIndex(snapshots + snapshots[:1])
@@ -1,5 +1,8 @@
+import json
 import os
 import textwrap
+from pathlib import Path
+from typing import Iterator
 
 import pytest
 
@@ -35,6 +38,37 @@ def test_metaculus_report_is_jsonable() -> None:
     os.remove(temp_writing_path)
 
 
+def test_reports_stream_from_jsonl_like_json_round_trip(tmp_path: Path) -> None:
+    read_report_path = "code_tests/unit_tests/test_data_models/forecasting_test_data/metaculus_forecast_report_examples.json"
+    reports = DataOrganizer.load_reports_from_file_path(read_report_path)
+    for report in reports:
+        assert report.to_json() == json.loads(report.model_dump_json())
+
+    binary_reports = [report for report in reports if isinstance(report, BinaryReport)]
+    jsonl_path = str(tmp_path / "reports.jsonl")
+    BinaryReport.add_objects_to_jsonl_file(binary_reports, jsonl_path)
+    streamed_reports = BinaryReport.iterate_objects_from_jsonl_file(jsonl_path)
+
+    assert isinstance(streamed_reports, Iterator)
+    for report, streamed_report in zip(binary_reports, streamed_reports, strict=True):
+        assert streamed_report.to_json() == report.to_json()
+
+
+def test_report_with_nan_price_estimate_loads_back_as_none(tmp_path: Path) -> None:
+    report = ForecastingTestManager.get_fake_forecast_report()
+    report.price_estimate = float("nan")
+
+    json_path = str(tmp_path / "reports.json")
+    DataOrganizer.save_reports_to_file_path([report], json_path)
+    loaded_report = DataOrganizer.load_reports_from_file_path(json_path)[0]
+    assert loaded_report.price_estimate is None
+
+    jsonl_path = str(tmp_path / "reports.jsonl")
+    BinaryReport.add_objects_to_jsonl_file([report], jsonl_path)
+    streamed_report = next(BinaryReport.iterate_objects_from_jsonl_file(jsonl_path))
+    assert streamed_report.price_estimate is None
+
+
 def test_report_sections_are_parsed_correctly() -> None:
     fake_report = ForecastingTestManager.get_fake_forecast_report()
     fake_explanation = textwrap.dedent(
@@ -123,6 +157,37 @@ def test_report_sections_are_parsed_correctly() -> None:
     assert combined_content.replace("\n", "") == fake_explanation.replace("\n", "")
 
 
+def test_report_section_index_is_reused_until_explanation_changes() -> None:
+    fake_report = ForecastingTestManager.get_fake_forecast_report()
+    fake_report.explanation = textwrap.dedent(
+        """
+        # Summary
+        Old summary
+        # Research
+        Old research
+        # Forecasts
+        ## Rationale 1
+        Old rationale
+        """
+    ).strip()
+
+    section_index = fake_report.section_index
+    assert fake_report.summary == "# Summary\nOld summary"
+    assert fake_report.first_rationale == "## Rationale 1\nOld rationale"
+    assert fake_report.section_index is section_index
+
+    fake_report.explanation = fake_report.explanation.replace("Old", "New")
+
+    assert fake_report.section_index is not section_index
+    assert fake_report.research == "# Research\nNew research"
+    assert fake_report.forecast_rationales == (
+        "# Forecasts\n## Rationale 1\nNew rationale"
+    )
+
+    unread_copy = type(fake_report).model_validate(fake_report.model_dump())
+    assert unread_copy == fake_report
+
+
 def combine_all_section_content(sections: list[MarkdownTree]) -> str:
     # Only goes to level h4 in the report list
     combined_content = ""
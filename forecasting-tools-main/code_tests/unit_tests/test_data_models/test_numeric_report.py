@@ -311,6 +311,36 @@ def test_close_bound_distribution(percentiles: list[Percentile]) -> None:
         assert len(distribution.get_cdf()) == cdf_size
 
 
+@pytest.mark.parametrize("zero_point", [None, -10.0])
+@pytest.mark.parametrize("standardize_cdf", [True, False])
+def test_cdf_arrays_match_cdf_percentiles(
+    zero_point: float | None, standardize_cdf: bool
+) -> None:
+    distribution = NumericDistribution(
+        declared_percentiles=[
+            Percentile(value=5.0, percentile=0.1),
+            Percentile(value=20.0, percentile=0.5),
+            Percentile(value=95.0, percentile=0.9),
+        ],
+        open_upper_bound=True,
+        open_lower_bound=False,
+        upper_bound=100.0,
+        lower_bound=0.0,
+        zero_point=zero_point,
+        standardize_cdf=standardize_cdf,
+    )
+    cdf = distribution.get_cdf()
+    probabilities = distribution.get_cdf_probabilities()
+    nominal_locations = distribution.get_cdf_nominal_locations()
+
+    assert probabilities.shape == (201,)
+    assert nominal_locations.shape == (201,)
+    assert [p.percentile for p in cdf] == probabilities.tolist()
+    assert [p.value for p in cdf] == nominal_locations.tolist()
+    assert nominal_locations[0] == pytest.approx(0.0)
+    assert nominal_locations[-1] == pytest.approx(100.0)
+
+
 def test_error_on_too_little_probability_assigned_in_range() -> None:
     prediction = NumericDistribution(
         declared_percentiles=[
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from pathlib import Path
 from typing import Any
@@ -9,9 +10,13 @@ from code_tests.unit_tests.forecasting_test_manager import (
     MockBot,
 )
 from forecasting_tools.ai_models.general_llm import GeneralLlm
+from forecasting_tools.ai_models.llm_response_cache import InMemoryLlmResponseCache
+from forecasting_tools.ai_models.resource_managers.llm_rate_limiter import LlmRateLimit
+from forecasting_tools.data_models.binary_report import BinaryReport
 from forecasting_tools.data_models.forecast_report import ReasonedPrediction
-from forecasting_tools.data_models.questions import BinaryQuestion
+from forecasting_tools.data_models.questions import BinaryQuestion, ConditionalQuestion
 from forecasting_tools.forecast_bots.bot_lists import get_all_important_bot_classes
+from forecasting_tools.forecast_bots import forecast_bot
 from forecasting_tools.forecast_bots.forecast_bot import ForecastBot, ForecastReport
 
 
@@ -44,6 +49,136 @@ async def test_forecast_questions_returns_exceptions_when_specified() -> None:
         await bot.forecast_questions(test_questions, return_exceptions=False)
 
 
+@pytest.mark.parametrize(
+    "max_concurrent_questions, max_concurrent_research, expected_max_in_flight",
+    [(None, None, 6), (2, None, 2), (None, 3, 3)],
+)
+async def test_questions_and_research_respect_concurrency_limits(
+    max_concurrent_questions: int | None,
+    max_concurrent_research: int | None,
+    expected_max_in_flight: int,
+) -> None:
+    bot = MockBot(
+        max_concurrent_questions=max_concurrent_questions,
+        max_concurrent_research=max_concurrent_research,
+    )
+    research_in_flight = 0
+    max_research_in_flight = 0
+
+    async def slow_research(*args, **kwargs):
+        nonlocal research_in_flight, max_research_in_flight
+        research_in_flight += 1
+        max_research_in_flight = max(max_research_in_flight, research_in_flight)
+        await asyncio.sleep(0.02)
+        research_in_flight -= 1
+        return "Mock research"
+
+    bot.run_research = slow_research
+    questions = [ForecastingTestManager.get_fake_binary_question() for _ in range(6)]
+
+    reports = await bot.forecast_questions(questions)
+
+    assert [report.question for report in reports] == questions
+    assert max_research_in_flight == expected_max_in_flight
+
+
+@pytest.mark.parametrize("hedge_timed_out_questions", [True, False])
+async def test_straggling_questions_time_out_or_are_hedged(
+    hedge_timed_out_questions: bool,
+) -> None:
+    bot = MockBot(
+        question_timeout_seconds=0.05,
+        hedge_timed_out_questions=hedge_timed_out_questions,
+    )
+    research_calls = 0
+
+    async def straggling_first_research(*args, **kwargs):
+        nonlocal research_calls
+        research_calls += 1
+        if research_calls == 1:
+            await asyncio.sleep(10)
+        return "Mock research"
+
+    bot.run_research = straggling_first_research
+    question = ForecastingTestManager.get_fake_binary_question()
+
+    result = await bot.forecast_question(question, return_exceptions=True)
+
+    if hedge_timed_out_questions:
+        assert isinstance(result, ForecastReport)
+        assert research_calls == 2
+    else:
+        assert isinstance(result, TimeoutError)
+        assert research_calls == 1
+    assert bot._note_pads == {}
+
+
+async def test_only_the_winning_hedged_attempt_is_published(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    bot = MockBot(
+        question_timeout_seconds=0.05,
+        hedge_timed_out_questions=True,
+        publish_reports_to_metaculus=True,
+    )
+    research_calls = 0
+    publishes_started = 0
+    published_reports: list[ForecastReport] = []
+
+    async def slow_first_research(*args, **kwargs):
+        nonlocal research_calls
+        research_calls += 1
+        if research_calls == 1:
+            await asyncio.sleep(0.07)
+        return f"Mock research {research_calls}"
+
+    async def slow_publish(report: ForecastReport, *args, **kwargs) -> None:
+        nonlocal publishes_started
+        publishes_started += 1
+        await asyncio.sleep(0.1)
+        published_reports.append(report)
+
+    bot.run_research = slow_first_research
+    monkeypatch.setattr(BinaryReport, "publish_report_to_metaculus", slow_publish)
+    question = ForecastingTestManager.get_fake_binary_question()
+
+    report = await bot.forecast_question(question)
+
+    assert research_calls == 2
+    assert publishes_started == 1
+    assert published_reports == [report]
+    assert "Mock research 2" in report.explanation
+
+
+async def test_attempts_are_cancelled_when_another_question_fails() -> None:
+    bot = MockBot(question_timeout_seconds=10)
+    slow_research_cancelled = False
+
+    async def research(question, *args, **kwargs):
+        nonlocal slow_research_cancelled
+        if question.question_text == "fails":
+            await asyncio.sleep(0.01)
+            raise RuntimeError("Test error")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            slow_research_cancelled = True
+            raise
+        return "Mock research"
+
+    bot.run_research = research
+    questions = [
+        ForecastingTestManager.get_fake_binary_question(question_text="slow"),
+        ForecastingTestManager.get_fake_binary_question(question_text="fails"),
+    ]
+
+    with pytest.raises(Exception):
+        await bot.forecast_questions(questions, return_exceptions=False)
+
+    assert slow_research_cancelled
+    assert bot._note_pads == {}
+
+
 async def test_forecast_question_returns_exception_when_specified() -> None:
     bot = MockBot()
     test_question = ForecastingTestManager.get_fake_binary_question()
@@ -189,6 +324,53 @@ async def test_saves_reports_to_specified_folder(tmp_path: Path) -> None:
     assert "-2-questions.json" in files[0].name
 
 
+async def test_resume_skips_questions_saved_before_a_crash(tmp_path: Path) -> None:
+    test_questions = [
+        ForecastingTestManager.get_fake_binary_question(question_text=f"Question {i}")
+        for i in range(3)
+    ]
+    researched_questions: list[str] = []
+
+    async def research_that_crashes_on_last_question(question: Any) -> str:
+        researched_questions.append(question.question_text)
+        if question.question_text == "Question 2":
+            await asyncio.sleep(0.2)
+            raise RuntimeError("Crash")
+        return "test research"
+
+    crashing_bot = MockBot(folder_to_save_reports_to=str(tmp_path))
+    crashing_bot.run_research = research_that_crashes_on_last_question
+    with pytest.raises(Exception):
+        await crashing_bot.forecast_questions(test_questions)
+    assert len(list(tmp_path.glob("*.jsonl"))) == 1
+
+    researched_questions.clear()
+    resuming_bot = MockBot(
+        folder_to_save_reports_to=str(tmp_path), resume_from_saved_reports=True
+    )
+
+    async def record_research(question: Any) -> str:
+        researched_questions.append(question.question_text)
+        return "test research"
+
+    resuming_bot.run_research = record_research
+    reports = await resuming_bot.forecast_questions(test_questions)
+
+    assert researched_questions == ["Question 2"]
+    assert [report.question.question_text for report in reports] == [
+        "Question 0",
+        "Question 1",
+        "Question 2",
+    ]
+    assert list(tmp_path.glob("*.jsonl")) == []
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_resume_requires_folder_to_save_reports_to() -> None:
+    with pytest.raises(ValueError):
+        MockBot(resume_from_saved_reports=True)
+
+
 async def test_skip_previously_forecasted_questions() -> None:
     bot = MockBot(skip_previously_forecasted_questions=True)
     forecasted_question = ForecastingTestManager.get_fake_binary_question()
@@ -261,6 +443,24 @@ async def test_get_llm_returns_correct_type_when_set() -> None:
     assert isinstance(general_llm_3, GeneralLlm)
 
 
+async def test_response_cache_only_added_for_enabled_purposes() -> None:
+    summarizer = GeneralLlm(model="gpt-4o-mini", temperature=0.3)
+    cache = InMemoryLlmResponseCache()
+    bot = MockBot(
+        llms={"default": "gpt-4o", "summarizer": summarizer},
+        llm_response_cache=cache,
+        cached_llm_purposes=["default"],
+    )
+
+    assert bot.get_llm("default", guarantee_type="llm").response_cache is cache
+    assert bot.get_llm("summarizer", guarantee_type="llm").response_cache is None
+
+    bot.cached_llm_purposes = None
+    bot.set_llm(summarizer, "summarizer")
+    assert bot.get_llm("summarizer", guarantee_type="llm").response_cache is cache
+    assert summarizer.response_cache is None
+
+
 async def test_get_llm_returns_none_when_not_set() -> None:
     bot = MockBot()
     with pytest.raises(ValueError):
@@ -332,6 +532,84 @@ async def test_notepad_counts_research_and_prediction_attempts() -> None:
     )
 
 
+async def test_conditional_sub_questions_share_the_conditional_notepad() -> None:
+    bot = MockBot()
+    sub_questions = {
+        role: BinaryQuestion(
+            question_text=f"{role} question", id_of_post=10, id_of_question=i
+        )
+        for i, role in enumerate(["parent", "child", "question_yes", "question_no"])
+    }
+    conditional = ConditionalQuestion(
+        question_text="Conditional question",
+        id_of_post=10,
+        id_of_question=100,
+        **sub_questions,
+    )
+    unrelated_question = BinaryQuestion(
+        question_text="parent question", id_of_post=11, id_of_question=0
+    )
+
+    notepad = await bot._register_notepad(conditional)
+    assert await bot._register_notepad(conditional) is notepad
+    for sub_question in sub_questions.values():
+        assert await bot._get_notepad(sub_question.model_copy()) is notepad
+    with pytest.raises(ValueError):
+        await bot._get_notepad(unrelated_question)
+
+    await bot._remove_notepad(conditional)
+    assert await bot._get_notepad(sub_questions["child"]) is notepad
+    await bot._remove_notepad(conditional)
+    assert bot._note_pads == {}
+    assert bot._note_pad_aliases == {}
+    with pytest.raises(ValueError):
+        await bot._get_notepad(sub_questions["child"])
+
+
+async def test_conditionals_sharing_a_parent_keep_their_own_notepads() -> None:
+    bot = MockBot()
+    parent = BinaryQuestion(
+        question_text="parent question", id_of_post=10, id_of_question=0
+    )
+    conditionals = [
+        ConditionalQuestion(
+            question_text=f"Conditional question {i}",
+            id_of_post=10 + i,
+            id_of_question=100 + i,
+            parent=parent,
+            **{
+                role: BinaryQuestion(
+                    question_text=f"{role} question {i}",
+                    id_of_post=10 + i,
+                    id_of_question=10 * i + j,
+                )
+                for j, role in enumerate(["child", "question_yes", "question_no"], 1)
+            },
+        )
+        for i in [1, 2]
+    ]
+
+    first_notepad = await bot._register_notepad(conditionals[0])
+    second_notepad = await bot._register_notepad(conditionals[1])
+    token = forecast_bot._current_notepad_key.set(bot._get_notepad_key(conditionals[1]))
+    try:
+        assert await bot._get_notepad(parent) is second_notepad
+    finally:
+        forecast_bot._current_notepad_key.reset(token)
+    assert await bot._get_notepad(parent) is first_notepad
+
+    await bot._remove_notepad(conditionals[0])
+    assert await bot._get_notepad(parent) is second_notepad
+    assert await bot._get_notepad(conditionals[1].child) is second_notepad
+    with pytest.raises(ValueError):
+        await bot._get_notepad(conditionals[0].child)
+
+    await bot._remove_notepad(conditionals[1])
+    assert bot._note_pad_aliases == {}
+    with pytest.raises(ValueError):
+        await bot._get_notepad(parent)
+
+
 async def test_summarize_research_returns_disabled_message_when_false() -> None:
     bot = MockBot(enable_summarize_research=False)
     question = ForecastingTestManager.get_fake_binary_question()
@@ -346,6 +624,39 @@ async def test_summarize_research_calls_llm_and_returns_output() -> None:
     assert "mock" in result.lower()
 
 
+@pytest.mark.parametrize("use_research_summary_to_forecast", [True, False])
+async def test_summary_only_blocks_predictions_when_used_to_forecast(
+    use_research_summary_to_forecast: bool,
+) -> None:
+    bot = MockBot(
+        use_research_summary_to_forecast=use_research_summary_to_forecast,
+        max_concurrent_summaries=1,
+    )
+    events: list[str] = []
+
+    async def slow_summary(*args, **kwargs):
+        events.append("summary started")
+        await asyncio.sleep(0.02)
+        events.append("summary finished")
+        return "Mock summary"
+
+    async def record_prediction(*args, **kwargs):
+        events.append("prediction started")
+        return ReasonedPrediction(prediction_value=0.5, reasoning="Mock rationale")
+
+    bot.summarize_research = slow_summary
+    bot._run_forecast_on_binary = record_prediction
+    report = await bot.forecast_question(
+        ForecastingTestManager.get_fake_binary_question()
+    )
+
+    assert "Mock summary" in report.summary
+    if use_research_summary_to_forecast:
+        assert events == ["summary started", "summary finished", "prediction started"]
+    else:
+        assert events == ["summary started", "prediction started", "summary finished"]
+
+
 def test_conflicting_summarize_research_and_use_summary_raises() -> None:
     with pytest.raises(Exception):
         MockBot(
@@ -385,3 +696,19 @@ async def test_research_fits_with_research_markdown_section() -> None:
     assert (
         expected_research in report.research.strip()
     ), "Assuming research section has heading of 2, there should be a heading of 3 for the inner part"
+
+
+async def test_rate_limits_added_for_configured_purposes() -> None:
+    summarizer = GeneralLlm(model="gpt-4o-mini", temperature=0.3)
+    limit = LlmRateLimit(requests_per_minute=100, tokens_per_minute=50_000)
+    bot = MockBot(
+        llms={"default": "gpt-4o", "summarizer": summarizer},
+        llm_rate_limits={"summarizer": limit},
+    )
+
+    assert bot.get_llm("summarizer", guarantee_type="llm").rate_limit == limit
+    assert bot.get_llm("default", guarantee_type="llm").rate_limit is None
+    assert summarizer.rate_limit is None
+
+    bot.llm_rate_limits = {"default": limit}
+    assert bot.get_llm("default", guarantee_type="llm").rate_limit == limit
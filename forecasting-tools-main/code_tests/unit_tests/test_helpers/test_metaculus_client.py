@@ -0,0 +1,244 @@
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+from typing import AsyncGenerator
+
+import pytest
+import requests
+from aiohttp import web
+
+from forecasting_tools.data_models.questions import BinaryQuestion, MetaculusQuestion
+from forecasting_tools.helpers.metaculus_client import ApiFilter, MetaculusClient
+from forecasting_tools.helpers.metaculus_post_cache import MetaculusPostCache
+
+
+class FakeMetaculusServer:
+    def __init__(self) -> None:
+        self.queries: list[list[tuple[str, str]]] = []
+        self.requests_in_flight = 0
+        self.max_requests_in_flight = 0
+        self.num_posts = 0
+        self.report_count = False
+        self.post_requests: list[dict[str, str]] = []
+        self.post_edited_at = "2025-01-01T00:00:00Z"
+
+    async def get_posts(self, request: web.Request) -> web.Response:
+        self.queries.append(list(request.query.items()))
+        self.requests_in_flight += 1
+        self.max_requests_in_flight = max(
+            self.max_requests_in_flight, self.requests_in_flight
+        )
+        await asyncio.sleep(0.05)
+        self.requests_in_flight -= 1
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query.get("limit", 100))
+        post_ids = range(offset, min(offset + limit, self.num_posts))
+        data: dict = {"results": [{"id": post_id} for post_id in post_ids]}
+        if self.report_count:
+            data["count"] = self.num_posts
+        return web.json_response(data)
+
+    async def get_post(self, request: web.Request) -> web.Response:
+        self.post_requests.append(dict(request.headers))
+        etag = f'"{self.post_edited_at}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        post_id = int(request.match_info["post_id"])
+        return web.json_response(
+            {"id": post_id, "edited_at": self.post_edited_at},
+            headers={"ETag": etag},
+        )
+
+    async def post_forecast(self, request: web.Request) -> web.Response:
+        return web.json_response({"detail": "Not allowed"}, status=405)
+
+
+@pytest.fixture
+async def fake_server(
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncGenerator[tuple[FakeMetaculusServer, str], None]:
+    monkeypatch.setenv("METACULUS_TOKEN", "fake-token")
+    server = FakeMetaculusServer()
+    app = web.Application()
+    app.router.add_get("/api/posts/", server.get_posts)
+    app.router.add_get("/api/posts/{post_id}/", server.get_post)
+    app.router.add_post("/api/questions/forecast/", server.post_forecast)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    yield server, f"http://127.0.0.1:{port}/api"
+    await runner.cleanup()
+
+
+def _make_client_with_fake_post_parsing(
+    base_url: str, post_cache: MetaculusPostCache | None = None
+) -> MetaculusClient:
+    client = MetaculusClient(
+        base_url=base_url,
+        sleep_between_question_requests=(0, 0),
+        post_cache=post_cache,
+    )
+
+    def fake_post_json_to_questions(
+        post_json: dict, group_question_mode: str
+    ) -> list[MetaculusQuestion]:
+        return [
+            BinaryQuestion(
+                question_text=f"Question {post_json['id']}",
+                id_of_post=post_json["id"],
+                id_of_question=post_json["id"],
+            )
+        ]
+
+    client._post_json_to_questions_while_handling_groups = fake_post_json_to_questions  # type: ignore
+    return client
+
+
+async def test_question_pages_are_fetched_concurrently_up_to_limit(
+    fake_server: tuple[FakeMetaculusServer, str],
+) -> None:
+    server, base_url = fake_server
+    client = MetaculusClient(
+        base_url=base_url,
+        max_concurrent_requests=2,
+        sleep_between_question_requests=(0, 0),
+    )
+    api_filter = ApiFilter(allowed_tournaments=[1, "minibench"])
+    async with client:
+        await asyncio.gather(
+            *[
+                client._grab_filtered_questions_with_offset(api_filter, offset)
+                for offset in range(0, 500, 100)
+            ]
+        )
+
+    assert len(server.queries) == 5
+    assert server.max_requests_in_flight == 2
+    first_query = server.queries[0]
+    assert ("tournaments", "1") in first_query
+    assert ("tournaments", "minibench") in first_query
+    assert ("forecast_type", "binary") in first_query
+    assert ("forecast_type", "numeric") in first_query
+
+
+async def test_politeness_sleep_does_not_block_event_loop(
+    fake_server: tuple[FakeMetaculusServer, str],
+) -> None:
+    _, base_url = fake_server
+    client = MetaculusClient(
+        base_url=base_url, sleep_between_question_requests=(0.2, 0.2)
+    )
+    ticks = 0
+
+    async def count_ticks() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.create_task(count_ticks())
+    async with client:
+        await client.get_questions_matching_filter(ApiFilter())
+    ticker.cancel()
+    assert ticks >= 10
+
+
+async def test_async_http_errors_keep_response_status(
+    fake_server: tuple[FakeMetaculusServer, str],
+) -> None:
+    _, base_url = fake_server
+    async with MetaculusClient(base_url=base_url) as client:
+        with pytest.raises(requests.exceptions.HTTPError) as error_info:
+            await client.post_binary_question_prediction_async(1, 0.5)
+    assert error_info.value.response is not None
+    assert error_info.value.response.status_code == 405
+
+
+@pytest.mark.parametrize("report_count", [True, False])
+async def test_number_of_matching_questions_is_found_and_cached(
+    fake_server: tuple[FakeMetaculusServer, str], report_count: bool
+) -> None:
+    server, base_url = fake_server
+    server.num_posts = 1234
+    server.report_count = report_count
+    api_filter = ApiFilter(group_question_mode="unpack_subquestions")
+
+    async with _make_client_with_fake_post_parsing(base_url) as client:
+        count = await client._determine_how_many_questions_match_filter(api_filter)
+        requests_for_first_count = len(server.queries)
+        cached_count = await client._determine_how_many_questions_match_filter(
+            api_filter
+        )
+
+    assert count == 1234
+    assert cached_count == 1234
+    assert len(server.queries) == requests_for_first_count
+    if report_count:
+        assert requests_for_first_count == 1
+    else:
+        assert requests_for_first_count < 20
+
+
+async def test_random_sample_fetches_pages_concurrently(
+    fake_server: tuple[FakeMetaculusServer, str],
+) -> None:
+    server, base_url = fake_server
+    server.num_posts = 1000
+    server.report_count = True
+
+    async with _make_client_with_fake_post_parsing(base_url) as client:
+        questions = await client.get_questions_matching_filter(
+            ApiFilter(allowed_types=["binary"]),
+            num_questions=250,
+            randomly_sample=True,
+        )
+
+    assert len(questions) == 250
+    assert len({q.id_of_question for q in questions}) == 250
+    assert server.max_requests_in_flight > 1
+
+
+async def test_post_cache_skips_fresh_posts_and_revalidates_stale_ones(
+    fake_server: tuple[FakeMetaculusServer, str], tmp_path: Path
+) -> None:
+    server, base_url = fake_server
+    post_cache = MetaculusPostCache(db_path=str(tmp_path / "posts.sqlite3"))
+    async with _make_client_with_fake_post_parsing(base_url, post_cache) as client:
+        await client.get_question_by_post_id_async(7)
+        await client.get_question_by_post_id_async(7)
+        assert len(server.post_requests) == 1
+
+        post_cache.community_prediction_ttl = timedelta(0)
+        question = await client.get_question_by_post_id_async(7)
+        assert len(server.post_requests) == 2
+        assert server.post_requests[-1]["If-None-Match"] == '"2025-01-01T00:00:00Z"'
+        assert question.id_of_post == 7
+
+        server.post_edited_at = "2025-02-01T00:00:00Z"
+        await client.get_question_by_post_id_async(7)
+
+    cached_post = post_cache.get(7)
+    assert cached_post is not None
+    assert cached_post.edited_at == "2025-02-01T00:00:00Z"
+    assert cached_post.etag == '"2025-02-01T00:00:00Z"'
+
+
+async def test_question_listings_are_written_to_post_cache(
+    fake_server: tuple[FakeMetaculusServer, str], tmp_path: Path
+) -> None:
+    server, base_url = fake_server
+    server.num_posts = 3
+    post_cache = MetaculusPostCache(db_path=str(tmp_path / "posts.sqlite3"))
+    async with _make_client_with_fake_post_parsing(base_url, post_cache) as client:
+        await client.get_questions_matching_filter(ApiFilter())
+        await client.get_question_by_post_id_async(2)
+
+    assert len(server.post_requests) == 0
+    assert [post_cache.get(post_id) is not None for post_id in range(4)] == [
+        True,
+        True,
+        True,
+        False,
+    ]
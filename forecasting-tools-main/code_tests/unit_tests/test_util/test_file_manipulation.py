@@ -158,3 +158,19 @@ def test_file_creation_at_top_and_lower_levels() -> None:
         assert loaded_json == [test_json]
     finally:
         os.remove(test_nested_json_file_path)
+
+
+def test_non_finite_floats_are_written_as_null_without_orjson() -> None:
+    test_data = {"a": float("nan"), "b": [float("inf"), 1.5]}
+
+    with tempfile.TemporaryDirectory() as temp_dir, patch.object(
+        file_manipulation, "orjson", None
+    ), patch.dict(os.environ, {"FILE_WRITING_ALLOWED": "TRUE"}):
+        json_path = os.path.join(temp_dir, "test.json")
+        jsonl_path = os.path.join(temp_dir, "test.jsonl")
+        file_manipulation.write_json_file(json_path, [test_data])
+        file_manipulation.add_to_jsonl_file(jsonl_path, test_data)
+
+        expected = {"a": None, "b": [None, 1.5]}
+        assert file_manipulation.load_json_file(json_path) == [expected]
+        assert file_manipulation.load_jsonl_file(jsonl_path) == [expected]
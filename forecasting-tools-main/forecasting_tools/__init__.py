@@ -61,12 +61,36 @@ from forecasting_tools.ai_models.deprecated_model_classes.perplexity import (
 )
 from forecasting_tools.ai_models.exa_searcher import ExaSearcher as ExaSearcher
 from forecasting_tools.ai_models.general_llm import GeneralLlm as GeneralLlm
+from forecasting_tools.ai_models.llm_response_cache import (
+    InMemoryLlmResponseCache as InMemoryLlmResponseCache,
+)
+from forecasting_tools.ai_models.llm_response_cache import (
+    LlmResponseCache as LlmResponseCache,
+)
+from forecasting_tools.ai_models.llm_response_cache import (
+    ShardedDirectoryLlmResponseCache as ShardedDirectoryLlmResponseCache,
+)
+from forecasting_tools.ai_models.llm_response_cache import (
+    SqliteLlmResponseCache as SqliteLlmResponseCache,
+)
+from forecasting_tools.ai_models.resource_managers.adaptive_concurrency_limiter import (
+    AdaptiveConcurrencyLimiter as AdaptiveConcurrencyLimiter,
+)
+from forecasting_tools.ai_models.resource_managers.llm_rate_limiter import (
+    LlmRateLimit as LlmRateLimit,
+)
+from forecasting_tools.ai_models.resource_managers.llm_rate_limiter import (
+    LlmRateLimiter as LlmRateLimiter,
+)
 from forecasting_tools.ai_models.resource_managers.monetary_cost_manager import (
     MonetaryCostManager as MonetaryCostManager,
 )
 from forecasting_tools.ai_models.resource_managers.refreshing_bucket_rate_limiter import (
     RefreshingBucketRateLimiter as RefreshingBucketRateLimiter,
 )
+from forecasting_tools.ai_models.resource_managers.token_bucket_rate_limiter import (
+    TokenBucketRateLimiter as TokenBucketRateLimiter,
+)
 from forecasting_tools.auto_optimizers.bot_optimizer import BotOptimizer as BotOptimizer
 from forecasting_tools.cp_benchmarking.benchmark_displayer import (
     run_benchmark_streamlit_page as run_benchmark_streamlit_page,
@@ -149,6 +173,9 @@ from forecasting_tools.helpers.asknews_searcher import (
 from forecasting_tools.helpers.metaculus_api import MetaculusApi as MetaculusApi
 from forecasting_tools.helpers.metaculus_api import MetaculusClient as MetaculusClient
 from forecasting_tools.helpers.metaculus_client import ApiFilter as ApiFilter
+from forecasting_tools.helpers.metaculus_post_cache import (
+    MetaculusPostCache as MetaculusPostCache,
+)
 from forecasting_tools.helpers.prediction_extractor import (
     PredictionExtractor as PredictionExtractor,
 )
@@ -27,12 +27,22 @@ from forecasting_tools.ai_models.ai_utils.openai_utils import (
     VisionMessageData,
 )
 from forecasting_tools.ai_models.ai_utils.response_types import TextTokenCostResponse
+from forecasting_tools.ai_models.llm_response_cache import LlmResponseCache
 from forecasting_tools.ai_models.model_interfaces.outputs_text import OutputsText
 from forecasting_tools.ai_models.model_interfaces.retryable_model import RetryableModel
 from forecasting_tools.ai_models.model_interfaces.tokens_incur_cost import (
     TokensIncurCost,
 )
 from forecasting_tools.ai_models.model_tracker import ModelTracker
+from forecasting_tools.ai_models.resource_managers.adaptive_concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    get_shared_concurrency_limiter,
+)
+from forecasting_tools.ai_models.resource_managers.llm_rate_limiter import (
+    LlmRateLimit,
+    LlmRateLimiter,
+    get_shared_llm_rate_limiter,
+)
 from forecasting_tools.ai_models.resource_managers.monetary_cost_manager import (
     LitellmCostTracker,
     MonetaryCostManager,
@@ -117,10 +127,20 @@ class GeneralLlm(
         timeout: float | int | None = None,
         pass_through_unknown_kwargs: bool = True,
         populate_citations: bool = True,
+        response_cache: LlmResponseCache | None = None,
+        concurrency_limiter: AdaptiveConcurrencyLimiter | None = None,
+        rate_limit: LlmRateLimit | None = None,
+        rate_limiter: LlmRateLimiter | None = None,
         **kwargs,
     ) -> None:
         """
-        Pass in litellm kwargs as needed. Below are the available kwargs as of Feb 13 2025.
+        Pass in litellm kwargs as needed. Pass in a `response_cache` to reuse responses to
+        identical requests (e.g. when rerunning a benchmark) instead of calling the model again.
+        Concurrent calls per model are limited by `concurrency_limiter`, which adapts to rate
+        limit errors (defaults to a limiter shared by every GeneralLlm). Calls also wait for
+        request and prompt token per minute budgets in `rate_limiter` (also shared by default):
+        `rate_limit` if given, otherwise any limit registered there for the model's prefix.
+        Below are the available kwargs as of Feb 13 2025.
 
         # Optional OpenAI params: see https://platform.openai.com/docs/api-reference/chat/create
         functions: list | None = None,
@@ -166,6 +186,12 @@ class GeneralLlm(
         self.model = model
         self.responses_api = responses_api
         self.populate_citations = populate_citations
+        self.response_cache = response_cache
+        self.concurrency_limiter = (
+            concurrency_limiter or get_shared_concurrency_limiter()
+        )
+        self.rate_limit = rate_limit
+        self.rate_limiter = rate_limiter or get_shared_llm_rate_limiter()
 
         metaculus_prefix = "metaculus/"
         exa_prefix = "exa/"
@@ -232,9 +258,29 @@ class GeneralLlm(
         ModelTracker.give_cost_tracking_warning_if_needed(self._litellm_model)
 
     async def invoke(self, prompt: ModelInputType) -> str:
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self.response_cache.make_key(
+                self.litellm_kwargs,
+                {
+                    "model": self.model,
+                    "responses_api": self.responses_api,
+                    "messages": self.model_input_to_message(prompt),
+                },
+            )
+            cached_response = self.response_cache.get(cache_key)
+            if cached_response is not None:
+                logger.debug(f"Using cached response for model {self.model}")
+                MonetaryCostManager.increase_saved_usage_in_parent_managers(
+                    cached_response.cost
+                )
+                return cached_response.data
+
         response: TextTokenCostResponse = (
             await self._invoke_with_request_cost_time_and_token_limits_and_retry(prompt)
         )
+        if self.response_cache is not None and cache_key is not None:
+            self.response_cache.set(cache_key, response)
         data = response.data
         return data
 
@@ -244,11 +290,13 @@ class GeneralLlm(
     ) -> Any:
         logger.debug(f"Invoking model with prompt: {prompt}")
 
+        await self._wait_for_rate_limit_budget(prompt)
         with track_generation(
             input=self.model_input_to_message(prompt),
             model=self.model,
         ) as span:
-            direct_call_response = await self._mockable_direct_call_to_model(prompt)
+            async with self.concurrency_limiter.slot(self.model):
+                direct_call_response = await self._mockable_direct_call_to_model(prompt)
             answer = direct_call_response.data
             span.span_data.output = [{"role": "assistant", "content": answer}]
             # span.span_data.usage = usage.model_dump()
@@ -258,6 +306,18 @@ class GeneralLlm(
         logger.debug(f"Model responded with: {direct_call_response}")
         return direct_call_response
 
+    async def _wait_for_rate_limit_budget(self, prompt: ModelInputType) -> None:
+        tokens = 0
+        if self.rate_limiter.needs_token_count(self.model, self.rate_limit):
+            try:
+                tokens = self.input_to_tokens(prompt)
+            except Exception as e:
+                tokens = len(str(prompt)) // 4
+                logger.debug(
+                    f"Could not count tokens for {self.model}, estimating {tokens}: {e}"
+                )
+        await self.rate_limiter.wait_for_capacity(self.model, tokens, self.rate_limit)
+
     async def _mockable_direct_call_to_model(
         self, prompt: ModelInputType
     ) -> TextTokenCostResponse:
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from contextlib import closing
+from typing import Any
+
+from pydantic import BaseModel
+
+from forecasting_tools.ai_models.ai_utils.response_types import TextTokenCostResponse
+from forecasting_tools.util import file_manipulation
+
+logger = logging.getLogger(__name__)
+
+
+class CachedLlmResponse(BaseModel):
+    response: TextTokenCostResponse
+    created_at: float
+
+
+class LlmResponseCache(ABC):
+    """
+    Opt-in cache of GeneralLlm responses keyed on a hash of the litellm kwargs
+    that change the output and the model input (model name and messages).
+
+    Bots often send the same prompt several times on purpose (e.g. multiple
+    predictions per research report). When `distinct_responses_for_repeated_prompts`
+    is True, the nth identical request in this process is mapped to the nth cached
+    response, so reruns replay the same set of answers rather than one answer n times.
+    Set it to False to reuse a single response for every identical request.
+    """
+
+    KWARGS_EXCLUDED_FROM_KEY = {
+        "timeout",
+        "api_key",
+        "extra_headers",
+        "num_retries",
+        "metadata",
+    }
+
+    def __init__(
+        self,
+        ttl_seconds: float | None = None,
+        distinct_responses_for_repeated_prompts: bool = True,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.distinct_responses_for_repeated_prompts = (
+            distinct_responses_for_repeated_prompts
+        )
+        self._times_key_requested: defaultdict[str, int] = defaultdict(int)
+
+    def make_key(self, litellm_kwargs: dict[str, Any], model_input: Any) -> str:
+        """
+        Returns the cache key for the next request with these arguments.
+        This must be called exactly once per request.
+        """
+        kwargs_in_key = {
+            key: value
+            for key, value in litellm_kwargs.items()
+            if key not in self.KWARGS_EXCLUDED_FROM_KEY
+        }
+        serialized_request = json.dumps(
+            {"kwargs": kwargs_in_key, "input": model_input},
+            sort_keys=True,
+            default=str,
+        )
+        base_key = hashlib.sha256(serialized_request.encode()).hexdigest()
+        if not self.distinct_responses_for_repeated_prompts:
+            return base_key
+        occurrence = self._times_key_requested[base_key]
+        self._times_key_requested[base_key] += 1
+        return f"{base_key}-{occurrence}"
+
+    def get(self, key: str) -> TextTokenCostResponse | None:
+        entry = self._get_entry(key)
+        if entry is None:
+            return None
+        if self._is_expired(entry):
+            self._delete_entry(key)
+            return None
+        return entry.response
+
+    def set(self, key: str, response: TextTokenCostResponse) -> None:
+        self._set_entry(
+            key, CachedLlmResponse(response=response, created_at=time.time())
+        )
+
+    def _is_expired(self, entry: CachedLlmResponse) -> bool:
+        return (
+            self.ttl_seconds is not None
+            and time.time() - entry.created_at > self.ttl_seconds
+        )
+
+    @abstractmethod
+    def _get_entry(self, key: str) -> CachedLlmResponse | None: ...
+
+    @abstractmethod
+    def _set_entry(self, key: str, entry: CachedLlmResponse) -> None: ...
+
+    @abstractmethod
+    def _delete_entry(self, key: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class InMemoryLlmResponseCache(LlmResponseCache):
+    """
+    Least recently used cache that only lasts for the life of the process
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: float | None = None,
+        distinct_responses_for_repeated_prompts: bool = True,
+    ) -> None:
+        super().__init__(ttl_seconds, distinct_responses_for_repeated_prompts)
+        assert max_entries > 0, "Cache must be able to hold at least one entry"
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedLlmResponse] = OrderedDict()
+
+    def _get_entry(self, key: str) -> CachedLlmResponse | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _set_entry(self, key: str, entry: CachedLlmResponse) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _delete_entry(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SqliteLlmResponseCache(LlmResponseCache):
+    """
+    Persistent cache in a single SQLite file. When `max_entries` is set,
+    the least recently used entries are evicted once it is exceeded.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "logs/cache/llm_responses.sqlite3",
+        max_entries: int | None = None,
+        ttl_seconds: float | None = None,
+        distinct_responses_for_repeated_prompts: bool = True,
+    ) -> None:
+        super().__init__(ttl_seconds, distinct_responses_for_repeated_prompts)
+        self.db_path = db_path
+        self.max_entries = max_entries
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    entry TEXT NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+                """
+            )
+
+    def _get_entry(self, key: str) -> CachedLlmResponse | None:
+        with closing(self._connect()) as connection, connection:
+            row = connection.execute(
+                "SELECT entry FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE responses SET last_used_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+        return CachedLlmResponse.model_validate_json(row[0])
+
+    def _set_entry(self, key: str, entry: CachedLlmResponse) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, entry, last_used_at) VALUES (?, ?, ?)",
+                (key, entry.model_dump_json(), time.time()),
+            )
+            if self.max_entries is not None:
+                connection.execute(
+                    """
+                    DELETE FROM responses WHERE key NOT IN (
+                        SELECT key FROM responses ORDER BY last_used_at DESC LIMIT ?
+                    )
+                    """,
+                    (self.max_entries,),
+                )
+
+    def _delete_entry(self, key: str) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM responses")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+
+class ShardedDirectoryLlmResponseCache(LlmResponseCache):
+    """
+    Persistent cache with one json file per response, sharded into
+    subdirectories by key prefix so that no directory gets too large.
+    Files are easy to inspect, copy between machines, or delete by hand.
+    Entries are only evicted by TTL.
+    """
+
+    def __init__(
+        self,
+        directory: str = "logs/cache/llm_responses",
+        ttl_seconds: float | None = None,
+        distinct_responses_for_repeated_prompts: bool = True,
+    ) -> None:
+        super().__init__(ttl_seconds, distinct_responses_for_repeated_prompts)
+        self.directory = directory
+
+    def _get_entry(self, key: str) -> CachedLlmResponse | None:
+        path = self._get_path(key)
+        if not os.path.exists(path):
+            return None
+        return CachedLlmResponse.model_validate_json(
+            file_manipulation.load_text_file(path)
+        )
+
+    def _set_entry(self, key: str, entry: CachedLlmResponse) -> None:
+        file_manipulation.create_or_overwrite_file(
+            self._get_path(key), entry.model_dump_json()
+        )
+
+    def _delete_entry(self, key: str) -> None:
+        try:
+            os.remove(self._get_path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        if not os.path.isdir(self.directory):
+            return
+        for shard in os.listdir(self.directory):
+            shard_path = os.path.join(self.directory, shard)
+            if not os.path.isdir(shard_path):
+                continue
+            for file_name in os.listdir(shard_path):
+                if file_name.endswith(".json"):
+                    os.remove(os.path.join(shard_path, file_name))
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
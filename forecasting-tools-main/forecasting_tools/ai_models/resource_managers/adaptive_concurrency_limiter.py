@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ConcurrencyStats:
+    requests: int = 0
+    rate_limited: int = 0
+    slow_responses: int = 0
+    total_queue_seconds: float = 0
+    max_queue_seconds: float = 0
+    total_latency_seconds: float = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "slow_responses": self.slow_responses,
+            "mean_queue_seconds": self.total_queue_seconds / max(1, self.requests),
+            "max_queue_seconds": self.max_queue_seconds,
+            "mean_latency_seconds": self.total_latency_seconds / max(1, self.requests),
+        }
+
+
+@dataclass
+class _KeyState:
+    limit: float
+    last_decrease: float = float("-inf")
+    paused_until: float = 0
+    stats: ConcurrencyStats = field(default_factory=ConcurrencyStats)
+
+
+@dataclass
+class _LoopSlots:
+    in_flight: int = 0
+    # Slots handed to woken waiters that have not started their request yet
+    reserved: int = 0
+    waiters: deque[asyncio.Future] = field(default_factory=deque)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limits how many requests run at once per key (e.g. "openrouter/openai/gpt-4o")
+    and adapts each limit AIMD style, like TCP congestion control:
+    - Each success raises the limit by `additive_increase / limit`, so about
+      `additive_increase` per full window of requests
+    - A rate limit error (HTTP 429) multiplies the limit by `decrease_factor` and
+      pauses new requests for the key for the Retry-After time, if one was given
+    - If `latency_target_seconds` is set, a slower success multiplies the limit
+      by `latency_decrease_factor`
+
+    Only one decrease happens per window: failures of requests that started before
+    the last decrease were sent under the old limit and are not counted again.
+    Requests wait in FIFO order. Queueing delay, latency and rate limits are
+    recorded per key (see `summary`).
+
+    The learned limits are shared by every event loop, but the slots are counted
+    per loop, since waiting requests can only be woken on their own loop.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 8,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        additive_increase: float = 1,
+        decrease_factor: float = 0.5,
+        latency_target_seconds: float | None = None,
+        latency_decrease_factor: float = 0.9,
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min <= initial <= max")
+        if not 0 < decrease_factor < 1 or not 0 < latency_decrease_factor < 1:
+            raise ValueError("Decrease factors must be between 0 and 1")
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.additive_increase = additive_increase
+        self.decrease_factor = decrease_factor
+        self.latency_target_seconds = latency_target_seconds
+        self.latency_decrease_factor = latency_decrease_factor
+        self._states: dict[str, _KeyState] = {}
+        self._slots: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, _LoopSlots]
+        ] = weakref.WeakKeyDictionary()
+
+    @asynccontextmanager
+    async def slot(self, key: str) -> AsyncIterator[None]:
+        """
+        Waits for a free slot for `key` and holds it for the duration of the
+        block. Errors raised in the block are used as backpressure signals.
+        """
+        started_at = await self.acquire(key)
+        try:
+            yield
+        except BaseException as error:
+            self.release(key, started_at, error)
+            raise
+        else:
+            self.release(key, started_at)
+
+    async def acquire(self, key: str) -> float:
+        """Returns the start time to pass to `release`."""
+        state = self._get_state(key)
+        slots = self._get_slots(key)
+        queued_at = time.monotonic()
+        has_reservation = False
+        try:
+            while True:
+                pause = state.paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    continue
+                if has_reservation:
+                    slots.reserved -= 1
+                    has_reservation = False
+                    break
+                if not slots.waiters and self._has_free_slot(state, slots):
+                    break
+                waiter = asyncio.get_running_loop().create_future()
+                slots.waiters.append(waiter)
+                try:
+                    await waiter
+                except BaseException:
+                    if waiter in slots.waiters:
+                        slots.waiters.remove(waiter)
+                    elif waiter.done() and not waiter.cancelled():
+                        has_reservation = True
+                    raise
+                has_reservation = True
+        except BaseException:
+            if has_reservation:
+                # Give the slot this request was woken for to the next waiter
+                slots.reserved -= 1
+                self._wake_waiters(state, slots)
+            raise
+        slots.in_flight += 1
+        started_at = time.monotonic()
+        queue_seconds = started_at - queued_at
+        state.stats.requests += 1
+        state.stats.total_queue_seconds += queue_seconds
+        state.stats.max_queue_seconds = max(
+            state.stats.max_queue_seconds, queue_seconds
+        )
+        return started_at
+
+    def release(
+        self, key: str, started_at: float, error: BaseException | None = None
+    ) -> None:
+        state = self._get_state(key)
+        slots = self._get_slots(key)
+        slots.in_flight -= 1
+        now = time.monotonic()
+        latency = now - started_at
+        state.stats.total_latency_seconds += latency
+
+        if error is not None and is_rate_limit_error(error):
+            state.stats.rate_limited += 1
+            self._decrease(key, state, started_at, self.decrease_factor)
+            retry_after = get_retry_after_seconds(error)
+            if retry_after:
+                state.paused_until = max(state.paused_until, now + retry_after)
+        elif (
+            error is None
+            and self.latency_target_seconds is not None
+            and latency > self.latency_target_seconds
+        ):
+            state.stats.slow_responses += 1
+            self._decrease(key, state, started_at, self.latency_decrease_factor)
+        elif error is None:
+            state.limit = min(
+                self.max_limit, state.limit + self.additive_increase / state.limit
+            )
+        self._wake_waiters(state, slots)
+
+    def get_limit(self, key: str) -> float:
+        return self._get_state(key).limit
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        return {
+            key: {"limit": round(state.limit, 2), **state.stats.to_dict()}
+            for key, state in self._states.items()
+        }
+
+    def _decrease(
+        self, key: str, state: _KeyState, started_at: float, factor: float
+    ) -> None:
+        if started_at < state.last_decrease:
+            return
+        state.limit = max(self.min_limit, state.limit * factor)
+        state.last_decrease = time.monotonic()
+        logger.info(f"Concurrency limit for {key} lowered to {state.limit:.1f}")
+
+    def _has_free_slot(self, state: _KeyState, slots: _LoopSlots) -> bool:
+        return slots.in_flight + slots.reserved < int(state.limit)
+
+    def _wake_waiters(self, state: _KeyState, slots: _LoopSlots) -> None:
+        while slots.waiters and self._has_free_slot(state, slots):
+            waiter = slots.waiters.popleft()
+            if not waiter.done():
+                slots.reserved += 1
+                waiter.set_result(None)
+
+    def _get_state(self, key: str) -> _KeyState:
+        if key not in self._states:
+            self._states[key] = _KeyState(limit=self.initial_limit)
+        return self._states[key]
+
+    def _get_slots(self, key: str) -> _LoopSlots:
+        slots_by_key = self._slots.setdefault(asyncio.get_running_loop(), {})
+        if key not in slots_by_key:
+            slots_by_key[key] = _LoopSlots()
+        return slots_by_key[key]
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Recognizes 429s from openai, anthropic, litellm and httpx errors."""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code == 429 or "RateLimit" in type(error).__name__
+
+
+def get_retry_after_seconds(error: BaseException) -> float | None:
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers is None:
+        headers = getattr(error, "headers", None)
+    if not headers:
+        return None
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms is not None:
+            return float(retry_after_ms) / 1000
+        retry_after = headers.get("retry-after")
+        if retry_after is None:
+            return None
+        try:
+            return float(retry_after)
+        except ValueError:
+            retry_at = parsedate_to_datetime(retry_after)
+            return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+_shared_limiter = AdaptiveConcurrencyLimiter()
+
+
+def get_shared_concurrency_limiter() -> AdaptiveConcurrencyLimiter:
+    """Limiter used by every GeneralLlm (and ag_forecast backend) not given its own."""
+    return _shared_limiter
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from forecasting_tools.ai_models.resource_managers.token_bucket_rate_limiter import (
+    TokenBucketRateLimiter,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LlmRateLimit:
+    """Per minute budgets for a provider or model. None means unlimited."""
+
+    requests_per_minute: float | None = None
+    tokens_per_minute: float | None = None
+
+    def __post_init__(self) -> None:
+        for name in ["requests_per_minute", "tokens_per_minute"]:
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be greater than 0, got {value}")
+
+
+@dataclass
+class RateLimitStats:
+    requests: int = 0
+    tokens: int = 0
+    delayed_requests: int = 0
+    total_wait_seconds: float = 0
+    max_wait_seconds: float = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "tokens": self.tokens,
+            "delayed_requests": self.delayed_requests,
+            "total_wait_seconds": self.total_wait_seconds,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+
+@dataclass
+class _Budget:
+    requests: TokenBucketRateLimiter | None
+    tokens: TokenBucketRateLimiter | None
+    stats: RateLimitStats = field(default_factory=RateLimitStats)
+
+
+class LlmRateLimiter:
+    """
+    Enforces request and token per minute budgets before a model is called, so
+    requests wait their turn instead of triggering 429s and retry backoff.
+    - Limits are registered by model prefix with `set_limit` (e.g. "openrouter/" for
+      every OpenRouter model, or "openrouter/openai/gpt-4o" for one model). A model uses
+      the longest matching prefix, and every model matching that prefix shares its budget
+      (like a provider's account wide limits do).
+    - A limit passed to `wait_for_capacity` directly is used instead, budgeted per model
+      (callers passing the same limit for the same model share one budget).
+    - Each budget is a pair of TokenBucketRateLimiters that start full and refill at
+      limit/60 per second, like the providers' own limiters. A prompt with more tokens
+      than a whole minute's budget only waits for a full bucket.
+    """
+
+    def __init__(self, limits: dict[str, LlmRateLimit] | None = None) -> None:
+        self._limits: dict[str, LlmRateLimit] = dict(limits or {})
+        self._budgets: dict[tuple[str, LlmRateLimit], _Budget] = {}
+
+    def set_limit(self, key_prefix: str, limit: LlmRateLimit | None) -> None:
+        if limit is None:
+            self._limits.pop(key_prefix, None)
+        else:
+            self._limits[key_prefix] = limit
+
+    def get_limit(self, key: str) -> tuple[str, LlmRateLimit] | None:
+        matching_prefixes = [
+            prefix for prefix in self._limits if key.startswith(prefix)
+        ]
+        if not matching_prefixes:
+            return None
+        prefix = max(matching_prefixes, key=len)
+        return prefix, self._limits[prefix]
+
+    def needs_token_count(self, key: str, limit: LlmRateLimit | None = None) -> bool:
+        if limit is None:
+            registered = self.get_limit(key)
+            limit = registered[1] if registered else None
+        return limit is not None and limit.tokens_per_minute is not None
+
+    async def wait_for_capacity(
+        self, key: str, tokens: int = 0, limit: LlmRateLimit | None = None
+    ) -> float:
+        """Waits until one request of `tokens` tokens fits the budget, returning the seconds waited"""
+        budget = self._get_budget(key, limit)
+        if budget is None:
+            return 0
+        started_at = time.monotonic()
+        if budget.requests is not None:
+            await budget.requests.wait_till_able_to_acquire_resources(
+                min(1, budget.requests.capacity)
+            )
+        if budget.tokens is not None:
+            await budget.tokens.wait_till_able_to_acquire_resources(
+                min(tokens, budget.tokens.capacity)
+            )
+        waited = time.monotonic() - started_at
+
+        stats = budget.stats
+        stats.requests += 1
+        stats.tokens += tokens
+        stats.total_wait_seconds += waited
+        stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+        if waited > 0.01:
+            stats.delayed_requests += 1
+            logger.debug(f"Waited {waited:.2f}s for rate limit budget of {key}")
+        return waited
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        keys = [key for key, _ in self._budgets]
+        return {
+            (key if keys.count(key) == 1 else f"{key} {limit}"): {
+                "requests_per_minute": limit.requests_per_minute,
+                "tokens_per_minute": limit.tokens_per_minute,
+                **budget.stats.to_dict(),
+            }
+            for (key, limit), budget in self._budgets.items()
+        }
+
+    def _get_budget(self, key: str, limit: LlmRateLimit | None) -> _Budget | None:
+        if limit is not None:
+            budget_key = key
+        else:
+            registered = self.get_limit(key)
+            if registered is None:
+                return None
+            budget_key, limit = registered
+
+        budget = self._budgets.get((budget_key, limit))
+        if budget is None:
+            budget = _Budget(
+                requests=self._make_bucket(limit.requests_per_minute),
+                tokens=self._make_bucket(limit.tokens_per_minute),
+            )
+            self._budgets[(budget_key, limit)] = budget
+        return budget
+
+    @staticmethod
+    def _make_bucket(per_minute: float | None) -> TokenBucketRateLimiter | None:
+        if per_minute is None:
+            return None
+        return TokenBucketRateLimiter(capacity=per_minute, refresh_rate=per_minute / 60)
+
+
+_shared_limiter = LlmRateLimiter()
+
+
+def get_shared_llm_rate_limiter() -> LlmRateLimiter:
+    """Rate limiter used by every GeneralLlm not given its own."""
+    return _shared_limiter
@@ -23,11 +23,32 @@ class MonetaryCostManager(HardLimitManager):
     The cost will not register until the coroutines finish.
     """
 
+    def __init__(
+        self, hard_limit: float = 0, log_usage_when_called: bool = False
+    ) -> None:
+        super().__init__(hard_limit, log_usage_when_called)
+        self._saved_usage: float = 0
+
+    @property
+    def saved_usage(self) -> float:
+        """
+        Cost that would have been spent on requests that were answered from a cache instead
+        """
+        return self._saved_usage
+
     def __enter__(self) -> MonetaryCostManager:
         super().__enter__()
         LitellmCostTracker.initialize_cost_tracking()
         return self
 
+    @classmethod
+    def increase_saved_usage_in_parent_managers(cls, amount: float) -> None:
+        if amount < 0:
+            raise ValueError("Saved cost should be a positive number or zero")
+        for cost_manager in cls.get_active_cost_managers():
+            if isinstance(cost_manager, MonetaryCostManager):
+                cost_manager._saved_usage += amount
+
 
 class LitellmCostTracker(LitellmCustomLogger):
     """
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+
+from forecasting_tools.ai_models.resource_managers.refreshing_bucket_rate_limiter import (
+    LimitReachedResponse,
+    ResourceUnavailableError,
+)
+
+logger = logging.getLogger(__name__)
+
+# Lets a waiter through when float error leaves it a hair short of its resources
+_TOLERANCE_SECONDS = 1e-9
+
+
+@dataclass
+class _Waiter:
+    resources: float
+    future: asyncio.Future
+
+
+@dataclass
+class _LoopWaiters:
+    queue: deque[_Waiter] = field(default_factory=deque)
+    timer: asyncio.TimerHandle | None = None
+
+
+class TokenBucketRateLimiter:
+    """
+    A token bucket rate limiter that only tracks how far the bucket is from full and
+    when that was measured (as in GCRA, the "generic cell rate algorithm"), so each
+    acquire is O(1) no matter how much has been used before.
+    - `capacity` is the burst size and `refresh_rate` the resources regained per second
+    - The bucket refills continuously. Unlike RefreshingBucketRateLimiter, running it
+      empty does not block until it is full again, so over any T seconds at most
+      `capacity + refresh_rate * T` resources are used. Pick a smaller capacity if a
+      "per period" limit must hold even right after a burst.
+    - Waiters are served in FIFO order (a large request is not starved by small
+      ones) and are woken by a timer set for exactly when their resources are
+      available, rather than polling.
+    - `history_size` keeps the latest acquisitions in a ring buffer for metrics.
+    - `try_acquire` and `get_available_resources` are synchronous and never start
+      an event loop, so they are safe to call from inside a running one.
+
+    Time is measured with a monotonic clock. Meant to be used from one thread (like
+    the rest of asyncio), which is why no locks are needed.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        refresh_rate: float,
+        limit_reached_response: LimitReachedResponse = LimitReachedResponse.WAIT,
+        history_size: int = 0,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be greater than 0")
+        if refresh_rate < 0:
+            raise ValueError("refresh_rate must not be negative")
+        elif refresh_rate == 0:
+            logger.info("refresh_rate is 0, resources will not refresh")
+        self.capacity = capacity
+        self.refresh_rate = refresh_rate
+        self.limit_reached_response = limit_reached_response
+        self.total_resources_acquired: float = 0
+        self.history: deque[tuple[float, float]] = deque(maxlen=history_size)
+        # Resources still missing from a full bucket as of `_updated_at`
+        self._debt: float = 0
+        self._updated_at = time.monotonic()
+        self._waiters: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, _LoopWaiters
+        ] = weakref.WeakKeyDictionary()
+
+    def get_available_resources(self) -> float:
+        self._refill()
+        return self.capacity - self._debt
+
+    def try_acquire(self, resources: float) -> bool:
+        """Takes the resources if they are available now, without waiting"""
+        self._validate_request(resources)
+        if any(waiters.queue for waiters in self._waiters.values()):
+            return False
+        return self._consume_if_available(resources)
+
+    def zero_out_resources(self) -> None:
+        self._refill()
+        self._debt = self.capacity
+
+    def seconds_until_available(self, resources: float) -> float:
+        self._refill()
+        missing = resources - (self.capacity - self._debt)
+        if missing <= 0:
+            return 0
+        if self.refresh_rate == 0:
+            return float("inf")
+        return missing / self.refresh_rate
+
+    def resources_used_in_last(self, seconds: float) -> float:
+        """Only covers what is still in the history ring buffer"""
+        since = time.monotonic() - seconds
+        return sum(
+            resources for acquired_at, resources in self.history if acquired_at > since
+        )
+
+    async def wait_till_able_to_acquire_resources(self, resources: float) -> None:
+        self._validate_request(resources)
+        waiters = self._get_waiters()
+        if not waiters.queue and self._consume_if_available(resources):
+            return
+        if self.limit_reached_response == LimitReachedResponse.RAISE_EXCEPTION:
+            raise ResourceUnavailableError(
+                "Resources not available. Limit Reached Response is RAISE_EXCEPTION"
+            )
+        if self.refresh_rate == 0:
+            raise RuntimeError(
+                "Resources not available. Would have waited indefinitely. refresh_rate is 0"
+            )
+
+        waiter = _Waiter(resources, asyncio.get_running_loop().create_future())
+        waiters.queue.append(waiter)
+        if len(waiters.queue) == 1:
+            self._schedule_wakeup(waiters)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Resources were taken for this waiter just before it was cancelled
+                self._debt = max(0, self._debt - resources)
+                self.total_resources_acquired -= resources
+                self._serve_waiters(waiters)
+            elif waiter in waiters.queue:
+                was_first = waiters.queue[0] is waiter
+                waiters.queue.remove(waiter)
+                if was_first:
+                    self._serve_waiters(waiters)
+            raise
+
+    def _validate_request(self, resources: float) -> None:
+        if resources > self.capacity:
+            raise ValueError(
+                f"resources being consumed must be less than or equal to capacity. Capacity: {self.capacity}, resources being consumed: {resources}"
+            )
+        if resources < 0:
+            raise ValueError("resources being consumed must not be negative")
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._debt = max(0, self._debt - (now - self._updated_at) * self.refresh_rate)
+        self._updated_at = now
+
+    def _consume_if_available(self, resources: float) -> bool:
+        self._refill()
+        tolerance = _TOLERANCE_SECONDS * self.refresh_rate
+        if self._debt + resources > self.capacity + tolerance:
+            return False
+        self._debt = min(self.capacity, self._debt + resources)
+        self.total_resources_acquired += resources
+        if self.history.maxlen:
+            self.history.append((self._updated_at, resources))
+        return True
+
+    def _serve_waiters(self, waiters: _LoopWaiters) -> None:
+        if waiters.timer is not None:
+            waiters.timer.cancel()
+            waiters.timer = None
+        while waiters.queue:
+            waiter = waiters.queue[0]
+            if waiter.future.done():
+                waiters.queue.popleft()
+                continue
+            if not self._consume_if_available(waiter.resources):
+                break
+            waiters.queue.popleft()
+            waiter.future.set_result(None)
+        self._schedule_wakeup(waiters)
+
+    def _schedule_wakeup(self, waiters: _LoopWaiters) -> None:
+        if not waiters.queue or waiters.timer is not None:
+            return
+        delay = self.seconds_until_available(waiters.queue[0].resources)
+        waiters.timer = asyncio.get_running_loop().call_later(
+            delay, self._serve_waiters, waiters
+        )
+
+    def _get_waiters(self) -> _LoopWaiters:
+        loop = asyncio.get_running_loop()
+        if loop not in self._waiters:
+            self._waiters[loop] = _LoopWaiters()
+        return self._waiters[loop]
@@ -13,6 +13,7 @@ from forecasting_tools.auto_optimizers.prompt_data_models import (
 )
 from forecasting_tools.auto_optimizers.question_plus_research import (
     QuestionPlusResearch,
+    ResearchSnapshotIndex,
     ResearchType,
 )
 from forecasting_tools.cp_benchmarking.benchmark_for_bot import BenchmarkForBot
@@ -71,6 +72,8 @@ class BotEvaluator:
                 snapshot.question for snapshot in input_questions
             ]
             self.research_snapshots = input_questions
+        # Built once and shared by every bot this evaluator creates
+        self.research_index = ResearchSnapshotIndex(self.research_snapshots)
 
         self.research_type = research_type
         self.concurrent_evaluation_batch_size = concurrent_evaluation_batch_size
@@ -116,7 +119,7 @@ class BotEvaluator:
                 research_prompt=config.research_prompt_template,
                 reasoning_prompt=config.reasoning_prompt_template,
                 research_tools=config.research_tools,
-                cached_research=self.research_snapshots or None,
+                cached_research=self.research_index,
                 cached_research_type=self.research_type,
                 research_reports_per_question=config.research_reports_per_question,
                 predictions_per_research_report=config.predictions_per_research_report,
@@ -17,6 +17,7 @@ from forecasting_tools.auto_optimizers.prompt_data_models import (
 )
 from forecasting_tools.auto_optimizers.question_plus_research import (
     QuestionPlusResearch,
+    ResearchSnapshotIndex,
     ResearchType,
 )
 from forecasting_tools.data_models.binary_report import BinaryPrediction
@@ -140,7 +141,7 @@ class CustomizableBot(ForecastBot):
         research_prompt: str,
         reasoning_prompt: str,
         research_tools: list[ResearchTool],
-        cached_research: list[QuestionPlusResearch] | None,
+        cached_research: list[QuestionPlusResearch] | ResearchSnapshotIndex | None,
         cached_research_type: ResearchType | None,
         originating_idea: PromptIdea | None,
         parameters_to_exclude_from_config_dict: list[str] | None = [
@@ -162,12 +163,15 @@ class CustomizableBot(ForecastBot):
         self.research_type = cached_research_type
         self.originating_idea = originating_idea  # As of May 26, 2025 This parameter is logged in the config for the bot, even if not used here.
 
+        if not isinstance(cached_research, ResearchSnapshotIndex):
+            cached_research = ResearchSnapshotIndex(cached_research or [])
         self._validate_cache(cached_research)
 
         if not self.get_llm("researcher"):
             raise ValueError("Research LLM must be provided")
 
-        self.cached_research = cached_research or []
+        self.research_index = cached_research
+        self.cached_research = list(cached_research.snapshots)
 
         self.validate_research_prompt(self.research_prompt)
         self.validate_reasoning_prompt(self.reasoning_prompt)
@@ -224,22 +228,11 @@ class CustomizableBot(ForecastBot):
         return research
 
     def _get_cached_research(self, question: MetaculusQuestion) -> str:
-        matching_snapshots = [
-            snapshot
-            for snapshot in self.cached_research
-            if snapshot.question == question
-        ]
-        if len(matching_snapshots) > 1:
-            raise ValueError(
-                f"Expected 1 research snapshot for question {question.page_url}, got {len(matching_snapshots)}"
-            )
-        if len(matching_snapshots) == 1:
-            assert self.research_type is not None
-            return matching_snapshots[0].get_research_for_type(self.research_type)
-        else:
+        if self.research_type is None:
             raise ValueError(
                 f"No cached research found for question {question.page_url}"
             )
+        return self.research_index.get_research(question, self.research_type)
 
     async def _run_research_with_tools(self, question: MetaculusQuestion) -> str:
         research_llm = self.get_llm("researcher")
@@ -447,15 +440,8 @@ class CustomizableBot(ForecastBot):
                     f"Prompt contains duplicate template variables: {duplicates}. Prompt: {prompt}"
                 )
 
-    def _validate_cache(
-        self, cached_research: list[QuestionPlusResearch] | None
-    ) -> None:
-        if cached_research:
-            unique_questions = list(
-                set([snapshot.question.question_text for snapshot in cached_research])
-            )
-            if len(unique_questions) != len(cached_research):
-                raise ValueError("Research snapshots must have unique questions")
+    def _validate_cache(self, cached_research: ResearchSnapshotIndex) -> None:
+        if len(cached_research) > 0:
             if self.research_type is None:
                 raise ValueError(
                     "Research type must be provided if cached research is provided"
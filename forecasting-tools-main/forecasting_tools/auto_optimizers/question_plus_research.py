@@ -2,10 +2,13 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
+from types import MappingProxyType
+from typing import Mapping, Sequence
 
 from pydantic import AliasChoices, BaseModel, Field, field_validator
 
 from forecasting_tools.data_models.data_organizer import QuestionTypes
+from forecasting_tools.data_models.questions import MetaculusQuestion
 from forecasting_tools.helpers.asknews_searcher import AskNewsSearcher
 from forecasting_tools.util.jsonable import Jsonable
 
@@ -69,3 +72,74 @@ class QuestionPlusResearch(BaseModel, Jsonable):
                 f"Expected 1 research item for type {research_type}, got {len(items)}"
             )
         return items[0]
+
+
+QuestionKey = tuple[str, int | None, int | None, str]
+
+
+class ResearchSnapshotIndex:
+    """
+    Read-only lookup of snapshot research by question, built once and shared by every
+    bot that uses the same snapshots (e.g. all the bots a BotEvaluator creates), so
+    finding a question's research is a dict lookup rather than a scan comparing
+    whole questions.
+    """
+
+    def __init__(self, snapshots: Sequence[QuestionPlusResearch]) -> None:
+        unique_question_texts = {
+            snapshot.question.question_text for snapshot in snapshots
+        }
+        if len(unique_question_texts) != len(snapshots):
+            raise ValueError("Research snapshots must have unique questions")
+        research_by_question: dict[QuestionKey, Mapping[ResearchType, str]] = {}
+        for snapshot in snapshots:
+            key = self.get_question_key(snapshot.question)
+            items_by_type: dict[ResearchType, list[str]] = {}
+            for item in snapshot.research_items:
+                items_by_type.setdefault(item.type, []).append(item.research)
+            research_by_question[key] = MappingProxyType(
+                {
+                    research_type: items[0]
+                    for research_type, items in items_by_type.items()
+                    if len(items) == 1
+                }
+            )
+        self.snapshots: tuple[QuestionPlusResearch, ...] = tuple(snapshots)
+        self._research_by_question: Mapping[QuestionKey, Mapping[ResearchType, str]] = (
+            MappingProxyType(research_by_question)
+        )
+
+    @classmethod
+    def load_from_file(cls, project_file_path: str) -> ResearchSnapshotIndex:
+        return cls(QuestionPlusResearch.load_json_from_file_path(project_file_path))
+
+    @staticmethod
+    def get_question_key(question: MetaculusQuestion) -> QuestionKey:
+        return (
+            type(question).__name__,
+            question.id_of_post,
+            question.id_of_question,
+            question.question_text,
+        )
+
+    def get_research(
+        self, question: MetaculusQuestion, research_type: ResearchType
+    ) -> str:
+        research_by_type = self._research_by_question.get(
+            self.get_question_key(question)
+        )
+        if research_by_type is None:
+            raise ValueError(
+                f"No cached research found for question {question.page_url}"
+            )
+        if research_type not in research_by_type:
+            raise ValueError(
+                f"Expected 1 research item for type {research_type} for question {question.page_url}"
+            )
+        return research_by_type[research_type]
+
+    def __contains__(self, question: MetaculusQuestion) -> bool:
+        return self.get_question_key(question) in self._research_by_question
+
+    def __len__(self) -> int:
+        return len(self._research_by_question)
@@ -1,11 +1,14 @@
+import asyncio
 import logging
 import time
 from datetime import datetime
 from typing import Sequence
 
+import litellm
 import typeguard
 
 from forecasting_tools.ai_models.agent_wrappers import general_trace_or_span
+from forecasting_tools.ai_models.general_llm import GeneralLlm
 from forecasting_tools.ai_models.resource_managers.monetary_cost_manager import (
     MonetaryCostManager,
 )
@@ -32,6 +35,37 @@ class QuestionBatch:
         self.is_last_batch_for_benchmark = is_last_batch_for_benchmark
 
 
+class QuestionBudget:
+    """
+    Limits how many questions can be in flight at once. Unlike a semaphore,
+    a whole batch of questions can be acquired together.
+    """
+
+    def __init__(self, max_questions: int) -> None:
+        assert max_questions > 0, "Budget must allow at least one question"
+        self.max_questions = max_questions
+        self._questions_in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, num_questions: int) -> int:
+        """
+        Waits until there is room for the questions and returns how many were acquired
+        (batches larger than the whole budget are allowed to run alone)
+        """
+        num_questions = min(num_questions, self.max_questions)
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self._questions_in_flight + num_questions <= self.max_questions
+            )
+            self._questions_in_flight += num_questions
+        return num_questions
+
+    async def release(self, num_questions: int) -> None:
+        async with self._condition:
+            self._questions_in_flight -= num_questions
+            self._condition.notify_all()
+
+
 class Benchmarker:
     """
     This class is used to benchmark a list of forecast bots
@@ -54,7 +88,19 @@ class Benchmarker:
         file_path_to_save_reports: str | None = None,
         concurrent_question_batch_size: int = 10,
         additional_code_to_snapshot: list[type] | None = None,
+        max_concurrent_questions: int | None = None,
+        max_concurrent_questions_per_provider: dict[str, int] | None = None,
     ) -> None:
+        """
+        Each bot works through its questions one batch at a time, and batches of
+        different bots run concurrently.
+
+        :param concurrent_question_batch_size: Number of questions a bot forecasts at once
+        :param max_concurrent_questions: Total questions in flight across all bots.
+            Defaults to no limit beyond one batch per bot.
+        :param max_concurrent_questions_per_provider: Questions in flight for bots whose default
+            llm uses the provider (e.g. {"openrouter": 20, "anthropic": 10})
+        """
         if number_of_questions_to_use is not None and questions_to_use is not None:
             raise ValueError(
                 "Either number_of_questions_to_use or questions_to_use must be provided, not both"
@@ -78,6 +124,10 @@ class Benchmarker:
         self.initialization_timestamp = datetime.now()
         self.concurrent_question_batch_size = concurrent_question_batch_size
         self.code_to_snapshot = additional_code_to_snapshot
+        self.max_concurrent_questions = max_concurrent_questions
+        self.max_concurrent_questions_per_provider = (
+            max_concurrent_questions_per_provider or {}
+        )
 
     async def run_benchmark(self) -> list[BenchmarkForBot]:
         with general_trace_or_span("Benchmarker"):
@@ -108,23 +158,94 @@ class Benchmarker:
                 chosen_questions,
                 self.concurrent_question_batch_size,
             )
-            try:
-                for i, batch in enumerate(batches):
+            await self._run_batches_concurrently(batches, benchmarks)
+        return benchmarks
+
+    async def _run_batches_concurrently(
+        self, batches: list[QuestionBatch], benchmarks: list[BenchmarkForBot]
+    ) -> None:
+        global_budget = (
+            QuestionBudget(self.max_concurrent_questions)
+            if self.max_concurrent_questions is not None
+            else None
+        )
+        provider_budgets = {
+            provider: QuestionBudget(max_questions)
+            for provider, max_questions in self.max_concurrent_questions_per_provider.items()
+        }
+        total_questions = sum(len(batch.questions) for batch in batches)
+        questions_finished = 0
+        start_time = time.time()
+        ids_of_saved_benchmarks: set[int] = set()
+
+        async def run_batches_for_bot(bot_batches: list[QuestionBatch]) -> None:
+            nonlocal questions_finished
+            bot = bot_batches[0].bot
+            provider_budget = provider_budgets.get(self._get_provider_of_bot(bot))
+            budgets = [budget for budget in [provider_budget, global_budget] if budget]
+            for i, batch in enumerate(bot_batches):
+                acquired = [
+                    (budget, await budget.acquire(len(batch.questions)))
+                    for budget in budgets
+                ]
+                try:
                     with general_trace_or_span(
-                        f"{batch.benchmark.name} - Batch {i+1} of {len(batches)}"
+                        f"{batch.benchmark.name} - Batch {i+1} of {len(bot_batches)}"
                     ):
                         await self._run_a_batch(batch)
-                    if batch.is_last_batch_for_benchmark:
-                        self._append_benchmarks_to_jsonl_if_configured(
-                            [batch.benchmark]
-                        )
-            except KeyboardInterrupt:
-                logger.warning(
-                    "KeyboardInterrupt detected, saving current benchmark progress."
-                )
-                self._append_benchmarks_to_jsonl_if_configured([batch.benchmark])
-                raise
-        return benchmarks
+                finally:
+                    for budget, num_questions in acquired:
+                        await budget.release(num_questions)
+                questions_finished += len(batch.questions)
+                self._log_progress(questions_finished, total_questions, start_time)
+                if batch.is_last_batch_for_benchmark:
+                    self._append_benchmarks_to_jsonl_if_configured([batch.benchmark])
+                    ids_of_saved_benchmarks.add(id(batch.benchmark))
+
+        batches_per_benchmark = [
+            [batch for batch in batches if batch.benchmark is benchmark]
+            for benchmark in benchmarks
+        ]
+        try:
+            await asyncio.gather(
+                *[
+                    run_batches_for_bot(bot_batches)
+                    for bot_batches in batches_per_benchmark
+                    if bot_batches
+                ]
+            )
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            logger.warning("Benchmark interrupted, saving current benchmark progress.")
+            self._append_benchmarks_to_jsonl_if_configured(
+                [
+                    benchmark
+                    for benchmark in benchmarks
+                    if id(benchmark) not in ids_of_saved_benchmarks
+                ]
+            )
+            raise
+
+    @staticmethod
+    def _log_progress(
+        questions_finished: int, total_questions: int, start_time: float
+    ) -> None:
+        elapsed_minutes = (time.time() - start_time) / 60
+        minutes_per_question = elapsed_minutes / questions_finished
+        eta_minutes = minutes_per_question * (total_questions - questions_finished)
+        logger.info(
+            f"Benchmark progress: {questions_finished}/{total_questions} questions "
+            f"({questions_finished / total_questions:.0%}). "
+            f"Elapsed: {elapsed_minutes:.1f} min. ETA: {eta_minutes:.1f} min"
+        )
+
+    @staticmethod
+    def _get_provider_of_bot(bot: ForecastBot) -> str:
+        model = GeneralLlm.to_model_name(bot.get_llm("default"))
+        try:
+            _, provider, _, _ = litellm.get_llm_provider(model)
+            return provider
+        except Exception:
+            return model.split("/")[0]
 
     async def _run_a_batch(self, batch: QuestionBatch) -> None:
         bot = batch.bot
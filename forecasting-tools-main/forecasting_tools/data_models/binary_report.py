@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 import statistics
-from typing import Sequence
+from typing import TYPE_CHECKING, Sequence
 
 import numpy as np
 from pydantic import AliasChoices, BaseModel, Field, field_validator
@@ -10,6 +10,9 @@ from pydantic import AliasChoices, BaseModel, Field, field_validator
 from forecasting_tools.data_models.forecast_report import ForecastReport
 from forecasting_tools.data_models.questions import BinaryQuestion
 
+if TYPE_CHECKING:
+    from forecasting_tools.helpers.metaculus_client import MetaculusClient
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,8 +51,15 @@ class BinaryReport(ForecastReport):
             raise ValueError("Prediction must be between 0 and 1")
         return v
 
-    async def publish_report_to_metaculus(self) -> None:
-        from forecasting_tools.helpers.metaculus_api import MetaculusApi
+    async def publish_report_to_metaculus(
+        self, metaculus_client: MetaculusClient | None = None
+    ) -> None:
+        from forecasting_tools.helpers.metaculus_client import MetaculusClient
+
+        if metaculus_client is None:
+            async with MetaculusClient() as temporary_client:
+                await self.publish_report_to_metaculus(temporary_client)
+            return
 
         if self.question.id_of_question is None:
             raise ValueError("Question ID is None")
@@ -57,10 +67,12 @@ class BinaryReport(ForecastReport):
             raise ValueError(
                 "Publishing to Metaculus requires a post ID for the question"
             )
-        MetaculusApi.post_binary_question_prediction(
+        await metaculus_client.post_binary_question_prediction_async(
             self.question.id_of_question, self.prediction
         )
-        MetaculusApi.post_question_comment(self.question.id_of_post, self.explanation)
+        await metaculus_client.post_question_comment_async(
+            self.question.id_of_post, self.explanation
+        )
 
     @classmethod
     async def aggregate_predictions(
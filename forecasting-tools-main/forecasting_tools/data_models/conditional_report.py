@@ -1,3 +1,5 @@
+from typing import TYPE_CHECKING
+
 from pydantic import computed_field
 
 from forecasting_tools.ai_models.ai_utils.ai_misc import clean_indents
@@ -11,6 +13,9 @@ from forecasting_tools.data_models.questions import (
     MetaculusQuestion,
 )
 
+if TYPE_CHECKING:
+    from forecasting_tools.helpers.metaculus_client import MetaculusClient
+
 
 class ConditionalReport(ForecastReport):
     question: ConditionalQuestion
@@ -123,7 +128,9 @@ class ConditionalReport(ForecastReport):
         """
         )
 
-    async def publish_report_to_metaculus(self) -> None:
+    async def publish_report_to_metaculus(
+        self, metaculus_client: "MetaculusClient | None" = None
+    ) -> None:
         # TODO: publish parent/child reports if necessary
-        await self.yes_report.publish_report_to_metaculus()
-        await self.no_report.publish_report_to_metaculus()
+        await self.yes_report.publish_report_to_metaculus(metaculus_client)
+        await self.no_report.publish_report_to_metaculus(metaculus_client)
@@ -128,7 +128,10 @@ class DataOrganizer:
 
     @classmethod
     def load_reports_from_file_path(cls, file_path: str) -> list[ForecastReport]:
-        jsons = file_manipulation.load_json_file(file_path)
+        if file_path.endswith(".jsonl"):
+            jsons = file_manipulation.load_jsonl_file(file_path)
+        else:
+            jsons = file_manipulation.load_json_file(file_path)
         reports = cls._load_objects_from_json(jsons, cls.get_all_report_types())  # type: ignore
         reports = typeguard.check_type(reports, list[ForecastReport])
         return reports
@@ -1,20 +1,34 @@
 from __future__ import annotations
 
+import functools
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Generic, Sequence, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, Sequence, TypeVar
 
 import typeguard
 from pydantic import BaseModel, Field, field_validator
 
-from forecasting_tools.data_models.markdown_tree import MarkdownTree
+from forecasting_tools.data_models.markdown_tree import (
+    MarkdownSectionIndex,
+    MarkdownSectionSpan,
+    MarkdownTree,
+)
 from forecasting_tools.data_models.questions import MetaculusQuestion
 from forecasting_tools.util.jsonable import Jsonable
 
+if TYPE_CHECKING:
+    from forecasting_tools.helpers.metaculus_client import MetaculusClient
+
 logger = logging.getLogger(__name__)
 T = TypeVar("T")
 
 
+@functools.lru_cache(maxsize=256)
+def _get_section_index(explanation: str) -> MarkdownSectionIndex:
+    # Kept outside the report so the cache is not part of model equality or copies
+    return MarkdownSectionIndex(explanation)
+
+
 class ReasonedPrediction(BaseModel, Generic[T]):
     prediction_value: T
     reasoning: str
@@ -43,34 +57,39 @@ class ForecastReport(BaseModel, Jsonable, ABC):
             raise ValueError("Explanation must start with a '#' character")
         return v
 
+    @property
+    def section_index(self) -> MarkdownSectionIndex:
+        """Parsed once per explanation text (recently used ones are cached)"""
+        return _get_section_index(self.explanation)
+
     @property
     def report_sections(self) -> list[MarkdownTree]:
-        return MarkdownTree.turn_markdown_into_report_sections(self.explanation)
+        return self.section_index.to_markdown_trees()
 
     @property
     def summary(self) -> str:
-        return self._get_and_validate_section(
-            index=0, expected_word="summary"
-        ).text_of_section_and_subsections
+        return self.section_index.text_of_section_and_subsections(
+            self._get_and_validate_section(index=0, expected_word="summary")
+        )
 
     @property
     def research(self) -> str:
-        return self._get_and_validate_section(
-            index=1, expected_word="research"
-        ).text_of_section_and_subsections
+        return self.section_index.text_of_section_and_subsections(
+            self._get_and_validate_section(index=1, expected_word="research")
+        )
 
     @property
     def forecast_rationales(self) -> str:
-        return self._get_and_validate_section(
-            index=2, expected_word="forecast"
-        ).text_of_section_and_subsections
+        return self.section_index.text_of_section_and_subsections(
+            self._get_and_validate_section(index=2, expected_word="forecast")
+        )
 
     @property
     def first_rationale(self) -> str:
-        return (
-            self._get_and_validate_section(index=2, expected_word="forecast")
-            .sub_sections[0]
-            .text_of_section_and_subsections
+        return self.section_index.text_of_section_and_subsections(
+            self._get_and_validate_section(
+                index=2, expected_word="forecast"
+            ).sub_sections[0]
         )
 
     @property
@@ -125,14 +144,23 @@ class ForecastReport(BaseModel, Jsonable, ABC):
         raise NotImplementedError("Subclass must implement this abstract method")
 
     @abstractmethod
-    async def publish_report_to_metaculus(self) -> None:
+    async def publish_report_to_metaculus(
+        self, metaculus_client: MetaculusClient | None = None
+    ) -> None:
+        """
+        Posts the prediction and explanation to Metaculus. Pass in a client to reuse
+        its connection pool, otherwise a temporary one is created and closed.
+        """
         raise NotImplementedError("Subclass must implement this abstract method")
 
-    def _get_and_validate_section(self, index: int, expected_word: str) -> MarkdownTree:
-        if len(self.report_sections) <= index:
+    def _get_and_validate_section(
+        self, index: int, expected_word: str
+    ) -> MarkdownSectionSpan:
+        section_index = self.section_index
+        if len(section_index.sections) <= index:
             raise ValueError(f"Report must have at least {index + 1} sections")
-        section = self.report_sections[index]
-        first_line = section.text_of_section_and_subsections.split("\n")[0]
+        section = section_index.sections[index]
+        first_line = section_index.lines[section.start_line]
         if expected_word.lower() not in first_line.lower():
             raise ValueError(
                 f"The indexes for the sections are probably off. Target section title should contain the word '{expected_word}'"
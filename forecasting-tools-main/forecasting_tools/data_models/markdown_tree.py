@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import copy
 import re
+from dataclasses import dataclass
 
 from pydantic import BaseModel, model_validator
 
+HEADER_LINE_PATTERN = re.compile(r"^#{1,8} ")
+
 
 class MarkdownTree(BaseModel):
     """
@@ -19,10 +22,13 @@ class MarkdownTree(BaseModel):
 
     @property
     def text_of_section_and_subsections(self) -> str:
-        text = self.section_content
-        for subsection in self.sub_sections:
-            text += f"\n{subsection.text_of_section_and_subsections}"
-        return text
+        parts: list[str] = []
+        sections_to_visit = [self]
+        while sections_to_visit:
+            section = sections_to_visit.pop()
+            parts.append(section.section_content)
+            sections_to_visit.extend(reversed(section.sub_sections))
+        return "\n".join(parts)
 
     @classmethod
     def report_sections_to_markdown(
@@ -78,103 +84,7 @@ class MarkdownTree(BaseModel):
 
     @classmethod
     def turn_markdown_into_report_sections(cls, markdown: str) -> list[MarkdownTree]:
-        final_heirarchial_sections: list[MarkdownTree] = []
-        lines = markdown.splitlines()
-        flattened_running_section_stack: list[MarkdownTree] = []
-
-        for line in lines:
-            line_is_header = re.match(r"^#{1,8} ", line)
-            at_top_level = not flattened_running_section_stack
-            should_create_new_header_section = line_is_header
-            within_normal_section_at_non_header_line = (
-                not at_top_level and not line_is_header
-            )
-            within_intro_section_without_header = (
-                final_heirarchial_sections and not line_is_header and at_top_level
-            )
-            should_create_intro_section_without_header = (
-                not final_heirarchial_sections and not line_is_header and at_top_level
-            )
-
-            if should_create_new_header_section:
-                new_section = cls.__create_new_section_using_header_line(line)
-                cls.__remove_sections_from_stack_until_at_level_higher_than_new_section_level(
-                    flattened_running_section_stack, new_section.level
-                )
-                cls.__add_new_section_to_active_section_or_else_to_top_section_list(
-                    flattened_running_section_stack,
-                    final_heirarchial_sections,
-                    new_section,
-                )
-                flattened_running_section_stack.append(new_section)
-            elif within_normal_section_at_non_header_line:
-                active_section = flattened_running_section_stack[-1]
-                active_section.section_content += f"\n{line}"
-            elif should_create_intro_section_without_header:
-                final_heirarchial_sections.append(
-                    MarkdownTree(
-                        level=0,
-                        title=None,
-                        section_content=line,
-                        sub_sections=[],
-                    )
-                )
-            elif within_intro_section_without_header:
-                assert (
-                    len(final_heirarchial_sections) == 1
-                    and final_heirarchial_sections[0].title is None
-                )
-                intro_section_without_header = final_heirarchial_sections[-1]
-                intro_section_without_header.section_content += f"\n{line}"
-            else:
-                raise RuntimeError("Unexpected condition")
-        final_heirarchial_sections = cls.__remove_first_section_if_empty(
-            final_heirarchial_sections
-        )
-        return final_heirarchial_sections
-
-    @staticmethod
-    def __create_new_section_using_header_line(line: str) -> MarkdownTree:
-        assert line.startswith("#")
-        heading_level = len(line) - len(line.lstrip("#"))
-        title = line.strip("# ").strip()
-        section = MarkdownTree(
-            level=heading_level,
-            title=title,
-            section_content=line,
-            sub_sections=[],
-        )
-        return section
-
-    @staticmethod
-    def __remove_sections_from_stack_until_at_level_higher_than_new_section_level(
-        section_stack: list[MarkdownTree], current_level: int
-    ) -> None:
-        while section_stack and section_stack[-1].level >= current_level:
-            section_stack.pop()
-
-    @staticmethod
-    def __add_new_section_to_active_section_or_else_to_top_section_list(
-        running_section_stack: list[MarkdownTree],
-        final_sections: list[MarkdownTree],
-        new_section: MarkdownTree,
-    ) -> None:
-        if running_section_stack:
-            active_section = running_section_stack[-1]
-            active_section.sub_sections.append(new_section)
-        else:
-            final_sections.append(new_section)
-
-    @staticmethod
-    def __remove_first_section_if_empty(
-        sections: list[MarkdownTree],
-    ) -> list[MarkdownTree]:
-        if not sections:
-            return []
-        first_section = sections[0]
-        if not first_section.section_content:
-            return sections[1:]
-        return sections
+        return MarkdownSectionIndex(markdown).to_markdown_trees()
 
     @model_validator(mode="after")
     def validate_level(self: MarkdownTree) -> MarkdownTree:
@@ -208,3 +118,108 @@ class MarkdownTree(BaseModel):
                         f"Section content contains a line that starts with a hashtag that is not the header line: {non_first_line}"
                     )
         return self
+
+
+@dataclass
+class MarkdownSectionSpan:
+    """
+    Where a section sits in the lines of a `MarkdownSectionIndex`
+    (`end_line` includes sub sections, `content_end_line` does not)
+    """
+
+    level: int
+    title: str | None
+    start_line: int
+    content_end_line: int
+    end_line: int
+    sub_sections: list[MarkdownSectionSpan]
+
+
+class MarkdownSectionIndex:
+    """
+    The heading tree of a markdown document as line ranges, built in one pass.
+    Section text is only joined when asked for, so reading one section of a long
+    document does not copy the rest of it. Treat it as read only.
+    """
+
+    def __init__(self, markdown: str) -> None:
+        self.markdown = markdown
+        self.lines = markdown.splitlines()
+        self.sections = self._build_sections(self.lines)
+
+    def section_content(self, span: MarkdownSectionSpan) -> str:
+        return "\n".join(self.lines[span.start_line : span.content_end_line])
+
+    def text_of_section_and_subsections(self, span: MarkdownSectionSpan) -> str:
+        return "\n".join(self.lines[span.start_line : span.end_line])
+
+    def to_markdown_trees(self) -> list[MarkdownTree]:
+        return [self._to_markdown_tree(span) for span in self.sections]
+
+    def _to_markdown_tree(self, span: MarkdownSectionSpan) -> MarkdownTree:
+        # The spans already satisfy MarkdownTree's validators, which are costly to rerun per header
+        return MarkdownTree.model_construct(
+            level=span.level,
+            title=span.title,
+            section_content=self.section_content(span),
+            sub_sections=[self._to_markdown_tree(sub) for sub in span.sub_sections],
+        )
+
+    @classmethod
+    def _build_sections(cls, lines: list[str]) -> list[MarkdownSectionSpan]:
+        top_sections: list[MarkdownSectionSpan] = []
+        open_sections: list[MarkdownSectionSpan] = []
+        for line_number, line in enumerate(lines):
+            if HEADER_LINE_PATTERN.match(line):
+                level = len(line) - len(line.lstrip("#"))
+                section = MarkdownSectionSpan(
+                    level=level,
+                    title=line.strip("# ").strip(),
+                    start_line=line_number,
+                    content_end_line=line_number + 1,
+                    end_line=line_number + 1,
+                    sub_sections=[],
+                )
+                while open_sections and open_sections[-1].level >= level:
+                    open_sections.pop()
+                if open_sections:
+                    open_sections[-1].sub_sections.append(section)
+                else:
+                    top_sections.append(section)
+                open_sections.append(section)
+            elif open_sections:
+                open_sections[-1].content_end_line = line_number + 1
+            elif not top_sections:
+                # Text before the first header becomes a section without a title
+                top_sections.append(
+                    MarkdownSectionSpan(
+                        level=0,
+                        title=None,
+                        start_line=line_number,
+                        content_end_line=line_number + 1,
+                        end_line=line_number + 1,
+                        sub_sections=[],
+                    )
+                )
+            else:
+                top_sections[-1].content_end_line = line_number + 1
+
+        for section in top_sections:
+            cls._set_end_lines(section)
+        first_section_is_empty = (
+            top_sections
+            and top_sections[0].end_line - top_sections[0].start_line == 1
+            and lines[top_sections[0].start_line] == ""
+        )
+        if first_section_is_empty:
+            return top_sections[1:]
+        return top_sections
+
+    @classmethod
+    def _set_end_lines(cls, section: MarkdownSectionSpan) -> None:
+        for sub_section in section.sub_sections:
+            cls._set_end_lines(sub_section)
+        if section.sub_sections:
+            section.end_line = section.sub_sections[-1].end_line
+        else:
+            section.end_line = section.content_end_line
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 from collections import Counter
+from typing import TYPE_CHECKING
 
 import numpy as np
 import typing_extensions
@@ -10,6 +11,9 @@ from pydantic import BaseModel, Field, model_validator
 from forecasting_tools.data_models.forecast_report import ForecastReport
 from forecasting_tools.data_models.questions import DiscreteQuestion, NumericQuestion
 
+if TYPE_CHECKING:
+    from forecasting_tools.helpers.metaculus_client import MetaculusClient
+
 logger = logging.getLogger(__name__)
 
 
@@ -217,36 +221,72 @@ class NumericDistribution(BaseModel):
         - percentile ("X% of values are below this point". This is the y axis of the cdf graph)
         - 'value' or 'nominal location' (The real world number that answers the question)
         - cdf location (a number between 0 and 1 representing where the point is on the cdf x axis, where 0 is range min, and 1 is range max)
+
+        If you only need the numbers (e.g. for aggregation or posting to Metaculus)
+        use get_cdf_probabilities and get_cdf_nominal_locations, which skip
+        creating a Percentile object for every point.
         """
+        continuous_cdf = self.get_cdf_probabilities()
+        cdf_xaxis = self.get_cdf_nominal_locations()
+        percentiles = [
+            Percentile(value=value, percentile=percentile)
+            for value, percentile in zip(cdf_xaxis.tolist(), continuous_cdf.tolist())
+        ]
+        return percentiles
 
-        cdf_size = self.cdf_size or 201
-        continuous_cdf = []
-        cdf_xaxis = []
-        cdf_eval_locations = [i / (cdf_size - 1) for i in range(cdf_size)]
-        for l in cdf_eval_locations:
-            continuous_cdf.append(self._get_cdf_at(l))
-            cdf_xaxis.append(self._cdf_location_to_nominal_location(l))
+    def get_cdf_probabilities(self) -> np.ndarray:
+        """
+        Returns the y axis of the cdf (see get_cdf) as a float64 array of length cdf_size.
+        """
+        cdf_eval_locations = self._get_cdf_eval_locations()
+        cdf_locations, heights = self._get_cdf_location_to_percentile_mapping()
+        continuous_cdf = self._get_cdf_at_locations(
+            cdf_eval_locations, cdf_locations, heights
+        )
 
         if self.standardize_cdf:
             continuous_cdf = self._standardize_cdf(continuous_cdf)
 
-        percentiles = [
-            Percentile(value=value, percentile=percentile)
-            for value, percentile in zip(cdf_xaxis, continuous_cdf)
-        ]
-        assert len(percentiles) == cdf_size
-
-        validation_distribution = NumericDistribution(
-            declared_percentiles=percentiles,
-            open_upper_bound=self.open_upper_bound,
-            open_lower_bound=self.open_lower_bound,
-            upper_bound=self.upper_bound,
-            lower_bound=self.lower_bound,
-            zero_point=self.zero_point,
-            standardize_cdf=self.standardize_cdf,
-        )
-        NumericDistribution.model_validate(validation_distribution)
-        return percentiles
+        self._validate_cdf(continuous_cdf)
+        return continuous_cdf
+
+    def get_cdf_nominal_locations(self) -> np.ndarray:
+        """
+        Returns the x axis of the cdf (see get_cdf) in real world values
+        as a float64 array of length cdf_size.
+        """
+        return self._cdf_locations_to_nominal_locations(self._get_cdf_eval_locations())
+
+    def _get_cdf_eval_locations(self) -> np.ndarray:
+        cdf_size = self.cdf_size or 201
+        return np.arange(cdf_size, dtype=np.float64) / (cdf_size - 1)
+
+    def _validate_cdf(self, cdf: np.ndarray) -> None:
+        """
+        Checks the same constraints a NumericDistribution built from the cdf points
+        would check, without building one.
+        The x axis is strictly increasing and within bounds by construction.
+        """
+        if np.isnan(cdf).any():
+            raise ValueError(f"Percentile must be a number, but cdf was {cdf}")
+        if (cdf < 0).any() or (cdf > 1).any():
+            raise ValueError(
+                f"Percentile must be between 0 and 1, but cdf was {cdf.tolist()}"
+            )
+        steps = np.diff(cdf)
+        if (steps <= 0).any():
+            raise ValueError("Percentiles must be in strictly increasing order")
+        too_close = np.flatnonzero(np.abs(steps) < 5e-05)
+        if too_close.size > 0:
+            i = int(too_close[0])
+            x_axis = self.get_cdf_nominal_locations()
+            raise ValueError(
+                f"Percentiles at indices {i} and {i+1} are too close. CDF must be increasing by at least 5e-05 at every step. "
+                f"{cdf[i]} and {cdf[i+1]} "
+                f"at values {x_axis[i]} and {x_axis[i+1]}. "
+                "One possible reason is that your prediction is mostly or completely out of the upper/lower "
+                "bound range thus assigning very little probability to any one x-axis value."
+            )
 
     @classmethod
     def _percentile_list_to_dict(
@@ -324,64 +364,100 @@ class NumericDistribution(BaseModel):
         )
         return return_list
 
-    def _nominal_location_to_cdf_location(self, nominal_value: float) -> float:
+    def _nominal_locations_to_cdf_locations(
+        self, nominal_values: np.ndarray
+    ) -> np.ndarray:
         """
-        Takes the real world value (like $17k - that would answer the forecasting question)
-        and converts it to a cdf location between 0 and 1 depending on
+        Takes real world values (like $17k - that would answer the forecasting question)
+        and converts each to a cdf location between 0 and 1 depending on
         how far it is between the upper and lower bound
         (it can go over 1 or below 0 if beyond the bounds)
         """
         range_max = self.upper_bound
         range_min = self.lower_bound
         zero_point = self.zero_point
+        nominal_values = np.asarray(nominal_values, dtype=np.float64)
 
         if zero_point is not None:
             # logarithmically scaled question
             deriv_ratio = (range_max - zero_point) / (range_min - zero_point)
-            if nominal_value == zero_point:
-                # If nominal = zero point, then you would take the log of 0. Add a small epsilon to avoid this.
-                nominal_value += 1e-10
-            unscaled_location = (
+            # If nominal = zero point, then you would take the log of 0. Add a small epsilon to avoid this.
+            nominal_values = np.where(
+                nominal_values == zero_point, nominal_values + 1e-10, nominal_values
+            )
+            unscaled_locations = (
                 np.log(
-                    (nominal_value - range_min) * (deriv_ratio - 1)
+                    (nominal_values - range_min) * (deriv_ratio - 1)
                     + (range_max - range_min)
                 )
                 - np.log(range_max - range_min)
             ) / np.log(deriv_ratio)
         else:
             # linearly scaled question
-            unscaled_location = (nominal_value - range_min) / (range_max - range_min)
-        return float(unscaled_location)
+            unscaled_locations = (nominal_values - range_min) / (range_max - range_min)
+        return unscaled_locations
 
-    def _get_cdf_at(self, cdf_location: float) -> float:
+    def _get_cdf_location_to_percentile_mapping(
+        self,
+    ) -> tuple[np.ndarray, np.ndarray]:
         """
-        Helper function that takes a cdf location and returns
-        the height (percentile) of the cdf at that location, linearly
-        interpolating between values
+        Returns the cdf locations and heights (percentiles) of the declared percentiles
+        (plus the explicit bound percentiles) sorted by height
         """
         bounded_percentiles = self._add_explicit_upper_lower_bound_percentiles(
             self.declared_percentiles
         )
-        cdf_location_to_percentile_mapping: list[tuple[float, float]] = []
-        for percentile in bounded_percentiles:
-            height = percentile.percentile
-            location = self._nominal_location_to_cdf_location(percentile.value)
-            cdf_location_to_percentile_mapping.append((location, height))
-        previous = cdf_location_to_percentile_mapping[0]
-        for i in range(1, len(cdf_location_to_percentile_mapping)):
-            current = cdf_location_to_percentile_mapping[i]
-            epsilon = 1e-10
-            if previous[0] - epsilon <= cdf_location <= current[0] + epsilon:
-                result = previous[1] + (current[1] - previous[1]) * (
-                    cdf_location - previous[0]
-                ) / (current[0] - previous[0])
-                if np.isnan(result):
-                    raise ValueError(f"Result is NaN for cdf location {cdf_location}")
-                return result
-            previous = current
-        raise ValueError(f"CDF location Input {cdf_location} cannot be found")
-
-    def _standardize_cdf(self, cdf: list[float]) -> list[float]:
+        heights = np.array(
+            [percentile.percentile for percentile in bounded_percentiles],
+            dtype=np.float64,
+        )
+        locations = self._nominal_locations_to_cdf_locations(
+            np.array(
+                [percentile.value for percentile in bounded_percentiles],
+                dtype=np.float64,
+            )
+        )
+        return locations, heights
+
+    @staticmethod
+    def _get_cdf_at_locations(
+        cdf_locations: np.ndarray, locations: np.ndarray, heights: np.ndarray
+    ) -> np.ndarray:
+        """
+        Takes cdf locations and returns the height (percentile) of the cdf at each.
+        For each location, finds the first segment of the (sorted) location-to-height
+        mapping that contains it (with a small tolerance) and linearly interpolates within it.
+        """
+        epsilon = 1e-10
+        num_segments = len(locations) - 1
+        segment_indices = np.searchsorted(
+            locations[1:] + epsilon, cdf_locations, side="left"
+        )
+        not_found = (segment_indices >= num_segments) | (
+            cdf_locations < locations[0] - epsilon
+        )
+        if not_found.any():
+            raise ValueError(
+                f"CDF location Input {cdf_locations[not_found][0]} cannot be found"
+            )
+
+        previous_locations = locations[segment_indices]
+        current_locations = locations[segment_indices + 1]
+        previous_heights = heights[segment_indices]
+        current_heights = heights[segment_indices + 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            results = previous_heights + (current_heights - previous_heights) * (
+                cdf_locations - previous_locations
+            ) / (current_locations - previous_locations)
+
+        not_finite = ~np.isfinite(results)
+        if not_finite.any():
+            raise ValueError(
+                f"Result is NaN for cdf location {cdf_locations[not_finite][0]}"
+            )
+        return results
+
+    def _standardize_cdf(self, cdf: np.ndarray) -> np.ndarray:
         """
         Takes a cdf and returns a standardized version of it
 
@@ -409,38 +485,30 @@ class NumericDistribution(BaseModel):
         rescaled_inbound_mass = scale_upper_to - scale_lower_to
 
         # apply minimum slope
-        def apply_minimum(F: float, location: float) -> float:
-            # `F` is the height of the cdf at `location` (in range [0, 1])
-            # rescale
-            rescaled_F = (F - scale_lower_to) / rescaled_inbound_mass
-            # offset
-            if open_lower_bound and open_upper_bound:
-                return 0.988 * rescaled_F + 0.01 * location + 0.001
-            elif open_lower_bound:
-                return 0.989 * rescaled_F + 0.01 * location + 0.001
-            elif open_upper_bound:
-                return 0.989 * rescaled_F + 0.01 * location
-            return 0.99 * rescaled_F + 0.01 * location
-
-        standardized_cdf = []
-        for i, F in enumerate(cdf):
-            standardized_F = apply_minimum(F, i / (len(cdf) - 1))
-            # round to avoid floating point errors
-            standardized_cdf.append(round(standardized_F, 10))
-
-        return standardized_cdf
-
-    def _flatten_high_density_cdf(self, input_cdf: list[float]) -> list[float]:
+        # `cdf` is the height of the cdf at each location (in range [0, 1])
+        locations = np.arange(len(cdf), dtype=np.float64) / (len(cdf) - 1)
+        # rescale
+        rescaled_cdf = (cdf - scale_lower_to) / rescaled_inbound_mass
+        # offset
+        if open_lower_bound and open_upper_bound:
+            standardized_cdf = 0.988 * rescaled_cdf + 0.01 * locations + 0.001
+        elif open_lower_bound:
+            standardized_cdf = 0.989 * rescaled_cdf + 0.01 * locations + 0.001
+        elif open_upper_bound:
+            standardized_cdf = 0.989 * rescaled_cdf + 0.01 * locations
+        else:
+            standardized_cdf = 0.99 * rescaled_cdf + 0.01 * locations
+
+        # round to avoid floating point errors
+        return np.round(standardized_cdf, 10)
+
+    def _flatten_high_density_cdf(self, input_cdf: np.ndarray) -> np.ndarray:
         cdf_size = self.cdf_size or 201
 
         # First, cap the distribution to maximum (default 0.59)
         # operate in PMF space
-        cdf = input_cdf.copy()
-        pmf = [cdf[0]]
-        for i in range(1, len(cdf)):
-            pmf.append(cdf[i] - cdf[i - 1])
-        pmf.append(1 - cdf[-1])
-        pmf_array = np.asarray(pmf, dtype=float)
+        cdf = np.asarray(input_cdf, dtype=np.float64)
+        pmf_array = np.concatenate(([cdf[0]], np.diff(cdf), [1 - cdf[-1]]))
         # cap depends on cdf_size (0.59 if cdf_size is the default 201)
         # reduce cap by 1e-11 to avoid floating point error pushing this
         # above the real cap but also have
@@ -468,24 +536,28 @@ class NumericDistribution(BaseModel):
         pmf_array = np.minimum(cap, 0.5 * (lo + hi) * pmf_array)
         pmf_array = pmf_array / pmf_array.sum()
         # back to CDF space
-        cdf = np.cumsum(pmf_array).tolist()[:-1]
+        cdf = np.cumsum(pmf_array)[:-1]
         return cdf
 
-    def _cdf_location_to_nominal_location(self, cdf_location: float) -> float:
+    def _cdf_locations_to_nominal_locations(
+        self, cdf_locations: np.ndarray
+    ) -> np.ndarray:
         range_max = self.upper_bound
         range_min = self.lower_bound
         zero_point = self.zero_point
 
         if zero_point is None:
-            scaled_location = range_min + (range_max - range_min) * cdf_location
+            scaled_locations = range_min + (range_max - range_min) * cdf_locations
         else:
             deriv_ratio = (range_max - zero_point) / (range_min - zero_point)
-            scaled_location = range_min + (range_max - range_min) * (
-                deriv_ratio**cdf_location - 1
+            scaled_locations = range_min + (range_max - range_min) * (
+                np.power(deriv_ratio, cdf_locations) - 1
             ) / (deriv_ratio - 1)
-        if np.isnan(scaled_location):
-            raise ValueError(f"Scaled location is NaN for cdf location {cdf_location}")
-        return scaled_location
+        if np.isnan(scaled_locations).any():
+            raise ValueError(
+                f"Scaled location is NaN for cdf location {cdf_locations[np.isnan(scaled_locations)][0]}"
+            )
+        return scaled_locations
 
 
 class NumericReport(ForecastReport):
@@ -497,25 +569,20 @@ class NumericReport(ForecastReport):
         cls, predictions: list[NumericDistribution], question: NumericQuestion
     ) -> NumericDistribution:
         assert predictions, "No predictions to aggregate"
-        cdfs = [prediction.get_cdf() for prediction in predictions]
-        all_percentiles_of_cdf: list[list[float]] = []
-        all_values_of_cdf: list[list[float]] = []
-        x_axis: list[float] = [percentile.value for percentile in cdfs[0]]
-        for cdf in cdfs:
-            all_percentiles_of_cdf.append([percentile.percentile for percentile in cdf])
-            all_values_of_cdf.append([percentile.value for percentile in cdf])
-
-        for cdf in cdfs:
-            for i in range(len(cdf)):
-                if cdf[i].value != x_axis[i]:
-                    raise ValueError("X axis between cdfs is not the same")
+        x_axis = predictions[0].get_cdf_nominal_locations()
+        for prediction in predictions:
+            if not np.array_equal(prediction.get_cdf_nominal_locations(), x_axis):
+                raise ValueError("X axis between cdfs is not the same")
+        all_percentiles_of_cdf = np.vstack(
+            [prediction.get_cdf_probabilities() for prediction in predictions]
+        )
 
         median_percentile_list: list[float] = np.median(
-            np.array(all_percentiles_of_cdf), axis=0
+            all_percentiles_of_cdf, axis=0
         ).tolist()
         median_cdf = [
             Percentile(value=value, percentile=percentile)
-            for value, percentile in zip(x_axis, median_percentile_list)
+            for value, percentile in zip(x_axis.tolist(), median_percentile_list)
         ]
 
         if not predictions:
@@ -539,9 +606,16 @@ class NumericReport(ForecastReport):
             readable += f"- {percentile.percentile:.2%} chance of value below {round(percentile.value,6)}\n"
         return readable
 
-    async def publish_report_to_metaculus(self) -> None:
+    async def publish_report_to_metaculus(
+        self, metaculus_client: MetaculusClient | None = None
+    ) -> None:
         from forecasting_tools.helpers.metaculus_client import MetaculusClient
 
+        if metaculus_client is None:
+            async with MetaculusClient() as temporary_client:
+                await self.publish_report_to_metaculus(temporary_client)
+            return
+
         if self.question.id_of_question is None:
             raise ValueError("Publishing to Metaculus requires a question ID")
 
@@ -556,14 +630,12 @@ class NumericReport(ForecastReport):
                 prediction.declared_percentiles, self.question
             )
 
-        cdf_probabilities = [
-            percentile.percentile for percentile in prediction.get_cdf()
-        ]
+        cdf_probabilities = prediction.get_cdf_probabilities().tolist()
 
-        MetaculusClient().post_numeric_question_prediction(
+        await metaculus_client.post_numeric_question_prediction_async(
             self.question.id_of_question, cdf_probabilities
         )
-        MetaculusClient().post_question_comment(
+        await metaculus_client.post_question_comment_async(
             self.question.id_of_post, self.explanation
         )
 
@@ -1,21 +1,26 @@
 import asyncio
+import contextvars
+import copy
 import inspect
 import json
 import logging
 import os
 import time
-import requests
 import traceback
+import weakref
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Any, Coroutine, Literal, Sequence, TypeVar, cast, overload
 
+import requests
 from exceptiongroup import ExceptionGroup
 from pydantic import BaseModel
 
 from forecasting_tools.ai_models.agent_wrappers import general_trace_or_span
 from forecasting_tools.ai_models.ai_utils.ai_misc import clean_indents
 from forecasting_tools.ai_models.general_llm import GeneralLlm
+from forecasting_tools.ai_models.llm_response_cache import LlmResponseCache
+from forecasting_tools.ai_models.resource_managers.llm_rate_limiter import LlmRateLimit
 from forecasting_tools.ai_models.resource_managers.monetary_cost_manager import (
     MonetaryCostManager,
 )
@@ -37,12 +42,20 @@ from forecasting_tools.data_models.questions import (
     MultipleChoiceQuestion,
     NumericQuestion,
 )
-from forecasting_tools.helpers.metaculus_api import MetaculusApi
+from forecasting_tools.helpers.metaculus_client import MetaculusClient
+from forecasting_tools.util import file_manipulation
 
 T = TypeVar("T")
+ForecastStage = Literal["research", "summary", "prediction", "publish"]
+NotepadKey = tuple[str, int | None, int | None, str | None]
 
 logger = logging.getLogger(__name__)
 
+# Notepad key of the question being forecast by the current task
+_current_notepad_key: contextvars.ContextVar[NotepadKey | None] = (
+    contextvars.ContextVar("current_notepad_key", default=None)
+)
+
 
 class Notepad(BaseModel):
     """
@@ -68,6 +81,8 @@ class ForecastBot(ABC):
     Base class for all forecasting bots.
     """
 
+    REPORTS_PER_DISK_SYNC = 10
+
     def __init__(
         self,
         *,
@@ -83,11 +98,57 @@ class ForecastBot(ABC):
         enable_summarize_research: bool = True,
         parameters_to_exclude_from_config_dict: list[str] | None = None,
         extra_metadata_in_explanation: bool = False,
+        llm_response_cache: LlmResponseCache | None = None,
+        cached_llm_purposes: (
+            list[str] | None
+        ) = None,  # All purposes are cached if set to None
+        llm_rate_limits: dict[str, LlmRateLimit] | None = None,  # Keyed by purpose
+        max_concurrent_questions: int | None = None,  # No limit if set to None
+        max_concurrent_research: int | None = None,
+        max_concurrent_predictions: int | None = None,
+        max_concurrent_summaries: int | None = None,
+        max_concurrent_publishes: int | None = None,
+        question_timeout_seconds: float | None = None,
+        hedge_timed_out_questions: bool = False,
+        resume_from_saved_reports: bool = False,
     ) -> None:
+        """
+        Questions are worked on by a pool of `max_concurrent_questions` workers that each
+        pick up the next question as soon as they finish one. Each question then goes
+        through the research, summary, prediction, aggregation and publish stages.
+        The research, summary, prediction and publish stages are capped bot-wide by their
+        `max_concurrent_*` limit (no limit if None). When the summary is not used to
+        forecast, it is written while the predictions are being made.
+
+        A question still running after `question_timeout_seconds` fails with a TimeoutError,
+        unless `hedge_timed_out_questions` is set, in which case a second attempt is started
+        and whichever attempt finishes first successfully is used.
+
+        If `folder_to_save_reports_to` is set, each report is appended to a JSONL file in the
+        folder as soon as its question finishes. With `resume_from_saved_reports`, questions
+        that already have a report in that file (e.g. from a run that crashed) are not
+        forecasted again. The file is removed once the final reports file is written.
+
+        `llm_rate_limits` sets request and token per minute limits for the GeneralLlm of each
+        purpose. Limits can also be set on the GeneralLlms in `_llm_config_defaults`.
+        Budgets are shared by every GeneralLlm in the process using the same model and limit.
+        """
         assert (
             research_reports_per_question > 0
         ), "Must run at least one research report"
         assert predictions_per_research_report > 0, "Must run at least one prediction"
+        for limit in [
+            max_concurrent_questions,
+            max_concurrent_research,
+            max_concurrent_predictions,
+            max_concurrent_summaries,
+            max_concurrent_publishes,
+        ]:
+            assert limit is None or limit > 0, "Concurrency limits must be positive"
+        if resume_from_saved_reports and folder_to_save_reports_to is None:
+            raise ValueError(
+                "Cannot resume from saved reports if folder_to_save_reports_to is not set"
+            )
         if use_research_summary_to_forecast and not enable_summarize_research:
             raise ValueError(
                 "Cannot use research summary to forecast if summarize_research is False"
@@ -103,8 +164,30 @@ class ForecastBot(ABC):
         )
         self.enable_summarize_research = enable_summarize_research
         self.extra_metadata_in_explanation = extra_metadata_in_explanation
-        self._note_pads: list[Notepad] = []
-        self._note_pad_lock = asyncio.Lock()
+        self.llm_response_cache = llm_response_cache
+        self.cached_llm_purposes = cached_llm_purposes
+        self.llm_rate_limits = llm_rate_limits
+        self.max_concurrent_questions = max_concurrent_questions
+        self.max_concurrent_research = max_concurrent_research
+        self.max_concurrent_predictions = max_concurrent_predictions
+        self.max_concurrent_summaries = max_concurrent_summaries
+        self.max_concurrent_publishes = max_concurrent_publishes
+        self.question_timeout_seconds = question_timeout_seconds
+        self.hedge_timed_out_questions = hedge_timed_out_questions
+        self.resume_from_saved_reports = resume_from_saved_reports
+        self._reports_saved_since_last_sync = 0
+        # Semaphores can only be used on the event loop they were made in
+        self._stage_semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]
+        ] = weakref.WeakKeyDictionary()
+        self._note_pads: dict[NotepadKey, Notepad] = {}
+        # Number of running attempts on each question (hedged attempts share a notepad)
+        self._note_pad_users: dict[NotepadKey, int] = {}
+        # Sub-questions of a conditional question share the conditional's notepad
+        # (conditionals in a series share a parent, so an alias can have several owners)
+        self._note_pad_aliases: dict[NotepadKey, list[NotepadKey]] = {}
+        self._metaculus_client = MetaculusClient()
+        self._forecast_runs_in_progress = 0
         self._llms = llms or self._llm_config_defaults()
 
         for purpose, llm in self._llm_config_defaults().items():
@@ -116,6 +199,9 @@ class ForecastBot(ABC):
                 )
                 self._llms[purpose] = llm
 
+        for purpose, llm in self._llms.items():
+            self._llms[purpose] = self._prepare_llm_for_purpose(llm, purpose)
+
         for purpose, llm in self._llms.items():
             if purpose not in self._llm_config_defaults():
                 logger.warning(
@@ -123,6 +209,12 @@ class ForecastBot(ABC):
                     f"Please override and add it to the {self._llm_config_defaults.__name__} method"
                 )
 
+        for purpose in self.llm_rate_limits or {}:
+            if purpose not in self._llms:
+                logger.warning(
+                    f"Rate limit set for unknown llm purpose: '{purpose}'. It will not be used."
+                )
+
         logger.debug(f"LLMs at initialization for bot are: {self.make_llm_dict()}")
 
     @overload
@@ -151,7 +243,11 @@ class ForecastBot(ABC):
         tournament_id: int | str,
         return_exceptions: bool = False,
     ) -> list[ForecastReport] | list[ForecastReport | BaseException]:
-        questions = MetaculusApi.get_all_open_questions_from_tournament(tournament_id)
+        questions = (
+            await self._metaculus_client.get_all_open_questions_from_tournament_async(
+                tournament_id
+            )
+        )
         supported_question_types = [
             NumericQuestion,
             MultipleChoiceQuestion,
@@ -239,14 +335,36 @@ class ForecastBot(ABC):
                     f"Skipping {len(questions) - len(unforecasted_questions)} previously forecasted questions"
                 )
             questions = unforecasted_questions
-        reports: list[ForecastReport | BaseException] = []
-        reports = await asyncio.gather(
-            *[
-                self._run_individual_question_with_error_propagation(question)
-                for question in questions
-            ],
-            return_exceptions=return_exceptions,
-        )
+        resumed_reports: dict[str, ForecastReport] = {}
+        if self.resume_from_saved_reports:
+            resumed_reports = self._load_reports_in_progress()
+        questions_to_run = [
+            question
+            for question in questions
+            if self._get_question_key(question) not in resumed_reports
+        ]
+        if len(questions_to_run) != len(questions):
+            logger.info(
+                f"Resuming with {len(questions) - len(questions_to_run)} questions already forecasted"
+            )
+
+        new_reports: list[ForecastReport | BaseException] = []
+        self._forecast_runs_in_progress += 1
+        try:
+            new_reports = await self._run_questions_through_worker_pool(
+                questions_to_run, return_exceptions
+            )
+        finally:
+            self._forecast_runs_in_progress -= 1
+            if self._forecast_runs_in_progress == 0:
+                await self._metaculus_client.aclose()
+
+        new_reports_in_order = iter(new_reports)
+        reports: list[ForecastReport | BaseException] = [
+            resumed_reports.get(self._get_question_key(question))
+            or next(new_reports_in_order)
+            for question in questions
+        ]
         if self.folder_to_save_reports_to:
             non_exception_reports = [
                 report for report in reports if not isinstance(report, BaseException)
@@ -256,8 +374,134 @@ class ForecastBot(ABC):
             ForecastReport.save_object_list_to_file_path(
                 non_exception_reports, file_path
             )
+            if self._forecast_runs_in_progress == 0:
+                self._remove_reports_in_progress_file()
         return reports
 
+    async def _run_questions_through_worker_pool(
+        self, questions: list[MetaculusQuestion], return_exceptions: bool
+    ) -> list[ForecastReport | BaseException]:
+        """
+        Forecasts questions with a bounded number of workers pulling from a shared queue,
+        so a slow question only holds up its own worker rather than a whole batch
+        """
+        reports: list[ForecastReport | BaseException | None] = [None] * len(questions)
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for index in range(len(questions)):
+            queue.put_nowait(index)
+
+        async def work_through_queue() -> None:
+            while not queue.empty():
+                index = queue.get_nowait()
+                try:
+                    report = await self._run_question_with_timeout(questions[index])
+                    reports[index] = report
+                    self._save_report_in_progress(report)
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    reports[index] = e
+
+        num_workers = min(
+            len(questions), self.max_concurrent_questions or len(questions)
+        )
+        workers = [
+            asyncio.create_task(work_through_queue()) for _ in range(num_workers)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            # Waiting lets the workers cancel their question attempts before returning
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return [report for report in reports if report is not None]
+
+    async def _run_question_with_timeout(
+        self, question: MetaculusQuestion
+    ) -> ForecastReport:
+        report = await self._run_question_attempts(question)
+        # Published here rather than in each attempt so only the winning report is posted
+        await self._publish_report(report)
+        return report
+
+    async def _run_question_attempts(
+        self, question: MetaculusQuestion
+    ) -> ForecastReport:
+        if self.question_timeout_seconds is None:
+            return await self._run_individual_question_with_error_propagation(question)
+
+        first_attempt = asyncio.create_task(
+            self._run_individual_question_with_error_propagation(question)
+        )
+        attempts = {first_attempt}
+        try:
+            done, _ = await asyncio.wait(
+                {first_attempt}, timeout=self.question_timeout_seconds
+            )
+            if done:
+                return first_attempt.result()
+            if not self.hedge_timed_out_questions:
+                raise TimeoutError(
+                    f"Question {question.page_url} did not finish within {self.question_timeout_seconds} seconds"
+                )
+
+            logger.warning(
+                f"Question {question.page_url} is taking longer than {self.question_timeout_seconds} seconds. Starting a hedged attempt."
+            )
+            hedged_attempt = asyncio.create_task(
+                self._run_individual_question_with_error_propagation(question)
+            )
+            attempts.add(hedged_attempt)
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for attempt in done:
+                    if attempt.exception() is None:
+                        return attempt.result()
+            return first_attempt.result()  # Both failed, so raise the original error
+        finally:
+            # Also covers this worker being cancelled (e.g. another question failed)
+            await self._cancel_attempts(
+                {attempt for attempt in attempts if not attempt.done()}
+            )
+
+    @staticmethod
+    async def _cancel_attempts(attempts: set[asyncio.Task]) -> None:
+        # Waiting lets cancelled attempts clean up (e.g. remove their notepad) first
+        for attempt in attempts:
+            attempt.cancel()
+        await asyncio.gather(*attempts, return_exceptions=True)
+
+    def _get_stage_semaphore(self, stage: ForecastStage) -> asyncio.Semaphore | None:
+        stage_limits: dict[ForecastStage, int | None] = {
+            "research": self.max_concurrent_research,
+            "summary": self.max_concurrent_summaries,
+            "prediction": self.max_concurrent_predictions,
+            "publish": self.max_concurrent_publishes,
+        }
+        limit = stage_limits[stage]
+        if limit is None:
+            return None
+        loop = asyncio.get_running_loop()
+        semaphores = self._stage_semaphores.setdefault(loop, {})
+        if stage not in semaphores:
+            semaphores[stage] = asyncio.Semaphore(limit)
+        return semaphores[stage]
+
+    async def _run_in_stage_pool(
+        self,
+        stage: ForecastStage,
+        coroutine: Coroutine[Any, Any, T],
+    ) -> T:
+        semaphore = self._get_stage_semaphore(stage)
+        if semaphore is None:
+            return await coroutine
+        async with semaphore:
+            return await coroutine
+
     @abstractmethod
     async def run_research(self, question: MetaculusQuestion) -> str:
         """
@@ -357,77 +601,96 @@ class ForecastBot(ABC):
     async def _run_individual_question(
         self, question: MetaculusQuestion
     ) -> ForecastReport:
-        notepad = await self._initialize_notepad(question)
-        async with self._note_pad_lock:
-            self._note_pads.append(notepad)
-        with MonetaryCostManager() as cost_manager:
-            start_time = time.time()
-            prediction_tasks = [
-                self._research_and_make_predictions(question)
-                for _ in range(self.research_reports_per_question)
-            ]
-            valid_prediction_set, research_errors, exception_group = (
-                await self._gather_results_and_exceptions(prediction_tasks)  # type: ignore
-            )
-            valid_prediction_set: list[ResearchWithPredictions[PredictionTypes]]
-            if research_errors:
-                logger.warning(
-                    f"Encountered errors while researching: {research_errors}"
+        await self._register_notepad(question)
+        notepad_key_token = _current_notepad_key.set(self._get_notepad_key(question))
+        try:
+            with MonetaryCostManager() as cost_manager:
+                start_time = time.time()
+                prediction_tasks = [
+                    self._research_and_make_predictions(question)
+                    for _ in range(self.research_reports_per_question)
+                ]
+                valid_prediction_set, research_errors, exception_group = (
+                    await self._gather_results_and_exceptions(prediction_tasks)  # type: ignore
                 )
-            if len(valid_prediction_set) == 0:
-                assert exception_group, "Exception group should not be None"
-                self._reraise_exception_with_prepended_message(
-                    exception_group,
-                    f"All {self.research_reports_per_question} research reports/predictions failed",
+                valid_prediction_set: list[ResearchWithPredictions[PredictionTypes]]
+                if research_errors:
+                    logger.warning(
+                        f"Encountered errors while researching: {research_errors}"
+                    )
+                if len(valid_prediction_set) == 0:
+                    assert exception_group, "Exception group should not be None"
+                    self._reraise_exception_with_prepended_message(
+                        exception_group,
+                        f"All {self.research_reports_per_question} research reports/predictions failed",
+                    )
+                prediction_errors = [
+                    error
+                    for prediction_set in valid_prediction_set
+                    for error in prediction_set.errors
+                ]
+                all_errors = research_errors + prediction_errors
+
+                report_type = DataOrganizer.get_report_type_for_question_type(
+                    type(question)
                 )
-            prediction_errors = [
-                error
-                for prediction_set in valid_prediction_set
-                for error in prediction_set.errors
-            ]
-            all_errors = research_errors + prediction_errors
+                all_predictions = [
+                    reasoned_prediction.prediction_value
+                    for research_prediction_collection in valid_prediction_set
+                    for reasoned_prediction in research_prediction_collection.predictions
+                ]
+                aggregated_prediction = await self._aggregate_predictions(
+                    all_predictions,
+                    question,
+                )
+                end_time = time.time()
+                time_spent_in_minutes = (end_time - start_time) / 60
+                final_cost = cost_manager.current_usage
 
-            report_type = DataOrganizer.get_report_type_for_question_type(
-                type(question)
-            )
-            all_predictions = [
-                reasoned_prediction.prediction_value
-                for research_prediction_collection in valid_prediction_set
-                for reasoned_prediction in research_prediction_collection.predictions
-            ]
-            aggregated_prediction = await self._aggregate_predictions(
-                all_predictions,
+            unified_explanation = self._create_unified_explanation(
                 question,
+                valid_prediction_set,
+                aggregated_prediction,
+                final_cost,
+                time_spent_in_minutes,
             )
-            end_time = time.time()
-            time_spent_in_minutes = (end_time - start_time) / 60
-            final_cost = cost_manager.current_usage
-
-        unified_explanation = self._create_unified_explanation(
-            question,
-            valid_prediction_set,
-            aggregated_prediction,
-            final_cost,
-            time_spent_in_minutes,
-        )
-        report = report_type(
-            question=question,
-            prediction=aggregated_prediction,
-            explanation=unified_explanation,
-            price_estimate=final_cost,
-            minutes_taken=time_spent_in_minutes,
-            errors=all_errors,
-        )
-        if self.publish_reports_to_metaculus:
-            try:
-                await report.publish_report_to_metaculus()
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 405:
-                    logger.warning(f"Could not publish report to Metaculus for question {question.page_url}: {e}")
-                else:
-                    raise e
-        await self._remove_notepad(question)
-        return report
+            report = report_type(
+                question=question,
+                prediction=aggregated_prediction,
+                explanation=unified_explanation,
+                price_estimate=final_cost,
+                minutes_taken=time_spent_in_minutes,
+                errors=all_errors,
+            )
+            return report
+        finally:
+            _current_notepad_key.reset(notepad_key_token)
+            await self._remove_notepad(question)
+
+    async def _publish_report(self, report: ForecastReport) -> None:
+        if not self.publish_reports_to_metaculus:
+            return
+        question = report.question
+        try:
+            await self._run_in_stage_pool(
+                "publish",
+                report.publish_report_to_metaculus(self._metaculus_client),
+            )
+        except Exception as e:
+            if (
+                isinstance(e, requests.exceptions.HTTPError)
+                and e.response is not None
+                and e.response.status_code == 405
+            ):
+                logger.warning(
+                    f"Could not publish report to Metaculus for question {question.page_url}: {e}"
+                )
+                return
+            error_message = (
+                f"Error while processing question url: '{question.page_url}'"
+            )
+            logger.error(f"{error_message}: {e}")
+            self._reraise_exception_with_prepended_message(e, error_message)
 
     async def _aggregate_predictions(
         self,
@@ -451,22 +714,25 @@ class ForecastBot(ABC):
     ) -> ResearchWithPredictions[PredictionTypes]:
         notepad = await self._get_notepad(question)
         notepad.total_research_reports_attempted += 1
-        research = await self.run_research(question)
-        summary_report = await self.summarize_research(question, research)
-        research_to_use = (
-            summary_report if self.use_research_summary_to_forecast else research
-        )
-
-        tasks = cast(
-            list[Coroutine[Any, Any, ReasonedPrediction[Any]]],
-            [
-                self._make_prediction(question, research_to_use)
-                for _ in range(self.predictions_per_research_report)
-            ],
+        research = await self._run_in_stage_pool(
+            "research", self.run_research(question)
         )
-        valid_predictions, errors, exception_group = (
-            await self._gather_results_and_exceptions(tasks)
+        summary_coroutine = self._run_in_stage_pool(
+            "summary", self.summarize_research(question, research)
         )
+        if self.use_research_summary_to_forecast:
+            summary_report = await summary_coroutine
+            valid_predictions, errors, exception_group = (
+                await self._make_predictions_for_research(question, summary_report)
+            )
+        else:
+            # The summary is only needed for the report, so it is not on the critical path
+            summary_report, (valid_predictions, errors, exception_group) = (
+                await asyncio.gather(
+                    summary_coroutine,
+                    self._make_predictions_for_research(question, research),
+                )
+            )
         if errors:
             logger.warning(f"Encountered errors while predicting: {errors}")
         if len(valid_predictions) == 0:
@@ -482,6 +748,22 @@ class ForecastBot(ABC):
             predictions=valid_predictions,
         )
 
+    async def _make_predictions_for_research(
+        self, question: MetaculusQuestion, research: str
+    ) -> tuple[
+        list[ReasonedPrediction[PredictionTypes]], list[str], ExceptionGroup | None
+    ]:
+        tasks = cast(
+            list[Coroutine[Any, Any, ReasonedPrediction[PredictionTypes]]],
+            [
+                self._run_in_stage_pool(
+                    "prediction", self._make_prediction(question, research)
+                )
+                for _ in range(self.predictions_per_research_report)
+            ],
+        )
+        return await self._gather_results_and_exceptions(tasks)
+
     async def _make_prediction(
         self, question: MetaculusQuestion, research: str
     ) -> ReasonedPrediction[PredictionTypes]:
@@ -691,6 +973,47 @@ class ForecastBot(ABC):
             rationales.append(new_rationale)
         return "\n".join(rationales)
 
+    @property
+    def _reports_in_progress_file_path(self) -> str:
+        assert (
+            self.folder_to_save_reports_to is not None
+        ), "Folder to save reports to is not set"
+        folder_path = self.folder_to_save_reports_to
+        if not folder_path.endswith("/"):
+            folder_path += "/"
+        return f"{folder_path}{self.__class__.__name__}-reports-in-progress.jsonl"
+
+    def _save_report_in_progress(self, report: ForecastReport) -> None:
+        if not self.folder_to_save_reports_to:
+            return
+        self._reports_saved_since_last_sync += 1
+        sync_to_disk = self._reports_saved_since_last_sync >= self.REPORTS_PER_DISK_SYNC
+        if sync_to_disk:
+            self._reports_saved_since_last_sync = 0
+        file_manipulation.add_to_jsonl_file(
+            self._reports_in_progress_file_path,
+            [report.to_json()],
+            sync_to_disk=sync_to_disk,
+        )
+
+    def _load_reports_in_progress(self) -> dict[str, ForecastReport]:
+        file_path = self._reports_in_progress_file_path
+        if not os.path.exists(file_path):
+            return {}
+        reports = DataOrganizer.load_reports_from_file_path(file_path)
+        return {self._get_question_key(report.question): report for report in reports}
+
+    def _remove_reports_in_progress_file(self) -> None:
+        file_path = self._reports_in_progress_file_path
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    @staticmethod
+    def _get_question_key(question: MetaculusQuestion) -> str:
+        return (
+            f"{question.id_of_post}|{question.id_of_question}|{question.question_text}"
+        )
+
     def _create_file_path_to_save_to(self, questions: list[MetaculusQuestion]) -> str:
         assert (
             self.folder_to_save_reports_to is not None
@@ -739,31 +1062,80 @@ class ForecastBot(ABC):
         new_notepad = Notepad(question=question)
         return new_notepad
 
+    async def _on_notepad_removed(self, notepad: Notepad) -> None:
+        """Called once a question is done with its notepad (e.g. to persist notes)"""
+
+    async def _register_notepad(self, question: MetaculusQuestion) -> Notepad:
+        """
+        Creates the question's notepad, unless it already has one (e.g. while a
+        hedged attempt runs alongside the first attempt), in which case that is returned.
+        Each registration must be matched by a call to `_remove_notepad`.
+        """
+        key = self._get_notepad_key(question)
+        self._note_pad_users[key] = self._note_pad_users.get(key, 0) + 1
+        if key in self._note_pads:
+            return self._note_pads[key]
+        notepad = await self._initialize_notepad(question)
+        # Another attempt may have registered the question while this one awaited
+        notepad = self._note_pads.setdefault(key, notepad)
+        if isinstance(question, ConditionalQuestion):
+            for sub_question in question.get_all_subquestions().values():
+                owners = self._note_pad_aliases.setdefault(
+                    self._get_notepad_key(sub_question), []
+                )
+                if key not in owners:
+                    owners.append(key)
+        return notepad
+
     async def _remove_notepad(self, question: MetaculusQuestion) -> None:
-        async with self._note_pad_lock:
-            self._note_pads = [
-                notepad for notepad in self._note_pads if notepad.question != question
-            ]
+        key = self._get_notepad_key(question)
+        users = self._note_pad_users.pop(key, 0) - 1
+        if users > 0:
+            self._note_pad_users[key] = users
+            return
+        notepad = self._note_pads.pop(key, None)
+        if notepad is None:
+            return
+        for alias, owners in list(self._note_pad_aliases.items()):
+            if key in owners:
+                owners.remove(key)
+                if not owners:
+                    del self._note_pad_aliases[alias]
+        await self._on_notepad_removed(notepad)
 
     async def _get_notepad(self, question: MetaculusQuestion) -> Notepad:
-        async with self._note_pad_lock:
-            for notepad in self._note_pads:
-                notepad_question = notepad.question
-                if notepad_question == question:
-                    return notepad
-                if isinstance(notepad_question, ConditionalQuestion):
-                    if (
-                        notepad_question.parent == question
-                        or notepad_question.child == question
-                        or notepad_question.question_yes == question
-                        or notepad_question.question_no == question
-                    ):
-                        return notepad
-
+        key = self._get_notepad_key(question)
+        notepad = self._note_pads.get(key)
+        if notepad is None and key in self._note_pad_aliases:
+            owners = self._note_pad_aliases[key]
+            # A sub-question shared by several conditionals uses the one being forecast
+            current_key = _current_notepad_key.get()
+            owner = current_key if current_key in owners else owners[0]
+            notepad = self._note_pads.get(owner)
+        if notepad is not None:
+            return notepad
         raise ValueError(
             f"No notepad found for question: ID: {question.id_of_post} Text: {question.question_text}"
         )
 
+    @staticmethod
+    def _get_notepad_key(question: MetaculusQuestion) -> NotepadKey:
+        """
+        Questions from Metaculus are identified by post and question ID (sub-questions
+        of group and conditional questions share a post but not a question ID).
+        Questions made locally often have neither, so their text is used instead.
+        """
+        if question.id_of_post is None and question.id_of_question is None:
+            text_key = f"{question.question_text}|{question.page_url}"
+        else:
+            text_key = None
+        return (
+            type(question).__name__,
+            question.id_of_post,
+            question.id_of_question,
+            text_key,
+        )
+
     @classmethod
     def log_report_summary(
         cls,
@@ -907,7 +1279,9 @@ class ForecastBot(ABC):
             if isinstance(llm, GeneralLlm):
                 return_value = llm
             else:
-                return_value = GeneralLlm(model=llm)
+                return_value = self._prepare_llm_for_purpose(
+                    GeneralLlm(model=llm), purpose
+                )
         elif guarantee_type == "string_name":
             if isinstance(llm, str):
                 return_value = llm
@@ -924,7 +1298,42 @@ class ForecastBot(ABC):
     def set_llm(self, llm: GeneralLlm | str | None, purpose: str = "default") -> None:
         if purpose not in self._llms:
             raise ValueError(f"Unknown llm purpose: {purpose}")
-        self._llms[purpose] = llm
+        self._llms[purpose] = self._prepare_llm_for_purpose(llm, purpose)
+
+    def _prepare_llm_for_purpose(self, llm: T, purpose: str) -> T:
+        llm = self._add_response_cache_if_enabled(llm, purpose)
+        return self._add_rate_limit_if_configured(llm, purpose)
+
+    def _add_response_cache_if_enabled(self, llm: T, purpose: str) -> T:
+        """
+        Returns a copy of the llm that uses the bot's response cache if caching is
+        enabled for the purpose. The original is copied since llms are often shared between bots.
+        """
+        if (
+            not isinstance(llm, GeneralLlm)
+            or self.llm_response_cache is None
+            or llm.response_cache is not None
+        ):
+            return llm
+        if (
+            self.cached_llm_purposes is not None
+            and purpose not in self.cached_llm_purposes
+        ):
+            return llm
+        cached_llm = copy.copy(llm)
+        cached_llm.response_cache = self.llm_response_cache
+        return cached_llm
+
+    def _add_rate_limit_if_configured(self, llm: T, purpose: str) -> T:
+        """Returns a copy of the llm that uses the bot's rate limit for the purpose, if one is set"""
+        if not isinstance(llm, GeneralLlm) or not self.llm_rate_limits:
+            return llm
+        rate_limit = self.llm_rate_limits.get(purpose)
+        if rate_limit is None or llm.rate_limit == rate_limit:
+            return llm
+        limited_llm = copy.copy(llm)
+        limited_llm.rate_limit = rate_limit
+        return limited_llm
 
     @classmethod
     def _llm_config_defaults(cls) -> dict[str, str | GeneralLlm | None]:
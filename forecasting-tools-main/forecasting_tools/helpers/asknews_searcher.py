@@ -43,51 +43,62 @@ class AskNewsSearcher:
     def get_formatted_news(self, query: str) -> str:
         return asyncio.run(self.get_formatted_news_async(query))
 
-    async def get_formatted_news_async(self, query: str) -> str:
+    async def get_formatted_news_async(
+        self, query: str, sdk: AsyncAskNewsSDK | None = None
+    ) -> str:
         """
         Use the AskNews `news` endpoint to get news context for your query.
         The full API reference can be found here: https://docs.asknews.app/en/reference#get-/v1/news/search
+
+        Pass a long-lived `sdk` (with the "news" scope) to reuse its connections
+        and token across queries. It is not closed here.
         """
+        if sdk is not None:
+            return await self._get_formatted_news_with_sdk(sdk, query)
         async with AsyncAskNewsSDK(
             client_id=self.client_id,
             client_secret=self.client_secret,
             scopes=set(["news"]),
         ) as ask:
+            return await self._get_formatted_news_with_sdk(ask, query)
 
-            # get the latest news related to the query (within the past 48 hours)
-            hot_response = await ask.news.search_news(
-                query=query,  # your natural language query
-                n_articles=6,  # control the number of articles to include in the context, originally 5
-                return_type="both",
-                strategy="latest news",  # enforces looking at the latest news only
-            )
-
-            await asyncio.sleep(
-                self._default_rate_limit
-            )  # free tier AskNews has a ratelimit of 1 call per 10 seconds
+    async def _get_formatted_news_with_sdk(
+        self, ask: AsyncAskNewsSDK, query: str
+    ) -> str:
+        # get the latest news related to the query (within the past 48 hours)
+        hot_response = await ask.news.search_news(
+            query=query,  # your natural language query
+            n_articles=6,  # control the number of articles to include in the context, originally 5
+            return_type="both",
+            strategy="latest news",  # enforces looking at the latest news only
+        )
 
-            # get context from the "historical" database that contains a news archive going back to 2023
-            historical_response = await ask.news.search_news(
-                query=query,
-                n_articles=10,
-                return_type="both",
-                strategy="news knowledge",  # looks for relevant news within the past 60 days
-            )
+        await asyncio.sleep(
+            self._default_rate_limit
+        )  # free tier AskNews has a ratelimit of 1 call per 10 seconds
 
-            hot_articles = hot_response.as_dicts
-            historical_articles = historical_response.as_dicts
-            formatted_articles = "Here are the relevant news articles:\n\n"
+        # get context from the "historical" database that contains a news archive going back to 2023
+        historical_response = await ask.news.search_news(
+            query=query,
+            n_articles=10,
+            return_type="both",
+            strategy="news knowledge",  # looks for relevant news within the past 60 days
+        )
 
-            if hot_articles:
-                formatted_articles += self._format_articles(hot_articles)
-            if historical_articles:
-                formatted_articles += self._format_articles(historical_articles)
-            if not hot_articles and not historical_articles:
-                formatted_articles += "No articles were found.\n\n"
-                return formatted_articles
+        hot_articles = hot_response.as_dicts
+        historical_articles = historical_response.as_dicts
+        formatted_articles = "Here are the relevant news articles:\n\n"
 
+        if hot_articles:
+            formatted_articles += self._format_articles(hot_articles)
+        if historical_articles:
+            formatted_articles += self._format_articles(historical_articles)
+        if not hot_articles and not historical_articles:
+            formatted_articles += "No articles were found.\n\n"
             return formatted_articles
 
+        return formatted_articles
+
     def _format_articles(self, articles: list[SearchResponseDictItem]) -> str:
         formatted_articles = ""
         sorted_articles = sorted(articles, key=lambda x: x.pub_date, reverse=True)
@@ -8,11 +8,12 @@ import math
 import os
 import random
 import re
-import time
+import weakref
 from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Any, Callable, List, Literal, TypeVar, overload
+from typing import Any, Callable, Coroutine, List, Literal, TypeVar, overload
 
+import aiohttp
 import pendulum
 import requests
 import typeguard
@@ -26,6 +27,10 @@ from forecasting_tools.data_models.questions import (
     MetaculusQuestion,
     QuestionBasicType,
 )
+from forecasting_tools.helpers.metaculus_post_cache import (
+    CachedPost,
+    MetaculusPostCache,
+)
 from forecasting_tools.util.misc import (
     add_timezone_to_dates_in_base_model,
     raise_for_status_with_additional_info,
@@ -35,6 +40,7 @@ logger = logging.getLogger(__name__)
 
 Q = TypeVar("Q", bound=MetaculusQuestion)
 T = TypeVar("T", bound=BaseModel)
+R = TypeVar("R")
 
 GroupQuestionMode = Literal["exclude", "unpack_subquestions"]
 """
@@ -131,8 +137,20 @@ class MetaculusClient:
     MAX_QUESTIONS_FROM_QUESTION_API_PER_REQUEST = 100
 
     def __init__(
-        self, base_url: str = "https://www.metaculus.com/api", timeout: int = 30
+        self,
+        base_url: str = "https://www.metaculus.com/api",
+        timeout: int = 30,
+        max_concurrent_requests: int = 5,
+        sleep_between_question_requests: tuple[float, float] = (2, 3),
+        post_cache: MetaculusPostCache | None = None,
     ):
+        """
+        :param max_concurrent_requests: Max requests in flight at once per event loop (async methods only).
+        :param sleep_between_question_requests: Range (in seconds) of the random politeness delay
+            before each page of questions is requested
+        :param post_cache: Persistent cache for post json. Defaults to a cache at
+            METACULUS_POST_CACHE_PATH if that environment variable is set, otherwise no caching.
+        """
         # TODO: Get this working using a pytest fixture or something similar
         # regular_base_url = "https://www.metaculus.com/api"
         # dev_base_url = "https://dev.metaculus.com/api"
@@ -142,8 +160,21 @@ class MetaculusClient:
         #     self.base_url = dev_base_url if is_testing else regular_base_url
         # else:
         #     self.base_url = base_url
+        assert max_concurrent_requests > 0, "Must allow at least one request"
         self.base_url = base_url
         self.timeout = timeout
+        self.max_concurrent_requests = max_concurrent_requests
+        self.sleep_between_question_requests = sleep_between_question_requests
+        self.post_cache = post_cache or MetaculusPostCache.from_environment()
+        self._session = requests.Session()
+        self._question_count_cache: dict[str, int] = {}
+        # aiohttp sessions and asyncio semaphores can only be used on the loop they were made in
+        self._async_sessions: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, aiohttp.ClientSession
+        ] = weakref.WeakKeyDictionary()
+        self._async_semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
 
     def post_question_comment(
         self,
@@ -152,20 +183,33 @@ class MetaculusClient:
         is_private: bool = True,
         included_forecast: bool = True,
     ) -> None:
-        response = requests.post(
+        response = self._session.post(
             f"{self.base_url}/comments/create/",
-            json={
-                "on_post": post_id,
-                "text": comment_text,
-                "is_private": is_private,
-                "included_forecast": included_forecast,
-            },
+            json=self._make_comment_payload(
+                post_id, comment_text, is_private, included_forecast
+            ),
             **self._get_auth_headers(),  # type: ignore
             timeout=self.timeout,
         )
         logger.info(f"Posted comment on post {post_id}")
         raise_for_status_with_additional_info(response)
 
+    async def post_question_comment_async(
+        self,
+        post_id: int,
+        comment_text: str,
+        is_private: bool = True,
+        included_forecast: bool = True,
+    ) -> None:
+        await self._make_request_async(
+            "POST",
+            f"{self.base_url}/comments/create/",
+            json_body=self._make_comment_payload(
+                post_id, comment_text, is_private, included_forecast
+            ),
+        )
+        logger.info(f"Posted comment on post {post_id}")
+
     def post_question_link(
         self,
         question1_id: int,
@@ -183,7 +227,7 @@ class MetaculusClient:
         :param link_type: only supports "causal" for now
         :return: id of the created link
         """
-        response = requests.post(
+        response = self._session.post(
             f"{self.base_url}/coherence/links/create/",
             json={
                 "question1_id": question1_id,
@@ -206,7 +250,7 @@ class MetaculusClient:
         direction is +1 for positive and -1 for negative
         strength is 1 for low, 2 for medium and 5 for high
         """
-        response = requests.get(
+        response = self._session.get(
             f"{self.base_url}/coherence/links/{question_id}",
             **self._get_auth_headers(),  # type: ignore
             timeout=self.timeout,
@@ -217,7 +261,7 @@ class MetaculusClient:
         return links
 
     def delete_question_link(self, link_id: int):
-        response = requests.delete(
+        response = self._session.delete(
             f"{self.base_url}/coherence/links/{link_id}/delete",
             **self._get_auth_headers(),  # type: ignore
             timeout=self.timeout,
@@ -228,7 +272,7 @@ class MetaculusClient:
     def get_needs_update_questions(
         self, question_id: int, last_datetime: datetime
     ) -> List[MetaculusQuestion]:
-        response = requests.get(
+        response = self._session.get(
             f"{self.base_url}/coherence/links/{question_id}/needs-update",
             **self._get_auth_headers(),  # type: ignore
             timeout=self.timeout,
@@ -242,13 +286,16 @@ class MetaculusClient:
         self, question_id: int, prediction_in_decimal: float
     ) -> None:
         logger.info(f"Posting prediction on question {question_id}")
-        if prediction_in_decimal < 0.001 or prediction_in_decimal > 0.999:
-            raise ValueError("Prediction value must be between 0.001 and 0.999")
-        payload = {
-            "probability_yes": prediction_in_decimal,
-        }
+        payload = self._make_binary_prediction_payload(prediction_in_decimal)
         self._post_question_prediction(question_id, payload)
 
+    async def post_binary_question_prediction_async(
+        self, question_id: int, prediction_in_decimal: float
+    ) -> None:
+        logger.info(f"Posting prediction on question {question_id}")
+        payload = self._make_binary_prediction_payload(prediction_in_decimal)
+        await self._post_question_prediction_async(question_id, payload)
+
     def post_numeric_question_prediction(
         self, question_id: int, cdf_values: list[float]
     ) -> None:
@@ -258,15 +305,16 @@ class MetaculusClient:
         In this case we use the cdf.
         """
         logger.info(f"Posting prediction on question {question_id}")
-        if not all(0 <= x <= 1 for x in cdf_values):
-            raise ValueError("All CDF values must be between 0 and 1")
-        if not all(a <= b for a, b in zip(cdf_values, cdf_values[1:])):
-            raise ValueError("CDF values must be monotonically increasing")
-        payload = {
-            "continuous_cdf": cdf_values,
-        }
+        payload = self._make_numeric_prediction_payload(cdf_values)
         self._post_question_prediction(question_id, payload)
 
+    async def post_numeric_question_prediction_async(
+        self, question_id: int, cdf_values: list[float]
+    ) -> None:
+        logger.info(f"Posting prediction on question {question_id}")
+        payload = self._make_numeric_prediction_payload(cdf_values)
+        await self._post_question_prediction_async(question_id, payload)
+
     def post_multiple_choice_question_prediction(
         self, question_id: int, options_with_probabilities: dict[str, float]
     ) -> None:
@@ -274,11 +322,19 @@ class MetaculusClient:
         If the question is multiple choice, forecast must be a dictionary that
         maps question.options labels to floats.
         """
-        payload = {
-            "probability_yes_per_category": options_with_probabilities,
-        }
+        payload = self._make_multiple_choice_prediction_payload(
+            options_with_probabilities
+        )
         self._post_question_prediction(question_id, payload)
 
+    async def post_multiple_choice_question_prediction_async(
+        self, question_id: int, options_with_probabilities: dict[str, float]
+    ) -> None:
+        payload = self._make_multiple_choice_prediction_payload(
+            options_with_probabilities
+        )
+        await self._post_question_prediction_async(question_id, payload)
+
     @overload
     def get_question_by_url(
         self,
@@ -337,14 +393,106 @@ class MetaculusClient:
         group_question_mode: GroupQuestionMode = "exclude",
     ) -> MetaculusQuestion | list[MetaculusQuestion]:
         logger.info(f"Retrieving question details for question {post_id}")
-        url = f"{self.base_url}/posts/{post_id}/"
-        response = requests.get(
-            url,
-            **self._get_auth_headers(),  # type: ignore
-            timeout=self.timeout,
+        cached_post, revalidation_headers = self._check_post_cache(post_id)
+        if cached_post is not None and not revalidation_headers:
+            json_question = cached_post.post_json
+        else:
+            auth_headers = self._get_auth_headers()["headers"]
+            response = self._session.get(
+                f"{self.base_url}/posts/{post_id}/",
+                headers={**auth_headers, **revalidation_headers},
+                timeout=self.timeout,
+            )
+            raise_for_status_with_additional_info(response)
+            json_question = self._get_post_json_and_update_cache(
+                post_id, response, cached_post
+            )
+        return self._post_json_to_single_question_or_group(
+            post_id, json_question, group_question_mode
         )
-        raise_for_status_with_additional_info(response)
+
+    @overload
+    async def get_question_by_post_id_async(
+        self,
+        post_id: int,
+        group_question_mode: Literal["exclude"] = "exclude",
+    ) -> MetaculusQuestion: ...
+
+    @overload
+    async def get_question_by_post_id_async(
+        self,
+        post_id: int,
+        group_question_mode: GroupQuestionMode = "exclude",
+    ) -> MetaculusQuestion | list[MetaculusQuestion]: ...
+
+    async def get_question_by_post_id_async(
+        self,
+        post_id: int,
+        group_question_mode: GroupQuestionMode = "exclude",
+    ) -> MetaculusQuestion | list[MetaculusQuestion]:
+        logger.info(f"Retrieving question details for question {post_id}")
+        cached_post, revalidation_headers = self._check_post_cache(post_id)
+        if cached_post is not None and not revalidation_headers:
+            json_question = cached_post.post_json
+        else:
+            response = await self._make_request_async(
+                "GET",
+                f"{self.base_url}/posts/{post_id}/",
+                headers=revalidation_headers,
+            )
+            json_question = self._get_post_json_and_update_cache(
+                post_id, response, cached_post
+            )
+        return self._post_json_to_single_question_or_group(
+            post_id, json_question, group_question_mode
+        )
+
+    def _check_post_cache(
+        self, post_id: int
+    ) -> tuple[CachedPost | None, dict[str, str]]:
+        """
+        Returns the usable cached post (if any) and the conditional headers to send.
+        A cached post with no headers can be used without a request.
+        """
+        if self.post_cache is None:
+            return None, {}
+        cached_post = self.post_cache.get(post_id)
+        if cached_post is None:
+            return None, {}
+        freshness = self.post_cache.get_freshness(cached_post)
+        if freshness == "fresh":
+            logger.info(f"Using cached post json for post {post_id}")
+            return cached_post, {}
+        if freshness == "needs_revalidation":
+            return cached_post, self.post_cache.get_revalidation_headers(cached_post)
+        return None, {}
+
+    def _get_post_json_and_update_cache(
+        self,
+        post_id: int,
+        response: requests.Response,
+        cached_post: CachedPost | None,
+    ) -> dict:
+        if response.status_code == 304 and cached_post is not None:
+            logger.info(f"Post {post_id} is unchanged since it was cached")
+            assert self.post_cache is not None
+            self.post_cache.mark_validated(post_id)
+            return cached_post.post_json
         json_question = json.loads(response.content)
+        if self.post_cache is not None:
+            self.post_cache.put(
+                json_question,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return json_question
+
+    def _post_json_to_single_question_or_group(
+        self,
+        post_id: int,
+        json_question: dict,
+        group_question_mode: GroupQuestionMode,
+    ) -> MetaculusQuestion | list[MetaculusQuestion]:
         metaculus_questions = self._post_json_to_questions_while_handling_groups(
             json_question, group_question_mode
         )
@@ -405,6 +553,17 @@ class MetaculusClient:
         self,
         tournament_id: int | str,
         group_question_mode: GroupQuestionMode = "unpack_subquestions",
+    ) -> list[MetaculusQuestion]:
+        return self._run_coroutine_synchronously(
+            self.get_all_open_questions_from_tournament_async(
+                tournament_id, group_question_mode
+            )
+        )
+
+    async def get_all_open_questions_from_tournament_async(
+        self,
+        tournament_id: int | str,
+        group_question_mode: GroupQuestionMode = "unpack_subquestions",
     ) -> list[MetaculusQuestion]:
         logger.info(f"Retrieving questions from tournament {tournament_id}")
         api_filter = ApiFilter(
@@ -412,7 +571,7 @@ class MetaculusClient:
             allowed_statuses=["open"],
             group_question_mode=group_question_mode,
         )
-        questions = asyncio.run(self.get_questions_matching_filter(api_filter))
+        questions = await self.get_questions_matching_filter(api_filter)
         logger.info(
             f"Retrieved {len(questions)} questions from tournament {tournament_id}"
         )
@@ -448,7 +607,7 @@ class MetaculusClient:
             open_time_gt=date_into_past,
             group_question_mode=group_question_mode,
         )
-        questions = asyncio.run(
+        questions = self._run_coroutine_synchronously(
             self.get_questions_matching_filter(
                 api_filter,
                 num_questions=num_of_questions_to_return,
@@ -470,43 +629,219 @@ class MetaculusClient:
             }
         }
 
+    async def __aenter__(self) -> MetaculusClient:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Closes the pooled connection session for the current event loop
+        """
+        loop = asyncio.get_running_loop()
+        session = self._async_sessions.pop(loop, None)
+        self._async_semaphores.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _run_coroutine_synchronously(self, coroutine: Coroutine[Any, Any, R]) -> R:
+        try:
+            asyncio.get_running_loop()
+            loop_is_running = True
+        except RuntimeError:
+            loop_is_running = False
+
+        if loop_is_running:
+            # nest_asyncio runs this on the already running loop, so keep its session open for other callers
+            return asyncio.run(coroutine)
+
+        async def run_and_close_session() -> R:
+            try:
+                return await coroutine
+            finally:
+                await self.aclose()
+
+        return asyncio.run(run_and_close_session())
+
+    def _get_async_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._async_sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_concurrent_requests, keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._async_sessions[loop] = session
+        return session
+
+    def _get_async_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            self._async_semaphores[loop] = semaphore
+        return semaphore
+
+    async def _make_request_async(
+        self,
+        method: Literal["GET", "POST", "DELETE"],
+        url: str,
+        params: dict[str, Any] | None = None,
+        json_body: Any = None,
+        sleep_before_request: bool = False,
+        headers: dict[str, str] | None = None,
+    ) -> requests.Response:
+        """
+        Makes a request using the pooled session for the running event loop.
+        The result is converted to a requests.Response so that parsing and
+        error handling are shared with the synchronous methods.
+        """
+        session = self._get_async_session()
+        async with self._get_async_semaphore():
+            if sleep_before_request:
+                random_sleep_time = random.uniform(
+                    *self.sleep_between_question_requests
+                )
+                logger.debug(
+                    f"Sleeping for {random_sleep_time:.1f} seconds before next request"
+                )
+                await asyncio.sleep(random_sleep_time)
+            async with session.request(
+                method,
+                url,
+                params=self._to_query_pairs(params) if params else None,
+                json=json_body,
+                headers={**self._get_auth_headers()["headers"], **(headers or {})},
+            ) as async_response:
+                content = await async_response.read()
+                response = requests.Response()
+                response.status_code = async_response.status
+                response.reason = async_response.reason or ""
+                response.url = str(async_response.url)
+                response.headers.update(async_response.headers)
+                response.encoding = async_response.get_encoding()
+                response._content = content
+        raise_for_status_with_additional_info(response)
+        return response
+
+    @staticmethod
+    def _to_query_pairs(params: dict[str, Any]) -> list[tuple[str, str]]:
+        """
+        Encodes url params the same way requests does (lists become repeated keys)
+        since aiohttp only accepts string-like values
+        """
+        query_pairs: list[tuple[str, str]] = []
+        for key, value in params.items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            for item in values:
+                if item is not None:
+                    query_pairs.append((key, str(item)))
+        return query_pairs
+
+    @staticmethod
+    def _make_comment_payload(
+        post_id: int, comment_text: str, is_private: bool, included_forecast: bool
+    ) -> dict[str, Any]:
+        return {
+            "on_post": post_id,
+            "text": comment_text,
+            "is_private": is_private,
+            "included_forecast": included_forecast,
+        }
+
+    @staticmethod
+    def _make_binary_prediction_payload(prediction_in_decimal: float) -> dict:
+        if prediction_in_decimal < 0.001 or prediction_in_decimal > 0.999:
+            raise ValueError("Prediction value must be between 0.001 and 0.999")
+        return {
+            "probability_yes": prediction_in_decimal,
+        }
+
+    @staticmethod
+    def _make_numeric_prediction_payload(cdf_values: list[float]) -> dict:
+        if not all(0 <= x <= 1 for x in cdf_values):
+            raise ValueError("All CDF values must be between 0 and 1")
+        if not all(a <= b for a, b in zip(cdf_values, cdf_values[1:])):
+            raise ValueError("CDF values must be monotonically increasing")
+        return {
+            "continuous_cdf": cdf_values,
+        }
+
+    @staticmethod
+    def _make_multiple_choice_prediction_payload(
+        options_with_probabilities: dict[str, float],
+    ) -> dict:
+        return {
+            "probability_yes_per_category": options_with_probabilities,
+        }
+
+    @staticmethod
+    def _make_forecast_request_body(
+        question_id: int, forecast_payload: dict
+    ) -> list[dict]:
+        return [
+            {
+                "question": question_id,
+                "source": "api",
+                **forecast_payload,
+            },
+        ]
+
     def _post_question_prediction(
         self, question_id: int, forecast_payload: dict
     ) -> None:
         url = f"{self.base_url}/questions/forecast/"
-        response = requests.post(
+        response = self._session.post(
             url,
-            json=[
-                {
-                    "question": question_id,
-                    "source": "api",
-                    **forecast_payload,
-                },
-            ],
+            json=self._make_forecast_request_body(question_id, forecast_payload),
             **self._get_auth_headers(),  # type: ignore
             timeout=self.timeout,
         )
         logger.info(f"Posted prediction on question {question_id}")
         raise_for_status_with_additional_info(response)
 
-    def _get_questions_from_api(
+    async def _post_question_prediction_async(
+        self, question_id: int, forecast_payload: dict
+    ) -> None:
+        await self._make_request_async(
+            "POST",
+            f"{self.base_url}/questions/forecast/",
+            json_body=self._make_forecast_request_body(question_id, forecast_payload),
+        )
+        logger.info(f"Posted prediction on question {question_id}")
+
+    async def _get_questions_from_api(
         self, params: dict[str, Any], group_question_mode: GroupQuestionMode
     ) -> list[MetaculusQuestion]:
-        random_sleep_time = random.uniform(2, 3)
-        logger.debug(
-            f"Sleeping for {random_sleep_time:.1f} seconds before next request"
+        questions, _ = await self._get_questions_and_count_from_api(
+            params, group_question_mode
         )
-        time.sleep(random_sleep_time)
+        return questions
+
+    async def _get_questions_and_count_from_api(
+        self, params: dict[str, Any], group_question_mode: GroupQuestionMode
+    ) -> tuple[list[MetaculusQuestion], int | None]:
+        """
+        Returns the questions on the requested page and the total number of posts
+        matching the url params if the API reports it
+        """
         num_requested = params.get("limit")
         assert (
             num_requested is None
             or num_requested <= self.MAX_QUESTIONS_FROM_QUESTION_API_PER_REQUEST
         ), "You cannot get more than 100 questions at a time"
         url = f"{self.base_url}/posts/"
-        response = requests.get(url, params=params, **self._get_auth_headers(), timeout=self.timeout)  # type: ignore
-        raise_for_status_with_additional_info(response)
+        response = await self._make_request_async(
+            "GET", url, params=params, sleep_before_request=True
+        )
         data = json.loads(response.content)
         results = data["results"]
+        reported_count = data.get("count")
+        if self.post_cache is not None:
+            self.post_cache.put_many(results)
         supported_posts = [q for q in results if "notebook" not in q]
         removed_posts = [post for post in results if post not in supported_posts]
         if len(removed_posts) > 0:
@@ -527,7 +862,7 @@ class MetaculusClient:
                     f"Error processing post ID {q['id']}: {e.__class__.__name__} {e}"
                 )
 
-        return questions
+        return questions, reported_count if isinstance(reported_count, int) else None
 
     def _post_json_to_questions_while_handling_groups(
         self, post_json_from_api: dict, group_question_mode: GroupQuestionMode
@@ -580,7 +915,7 @@ class MetaculusClient:
         error_if_not_enough_questions: bool,
     ) -> list[MetaculusQuestion]:
         number_of_questions_matching_filter = (
-            self._determine_how_many_questions_match_filter(api_filter)
+            await self._determine_how_many_questions_match_filter(api_filter)
         )
         if (
             number_of_questions_matching_filter < num_questions
@@ -600,16 +935,26 @@ class MetaculusClient:
         available_page_indices = list(range(total_pages))
         random.shuffle(available_page_indices)
 
+        # Pages are requested in waves the size of the request limit so that
+        # we do not fetch many more pages than needed to hit the target
         questions: list[MetaculusQuestion] = []
-        for page_index in available_page_indices:
+        wave_size = self.max_concurrent_requests
+        for wave_start in range(0, len(available_page_indices), wave_size):
             if len(questions) >= target_qs_to_sample_from:
                 break
-
-            offset = page_index * questions_per_page
-            page_questions, _ = self._grab_filtered_questions_with_offset(
-                api_filter, offset
+            wave_page_indices = available_page_indices[
+                wave_start : wave_start + wave_size
+            ]
+            wave_results = await asyncio.gather(
+                *[
+                    self._grab_filtered_questions_with_offset(
+                        api_filter, page_index * questions_per_page
+                    )
+                    for page_index in wave_page_indices
+                ]
             )
-            questions.extend(page_questions)
+            for page_questions, _ in wave_results:
+                questions.extend(page_questions)
 
         if len(questions) < num_questions and error_if_not_enough_questions:
             raise ValueError(
@@ -633,7 +978,9 @@ class MetaculusClient:
         self, api_filter: ApiFilter, num_questions: int | None
     ) -> list[MetaculusQuestion]:
         if num_questions is None:
-            questions, _ = self._grab_filtered_questions_with_offset(api_filter, 0)
+            questions, _ = await self._grab_filtered_questions_with_offset(
+                api_filter, 0
+            )
             return questions
 
         questions: list[MetaculusQuestion] = []
@@ -642,7 +989,7 @@ class MetaculusClient:
         while len(questions) < num_questions and more_questions_available:
             offset = page_num * self.MAX_QUESTIONS_FROM_QUESTION_API_PER_REQUEST
             new_questions, continue_searching = (
-                self._grab_filtered_questions_with_offset(api_filter, offset)
+                await self._grab_filtered_questions_with_offset(api_filter, offset)
             )
             questions.extend(new_questions)
             if not continue_searching:
@@ -650,33 +997,34 @@ class MetaculusClient:
             page_num += 1
         return questions[:num_questions]
 
-    def _determine_how_many_questions_match_filter(self, filter: ApiFilter) -> int:
+    async def _determine_how_many_questions_match_filter(
+        self, filter: ApiFilter
+    ) -> int:
         """
-        Search Metaculus API with binary search to find the number of questions
-        matching the filter.
+        Find the number of questions matching the filter (before local filtering).
+        Uses the count reported by the API if available, otherwise searches
+        page offsets. Results are cached per filter for the life of the client.
         """
-        estimated_max_questions = 20000
-        left, right = 0, estimated_max_questions
-        last_successful_offset = 0
-
-        while left <= right:
-            mid = (left + right) // 2
-            offset = mid * self.MAX_QUESTIONS_FROM_QUESTION_API_PER_REQUEST
-
-            _, found_questions_before_running_local_filter = (
-                self._grab_filtered_questions_with_offset(filter, offset)
+        cache_key = filter.model_dump_json()
+        if cache_key in self._question_count_cache:
+            total_questions = self._question_count_cache[cache_key]
+            logger.info(
+                f"Using cached estimate of {total_questions} questions matching the filter -> {str(filter)[:200]}"
             )
+            return total_questions
 
-            if found_questions_before_running_local_filter:
-                left = mid + 1
-                last_successful_offset = offset
-            else:
-                right = mid - 1
-
-        final_page_questions, _ = self._grab_filtered_questions_with_offset(
-            filter, last_successful_offset
+        estimated_max_questions = 20000
+        url_params = self._create_url_params_for_search(filter, 0)
+        url_params["limit"] = 1
+        _, reported_count = await self._get_questions_and_count_from_api(
+            url_params, filter.group_question_mode
         )
-        total_questions = last_successful_offset + len(final_page_questions)
+        if reported_count is not None:
+            total_questions = reported_count
+        else:
+            total_questions = await self._search_for_number_of_questions(
+                filter, estimated_max_questions
+            )
 
         if total_questions >= estimated_max_questions:
             raise ValueError(
@@ -685,15 +1033,63 @@ class MetaculusClient:
         logger.info(
             f"Estimating that there are {total_questions} questions matching the filter -> {str(filter)[:200]}"
         )
+        self._question_count_cache[cache_key] = total_questions
         return total_questions
 
-    def _grab_filtered_questions_with_offset(
+    async def _search_for_number_of_questions(
+        self, filter: ApiFilter, estimated_max_questions: int
+    ) -> int:
+        """
+        Search Metaculus API for the last page with questions.
+        Each round probes several evenly spaced pages concurrently
+        (a k-ary rather than binary search) to cut down on round trips.
+        """
+        questions_per_page = self.MAX_QUESTIONS_FROM_QUESTION_API_PER_REQUEST
+        left, right = 0, estimated_max_questions // questions_per_page
+        last_successful_page = 0
+        probes_per_round = max(self.max_concurrent_requests, 1)
+
+        while left <= right:
+            step = max((right - left + 1) // (probes_per_round + 1), 1)
+            pages_to_probe = list(range(left + step - 1, right + 1, step))[
+                :probes_per_round
+            ]
+            probe_results = await asyncio.gather(
+                *[
+                    self._grab_filtered_questions_with_offset(
+                        filter, page * questions_per_page
+                    )
+                    for page in pages_to_probe
+                ]
+            )
+            found_questions_on_page = [
+                found_questions_before_running_local_filter
+                for _, found_questions_before_running_local_filter in probe_results
+            ]
+
+            new_left, new_right = left, right
+            for page, found_questions in zip(pages_to_probe, found_questions_on_page):
+                if found_questions:
+                    last_successful_page = max(last_successful_page, page)
+                    new_left = page + 1
+                else:
+                    new_right = page - 1
+                    break
+            left, right = new_left, new_right
+
+        last_successful_offset = last_successful_page * questions_per_page
+        final_page_questions, _ = await self._grab_filtered_questions_with_offset(
+            filter, last_successful_offset
+        )
+        return last_successful_offset + len(final_page_questions)
+
+    async def _grab_filtered_questions_with_offset(
         self,
         api_filter: ApiFilter,
         offset: int = 0,
     ) -> tuple[list[MetaculusQuestion], bool]:
         url_params = self._create_url_params_for_search(api_filter, offset)
-        questions = self._get_questions_from_api(
+        questions = await self._get_questions_from_api(
             url_params, api_filter.group_question_mode
         )
         questions_were_found_before_local_filter = len(questions) > 0
@@ -712,7 +1108,7 @@ class MetaculusClient:
         }
 
         if api_filter.allowed_types:
-            type_filter: list[QuestionFullType] = api_filter.allowed_types  # type: ignore
+            type_filter: list[QuestionFullType] = list(api_filter.allowed_types)  # type: ignore
             if api_filter.group_question_mode == "unpack_subquestions":
                 type_filter.extend(["group_of_questions"])
             url_params["forecast_type"] = type_filter
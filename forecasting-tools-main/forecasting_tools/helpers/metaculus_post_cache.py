@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Literal
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from forecasting_tools.helpers.metaculus_client import MetaculusClient
+
+logger = logging.getLogger(__name__)
+
+CacheFreshness = Literal["fresh", "needs_revalidation", "expired"]
+
+
+class CachedPost(BaseModel):
+    post_id: int
+    post_json: dict
+    edited_at: str | None
+    etag: str | None
+    last_modified: str | None
+    fetched_at: datetime
+    validated_at: datetime
+
+
+class MetaculusPostCache:
+    """
+    Persistent SQLite cache of raw post json from the Metaculus API.
+
+    Post text (title, resolution criteria, fine print, etc.) rarely changes while
+    the community prediction changes constantly, so each field class gets its own TTL:
+    - Within `community_prediction_ttl` of the last validation a post is served without any request
+    - Within `static_content_ttl` of the last full download the post is conditionally
+      revalidated (If-None-Match/If-Modified-Since) and a 304 reuses the cached json
+    - After `static_content_ttl` the post is downloaded again in full
+
+    Posts seen in question listings are written through, and a newer `edited_at`
+    replaces whatever was cached for that post id.
+    """
+
+    DEFAULT_DB_PATH = "logs/cache/metaculus_posts.sqlite3"
+    CACHE_PATH_ENV_VAR = "METACULUS_POST_CACHE_PATH"
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DB_PATH,
+        community_prediction_ttl: timedelta = timedelta(minutes=25),
+        static_content_ttl: timedelta = timedelta(days=1),
+    ) -> None:
+        assert (
+            community_prediction_ttl <= static_content_ttl
+        ), "Community predictions cannot be cached longer than the post itself"
+        self.db_path = db_path
+        self.community_prediction_ttl = community_prediction_ttl
+        self.static_content_ttl = static_content_ttl
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS posts (
+                    post_id INTEGER PRIMARY KEY,
+                    post_json TEXT NOT NULL,
+                    edited_at TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at TEXT NOT NULL,
+                    validated_at TEXT NOT NULL
+                )
+                """
+            )
+
+    @classmethod
+    def from_environment(cls) -> MetaculusPostCache | None:
+        """
+        Returns a cache at the path in METACULUS_POST_CACHE_PATH, or None if it is not set
+        """
+        db_path = os.getenv(cls.CACHE_PATH_ENV_VAR)
+        if not db_path:
+            return None
+        return cls(db_path=db_path)
+
+    def get(self, post_id: int) -> CachedPost | None:
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT post_id, post_json, edited_at, etag, last_modified, "
+                "fetched_at, validated_at FROM posts WHERE post_id = ?",
+                (post_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedPost(
+            post_id=row[0],
+            post_json=json.loads(row[1]),
+            edited_at=row[2],
+            etag=row[3],
+            last_modified=row[4],
+            fetched_at=datetime.fromisoformat(row[5]),
+            validated_at=datetime.fromisoformat(row[6]),
+        )
+
+    def get_freshness(self, cached_post: CachedPost) -> CacheFreshness:
+        now = datetime.now(timezone.utc)
+        if now - cached_post.validated_at < self.community_prediction_ttl:
+            return "fresh"
+        if now - cached_post.fetched_at < self.static_content_ttl and (
+            cached_post.etag or cached_post.last_modified
+        ):
+            return "needs_revalidation"
+        return "expired"
+
+    @staticmethod
+    def get_revalidation_headers(cached_post: CachedPost) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if cached_post.etag:
+            headers["If-None-Match"] = cached_post.etag
+        if cached_post.last_modified:
+            headers["If-Modified-Since"] = cached_post.last_modified
+        return headers
+
+    def put(
+        self,
+        post_json: dict,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        self.put_many([post_json], etag=etag, last_modified=last_modified)
+
+    def put_many(
+        self,
+        post_jsons: list[dict],
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """
+        Stores freshly downloaded posts. Validators are only kept when given,
+        since listing pages do not have per-post ETags.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (
+                post_json["id"],
+                json.dumps(post_json),
+                post_json.get("edited_at"),
+                etag,
+                last_modified,
+                now,
+                now,
+            )
+            for post_json in post_jsons
+            if "id" in post_json
+        ]
+        if not rows:
+            return
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                """
+                INSERT INTO posts (
+                    post_id, post_json, edited_at, etag, last_modified, fetched_at, validated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(post_id) DO UPDATE SET
+                    post_json = excluded.post_json,
+                    edited_at = excluded.edited_at,
+                    etag = CASE
+                        WHEN excluded.etag IS NOT NULL THEN excluded.etag
+                        WHEN posts.edited_at IS excluded.edited_at THEN posts.etag
+                        ELSE NULL END,
+                    last_modified = CASE
+                        WHEN excluded.last_modified IS NOT NULL THEN excluded.last_modified
+                        WHEN posts.edited_at IS excluded.edited_at THEN posts.last_modified
+                        ELSE NULL END,
+                    fetched_at = excluded.fetched_at,
+                    validated_at = excluded.validated_at
+                """,
+                rows,
+            )
+
+    def mark_validated(self, post_id: int) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "UPDATE posts SET validated_at = ? WHERE post_id = ?",
+                (datetime.now(timezone.utc).isoformat(), post_id),
+            )
+
+    def clear(self) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM posts")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+
+async def warm_up_post_cache(
+    client: MetaculusClient,
+    tournament_ids: list[int | str],
+    post_ids: list[int],
+) -> int:
+    """
+    Downloads all open questions in the tournaments and the given posts through a
+    client that has a post cache, so later runs only need to revalidate them.
+    Returns the number of questions retrieved.
+    """
+    assert client.post_cache is not None, "Client must have a post cache to warm up"
+    async with client:
+        tournament_results = await asyncio.gather(
+            *[
+                client.get_all_open_questions_from_tournament_async(tournament_id)
+                for tournament_id in tournament_ids
+            ]
+        )
+        post_results = await asyncio.gather(
+            *[
+                client.get_question_by_post_id_async(
+                    post_id, group_question_mode="unpack_subquestions"
+                )
+                for post_id in post_ids
+            ]
+        )
+    num_questions = sum(len(questions) for questions in tournament_results)
+    for result in post_results:
+        num_questions += len(result) if isinstance(result, list) else 1
+    return num_questions
+
+
+if __name__ == "__main__":
+    from forecasting_tools.helpers.metaculus_client import MetaculusClient
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(
+        description="Pre-populate the persistent Metaculus post cache"
+    )
+    parser.add_argument(
+        "--db-path",
+        default=os.getenv(
+            MetaculusPostCache.CACHE_PATH_ENV_VAR, MetaculusPostCache.DEFAULT_DB_PATH
+        ),
+        help="Path of the SQLite cache file",
+    )
+    parser.add_argument(
+        "--tournaments",
+        nargs="*",
+        default=[],
+        help="Tournament ids or slugs whose open questions should be cached",
+    )
+    parser.add_argument(
+        "--post-ids",
+        nargs="*",
+        type=int,
+        default=[],
+        help="Individual post ids to cache",
+    )
+    args = parser.parse_args()
+    tournaments: list[int | str] = [
+        int(tournament) if tournament.isdigit() else tournament
+        for tournament in args.tournaments
+    ]
+    warm_up_client = MetaculusClient(
+        post_cache=MetaculusPostCache(db_path=args.db_path)
+    )
+    num_cached = asyncio.run(
+        warm_up_post_cache(warm_up_client, tournaments, args.post_ids)
+    )
+    logger.info(f"Cached {num_cached} questions in {args.db_path}")
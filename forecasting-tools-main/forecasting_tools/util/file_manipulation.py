@@ -3,12 +3,22 @@ import datetime as dat
 import functools
 import importlib.resources
 import json
+import math
+import mmap
 import os
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Iterator
 
 from PIL import Image
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Larger json files are parsed straight from a memory map instead of a copy in memory
+MEMORY_MAP_THRESHOLD_BYTES = 64 * 1024 * 1024
+
 
 def normalize_package_path(path_in_package: str | Path) -> str:
     if isinstance(path_in_package, Path):
@@ -54,17 +64,32 @@ def load_json_file(project_file_path: str) -> list[dict]:
     @param project_file_path: The path of the json file starting from top of package
     """
     full_file_path = normalize_package_path(project_file_path)
+    if orjson is not None:
+        with open(full_file_path, "rb") as binary_file:
+            if os.fstat(binary_file.fileno()).st_size < MEMORY_MAP_THRESHOLD_BYTES:
+                return orjson.loads(binary_file.read())
+            with mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return orjson.loads(view)
     with open(full_file_path, "r") as file:
         return json.load(file)
 
 
 def load_jsonl_file(file_path_in_package: str) -> list[dict]:
+    return list(iterate_jsonl_file(file_path_in_package))
+
+
+def iterate_jsonl_file(file_path_in_package: str) -> Iterator[dict]:
+    """
+    Yields one json object per line, so only one line is held in memory at a time.
+    Uses orjson if it is installed. Blank lines are skipped.
+    """
     full_file_path = normalize_package_path(file_path_in_package)
-    with open(full_file_path, "r") as file:
-        json_list = []
+    with open(full_file_path, "rb") as file:
         for line in file:
-            json_list.append(json.loads(line))
-        return json_list
+            if not line.strip():
+                continue
+            yield orjson.loads(line) if orjson is not None else json.loads(line)
 
 
 def load_text_file(file_path_in_package: str) -> str:
@@ -85,19 +110,49 @@ def write_text_file(file_path_in_package: str, text: str) -> None:
 
 @skip_if_file_writing_not_allowed
 def write_json_file(file_path_in_package: str, input: list[dict]) -> None:
-    json_string = json.dumps(input, indent=4)
+    json_string = _dump_json(input, indent=True)
     create_or_overwrite_file(file_path_in_package, json_string)
 
 
 @skip_if_file_writing_not_allowed
-def add_to_jsonl_file(file_path_in_package: str, input: list[dict] | dict) -> None:
+def add_to_jsonl_file(
+    file_path_in_package: str, input: list[dict] | dict, sync_to_disk: bool = False
+) -> None:
     if not file_path_in_package.endswith(".jsonl"):
         raise ValueError("File path must end with .jsonl")
     if isinstance(input, dict):
         input = [input]
-    json_strings = [json.dumps(item) for item in input]
+    json_strings = [_dump_json(item) for item in input]
     jsonl_string = "\n".join(json_strings) + "\n"
-    create_or_append_to_file(file_path_in_package, jsonl_string)
+    create_or_append_to_file(file_path_in_package, jsonl_string, sync_to_disk)
+
+
+def _dump_json(input: Any, indent: bool = False) -> str:
+    """
+    Dumps NaN and inf as null (like orjson and JavaScript do) rather than the invalid
+    JSON tokens the json module writes for them. Uses orjson if it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            input, option=orjson.OPT_INDENT_2 if indent else None
+        ).decode()
+    return json.dumps(
+        _replace_non_finite_floats(input),
+        indent=4 if indent else None,
+        allow_nan=False,
+    )
+
+
+def _replace_non_finite_floats(input: Any) -> Any:
+    if isinstance(input, float):
+        return input if math.isfinite(input) else None
+    if isinstance(input, dict):
+        return {
+            key: _replace_non_finite_floats(value) for key, value in input.items()
+        }
+    if isinstance(input, (list, tuple)):
+        return [_replace_non_finite_floats(value) for value in input]
+    return input
 
 
 @skip_if_file_writing_not_allowed
@@ -112,14 +167,21 @@ def create_or_overwrite_file(file_path_in_package: str, text: str) -> None:
 
 
 @skip_if_file_writing_not_allowed
-def create_or_append_to_file(file_path_in_package: str, text: str) -> None:
+def create_or_append_to_file(
+    file_path_in_package: str, text: str, sync_to_disk: bool = False
+) -> None:
     """
-    This function appends text to a file, and creates the file if it does not exist
+    This function appends text to a file, and creates the file if it does not exist.
+    If sync_to_disk is True, the text is guaranteed to be on disk when this returns
+    (i.e. it survives a machine crash, not just a process crash)
     """
     full_file_path = normalize_package_path(file_path_in_package)
     _create_directory_if_needed(full_file_path)
     with open(full_file_path, "a") as file:
         file.write(text)
+        if sync_to_disk:
+            file.flush()
+            os.fsync(file.fileno())
 
 
 def _create_directory_if_needed(file_path: str) -> None:
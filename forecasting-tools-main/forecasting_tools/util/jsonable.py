@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-import json
 import logging
 from abc import ABC
-from typing import Any, TypeVar
+from typing import Any, Iterator, TypeVar
 
 from pydantic import BaseModel
 
@@ -48,15 +47,25 @@ class Jsonable(ABC):
         cls: type[T], project_file_path: str
     ) -> list[T]:
         if project_file_path.endswith(".jsonl"):
-            jsons = file_manipulation.load_jsonl_file(project_file_path)
-        else:
-            jsons = file_manipulation.load_json_file(project_file_path)
+            return list(cls.iterate_objects_from_jsonl_file(project_file_path))
+        jsons = file_manipulation.load_json_file(project_file_path)
         assert isinstance(
             jsons, list
         ), f"The json file at {project_file_path} did not contain a list."
         objects = [cls.from_json(json) for json in jsons]
         return objects
 
+    @classmethod
+    def iterate_objects_from_jsonl_file(
+        cls: type[T], project_file_path: str
+    ) -> Iterator[T]:
+        """
+        Lazily yields objects one line at a time, so large files (e.g. benchmarks with
+        thousands of reports) never need to be fully held in memory as json
+        """
+        for json in file_manipulation.iterate_jsonl_file(project_file_path):
+            yield cls.from_json(json)
+
     @staticmethod
     def save_object_list_to_file_path(
         objects: list[T], file_path_from_top_of_project: str
@@ -77,12 +86,10 @@ class Jsonable(ABC):
 
     @staticmethod
     def _pydantic_model_to_dict(pydantic_model: BaseModel) -> dict:
-        json_string: str = pydantic_model.model_dump_json()
-        json_dict: dict = json.loads(json_string)
+        json_dict: dict = pydantic_model.model_dump(mode="json")
         return json_dict
 
     @staticmethod
     def _pydantic_model_from_dict(cls_type: type[BaseModel], json_dict: dict) -> Any:
-        json_string: str = json.dumps(json_dict)
-        pydantic_object = cls_type.model_validate_json(json_string)
+        pydantic_object = cls_type.model_validate(json_dict)
         return pydantic_object
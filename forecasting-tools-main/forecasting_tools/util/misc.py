@@ -32,7 +32,7 @@ def raise_for_status_with_additional_info(
             response_json = None
         error_message = f"HTTPError. Url: {response.url}. Response reason: {response_reason}. Response text: {response_text}. Response JSON: {response_json}"
         logger.error(error_message)
-        raise requests.exceptions.HTTPError(error_message) from e
+        raise requests.exceptions.HTTPError(error_message, response=response) from e
 
 
 def is_markdown_citation(v: str) -> bool:
@@ -28,6 +28,12 @@ from forecasting_tools import (
 )
 
 from forecasting_tools.data_models.numeric_report import Percentile
+from forecasting_tools.ai_models.resource_managers.adaptive_concurrency_limiter import (
+    get_shared_concurrency_limiter,
+)
+from forecasting_tools.ai_models.resource_managers.llm_rate_limiter import (
+    get_shared_llm_rate_limiter,
+)
 
 # AGForecast Imports
 from ag_forecast.src.backends.openrouter_backend import OpenRouterBackend
@@ -42,6 +48,9 @@ from ag_forecast.src.community.community import Community
 from ag_forecast.src.consensus.base import MeanConsensus
 from ag_forecast.src.workflows.schema_agent import SchemaAgent
 from ag_forecast.src.utils.logger import ForecastLogger
+from ag_forecast.src.utils.http_clients import close_shared_http_clients
+from ag_forecast.src.utils.search_cache import SearchCache
+from ag_forecast.src.utils.context_compactor import ContextCompactor
 
 logger = logging.getLogger(__name__)
 
@@ -86,9 +95,30 @@ class AGForecastBot(ForecastBot):
         else:
             self.ag_logger.info("ASKNEWS_CLIENT_ID or ASKNEWS_SECRET not found. AskNews will be disabled.")
         
+        # Keeps prompts from growing with every research round
+        self.context_compactor = ContextCompactor(
+            summarizer=self.backend_simple,
+            agent_token_budgets={
+                "retrieval": 8000,
+                "analyst": 12000,
+                "supervisor": 12000,
+                "schema": 6000,
+                "researchers": 16000,
+            },
+            summarize_after_tokens=10000,
+        )
+        
         # Initialize Agents
         # Simple LLM calls: Agentic Retrieval, Analyst, Schema Agent
-        self.retrieval = AgenticRetrieval(self.backend_simple, self.data_mcps, max_rounds=3, logger=self.ag_logger)
+        # Kept on disk so the next scheduled run reuses today's searches
+        self.retrieval = AgenticRetrieval(
+            self.backend_simple,
+            self.data_mcps,
+            max_rounds=3,
+            logger=self.ag_logger,
+            search_cache=SearchCache(directory="logs/cache/searches"),
+            context_compactor=self.context_compactor,
+        )
         self.analyst = AnalystAgent(self.backend_simple, logger=self.ag_logger)
         self.schema_agent = SchemaAgent(self.backend_simple, logger=self.ag_logger)
         
@@ -100,9 +130,9 @@ class AGForecastBot(ForecastBot):
         # 2. o3-mini-high
         # 3. Claude Sonnet 4.5
         self.researchers = [
-            ResearcherAgent(self.backend_c1, logger=self.ag_logger, agent_id=1),
-            ResearcherAgent(self.backend_c2, logger=self.ag_logger, agent_id=2),
-            ResearcherAgent(self.backend_c3, logger=self.ag_logger, agent_id=3)
+            ResearcherAgent(self.backend_c1, logger=self.ag_logger, agent_id=1, streaming=True),
+            ResearcherAgent(self.backend_c2, logger=self.ag_logger, agent_id=2, streaming=True),
+            ResearcherAgent(self.backend_c3, logger=self.ag_logger, agent_id=3, streaming=True)
         ]
         self.community = Community(self.researchers, logger=self.ag_logger)
         self.consensus = MeanConsensus()
@@ -116,9 +146,29 @@ class AGForecastBot(ForecastBot):
             community=self.community,
             consensus=self.consensus,
             max_loop_rounds=3,
-            logger=self.ag_logger
+            logger=self.ag_logger,
+            # Overlap research stages and stop after 15 minutes so questions finish well before close
+            speculative=True,
+            latency_budget_seconds=15 * 60,
+            context_compactor=self.context_compactor,
         )
 
+    async def forecast_questions(self, *args, **kwargs):
+        try:
+            return await super().forecast_questions(*args, **kwargs)
+        finally:
+            # Pooled search connections belong to this event loop
+            if self._forecast_runs_in_progress == 0:
+                await close_shared_http_clients()
+                # Every backend and GeneralLlm share this limiter, so it shows queueing per provider/model
+                self.ag_logger.info(f"LLM concurrency: {get_shared_concurrency_limiter().summary()}")
+                self.ag_logger.info(f"LLM rate limits: {get_shared_llm_rate_limiter().summary()}")
+
+    async def _run_individual_question(self, question: MetaculusQuestion):
+        # Each question logs to its own directory so concurrent questions do not collide
+        with self.ag_logger.question_scope(question.page_url or question.question_text):
+            return await super()._run_individual_question(question)
+
     async def run_research(self, question: MetaculusQuestion) -> str:
         """
         Runs the iterative research workflow to gather insights.
@@ -514,9 +564,7 @@ if __name__ == "__main__":
         
         async def run_local():
             # Initialize Notepad manually for local test
-            notepad = await bot._initialize_notepad(question)
-            async with bot._note_pad_lock:
-                bot._note_pads.append(notepad)
+            await bot._register_notepad(question)
             
             try:
                 # 1. Research
@@ -0,0 +1,142 @@
+import gzip
+import json
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class EventIndex:
+    """
+    Byte offsets of every event in one events file, plus lookups by source,
+    event_type and parent id. The index is extended incrementally: when the file
+    grows only the new lines are parsed, and nothing is re-read while its
+    mtime and size are unchanged. A trailing line that is still being written is
+    left for the next refresh. Gzipped files are decompressed into memory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.compressed = path.endswith(".gz")
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.offsets: List[Tuple[int, int]] = []
+        self.by_source: Dict[str, List[int]] = defaultdict(list)
+        self.by_event_type: Dict[str, List[int]] = defaultdict(list)
+        self.by_parent_id: Dict[str, List[int]] = defaultdict(list)
+        self._indexed_bytes = 0
+        self._signature: Optional[Tuple[int, int]] = None
+        self._decompressed: Optional[bytes] = None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def refresh(self):
+        stat = os.stat(self.path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if signature == self._signature:
+                return
+            if self.compressed or stat.st_size < self._indexed_bytes:
+                # Rewritten, truncated or compressed files cannot be extended in place
+                self._reset()
+            position = self._indexed_bytes
+            for line in self._iter_lines_from(position):
+                if not line.endswith(b"\n"):
+                    break
+                start = position
+                position += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                self._add(event, start, len(line))
+            self._indexed_bytes = position
+            self._signature = signature
+
+    def _iter_lines_from(self, position: int) -> Iterator[bytes]:
+        if self.compressed:
+            with gzip.open(self.path, "rb") as f:
+                self._decompressed = f.read()
+            lines = self._decompressed[position:].splitlines(keepends=True)
+            yield from lines
+            return
+        with open(self.path, "rb") as f:
+            f.seek(position)
+            yield from f
+
+    def _add(self, event: Dict[str, Any], start: int, length: int):
+        number = len(self.offsets)
+        self.offsets.append((start, length))
+        self.by_source[str(event.get("source"))].append(number)
+        self.by_event_type[str(event.get("event_type"))].append(number)
+        for parent_id in event.get("parent_ids") or []:
+            self.by_parent_id[str(parent_id)].append(number)
+
+    def find(
+        self,
+        source: Optional[str] = None,
+        event_type: Optional[str] = None,
+        parent_id: Optional[str] = None,
+        after: int = -1,
+    ) -> List[int]:
+        """Numbers (line order, 0-based) of the events matching all given filters."""
+        with self._lock:
+            candidates: Optional[set] = None
+            for lookup, key in [
+                (self.by_source, source),
+                (self.by_event_type, event_type),
+                (self.by_parent_id, parent_id),
+            ]:
+                if key is None:
+                    continue
+                matches = set(lookup.get(key, []))
+                candidates = matches if candidates is None else candidates & matches
+            if candidates is None:
+                return list(range(after + 1, len(self.offsets)))
+            return sorted(number for number in candidates if number > after)
+
+    def read(self, numbers: List[int]) -> List[Dict[str, Any]]:
+        with self._lock:
+            offsets = [self.offsets[number] for number in numbers]
+            if self.compressed:
+                data = self._decompressed or b""
+                return [json.loads(data[start:start + length]) for start, length in offsets]
+            events = []
+            with open(self.path, "rb") as f:
+                for start, length in offsets:
+                    f.seek(start)
+                    events.append(json.loads(f.read(length)))
+            return events
+
+
+class EventIndexCache:
+    """Keeps the indexes of the most recently used events files."""
+
+    def __init__(self, max_files: int = 32):
+        self.max_files = max_files
+        self._indexes: "OrderedDict[str, EventIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> EventIndex:
+        with self._lock:
+            index = self._indexes.get(path)
+            if index is None:
+                index = EventIndex(path)
+                self._indexes[path] = index
+            self._indexes.move_to_end(path)
+            while len(self._indexes) > self.max_files:
+                self._indexes.popitem(last=False)
+        index.refresh()
+        return index
+
+
+def project_fields(event: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Keeps only the given top level fields (e.g. to leave out large `output` payloads)."""
+    if not fields:
+        return event
+    return {field: event[field] for field in fields if field in event}
@@ -1,10 +1,15 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
+from typing import Optional
+import asyncio
 import os
 import json
+import re
 import httpx
 
+from event_index import EventIndexCache, project_fields
+
 app = FastAPI()
 
 app.add_middleware(
@@ -20,31 +25,122 @@ app.add_middleware(
 # and logs are in kairosity_bot_final/logs
 LOGS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../logs"))
 
+EVENT_INDEXES = EventIndexCache()
+TAIL_POLL_INTERVAL_SECONDS = 0.5
+KEEP_ALIVE_EVERY_N_POLLS = 30
+
+# The run list only changes when an entry is added to or removed from LOGS_DIR
+_runs_cache = {"mtime_ns": None, "runs": []}
+
 @app.get("/runs")
 async def get_runs():
-    runs = []
     if not os.path.exists(LOGS_DIR):
         return []
-    for run_id in sorted(os.listdir(LOGS_DIR), reverse=True):
-        run_path = os.path.join(LOGS_DIR, run_id)
-        if os.path.isdir(run_path):
-            runs.append(run_id)
-    return runs
+    mtime_ns = os.stat(LOGS_DIR).st_mtime_ns
+    if _runs_cache["mtime_ns"] != mtime_ns:
+        runs = []
+        for run_id in sorted(os.listdir(LOGS_DIR), reverse=True):
+            run_path = os.path.join(LOGS_DIR, run_id)
+            if os.path.isdir(run_path):
+                runs.append(run_id)
+        _runs_cache.update(mtime_ns=mtime_ns, runs=runs)
+    return _runs_cache["runs"]
+
+def _find_events_path(run_id: str, question_id: Optional[str] = None) -> str:
+    """The run's own events file, or the events file of one of its questions."""
+    if os.path.basename(run_id) != run_id or run_id in ("", ".", ".."):
+        raise HTTPException(status_code=400, detail="Invalid run id")
+    directory = os.path.join(LOGS_DIR, run_id)
+    if question_id is not None:
+        if not re.fullmatch(r"[a-zA-Z0-9]+", question_id):
+            raise HTTPException(status_code=400, detail="Invalid question id")
+        questions_dir = os.path.join(directory, "questions")
+        matches = [
+            name for name in (os.listdir(questions_dir) if os.path.isdir(questions_dir) else [])
+            if name.endswith(f"_{question_id}")
+        ]
+        if not matches:
+            raise HTTPException(status_code=404, detail="Question not found")
+        directory = os.path.join(questions_dir, matches[0])
+    for file_name in ["events.jsonl", "events.jsonl.gz"]:
+        events_path = os.path.join(directory, file_name)
+        if os.path.exists(events_path):
+            return events_path
+    raise HTTPException(status_code=404, detail="Events file not found")
+
+def _parse_fields(fields: Optional[str]) -> Optional[list]:
+    return [field.strip() for field in fields.split(",") if field.strip()] if fields else None
 
 @app.get("/runs/{run_id}/events")
-async def get_run_events(run_id: str):
-    events_path = os.path.join(LOGS_DIR, run_id, "events.jsonl")
-    if not os.path.exists(events_path):
-        raise HTTPException(status_code=404, detail="Events file not found")
-    
-    events = []
-    with open(events_path, "r") as f:
-        for line in f:
-            try:
-                events.append(json.loads(line))
-            except:
-                pass
-    return events
+async def get_run_events(
+    run_id: str,
+    response: Response,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    source: Optional[str] = None,
+    event_type: Optional[str] = None,
+    parent_id: Optional[str] = None,
+    question_id: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """
+    Events of a run (or of one of its questions) in the order they were logged.
+    Supports filtering, pagination (`offset`/`limit`, total in the X-Total-Count header)
+    and returning only some fields, e.g. `fields=event_id,source,event_type,parent_ids`.
+    """
+    index = EVENT_INDEXES.get(_find_events_path(run_id, question_id))
+    numbers = index.find(source=source, event_type=event_type, parent_id=parent_id)
+    response.headers["X-Total-Count"] = str(len(numbers))
+    page = numbers[offset:] if limit is None else numbers[offset:offset + limit]
+    field_list = _parse_fields(fields)
+    return [project_fields(event, field_list) for event in index.read(page)]
+
+@app.get("/runs/{run_id}/events/stream")
+async def stream_run_events(
+    run_id: str,
+    request: Request,
+    after: int = -1,
+    source: Optional[str] = None,
+    event_type: Optional[str] = None,
+    question_id: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """
+    Server-sent events: every event logged after event number `after`, then new events
+    as they are appended. Reconnecting clients resume from their Last-Event-ID.
+    """
+    events_path = _find_events_path(run_id, question_id)
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id is not None and last_event_id.isdigit():
+        after = int(last_event_id)
+    field_list = _parse_fields(fields)
+
+    async def event_stream():
+        last_sent = after
+        idle_polls = 0
+        while not await request.is_disconnected():
+            index = EVENT_INDEXES.get(events_path)
+            numbers = index.find(source=source, event_type=event_type, after=last_sent)
+            for number, event in zip(numbers, index.read(numbers)):
+                yield f"id: {number}\ndata: {json.dumps(project_fields(event, field_list))}\n\n"
+            if numbers:
+                last_sent = numbers[-1]
+                idle_polls = 0
+            else:
+                idle_polls += 1
+                if idle_polls % KEEP_ALIVE_EVERY_N_POLLS == 0:
+                    # Comment line so proxies keep the connection open
+                    yield ": keep-alive\n\n"
+            await asyncio.sleep(TAIL_POLL_INTERVAL_SECONDS)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@app.get("/runs/{run_id}/events/{event_number}")
+async def get_run_event(run_id: str, event_number: int, question_id: Optional[str] = None):
+    index = EVENT_INDEXES.get(_find_events_path(run_id, question_id))
+    if not 0 <= event_number < len(index):
+        raise HTTPException(status_code=404, detail="Event not found")
+    return index.read([event_number])[0]
 
 @app.get("/proxy")
 async def proxy(url: str):
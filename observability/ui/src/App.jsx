@@ -9,6 +9,35 @@ import ConsensusStage from './components/ConsensusStage';
 
 const API_BASE = 'http://localhost:8000';
 
+async function fetchJson(url) {
+  const res = await fetch(url);
+  if (!res.ok) throw new Error(`${res.status} ${res.statusText} for ${url}`);
+  return res.json();
+}
+
+// The run's own events file only holds a `question_started` pointer per question,
+// each question's events are in its own file. They are merged in after their pointer.
+async function fetchRunEvents(runId) {
+  const runEvents = await fetchJson(`${API_BASE}/runs/${runId}/events`);
+  const questionIds = runEvents
+    .filter(event => event.event_type === 'question_started' && event.output?.question_id)
+    .map(event => event.output.question_id);
+  const questionEvents = await Promise.all(questionIds.map(questionId =>
+    fetchJson(`${API_BASE}/runs/${runId}/events?question_id=${encodeURIComponent(questionId)}`)
+      .catch(err => {
+        console.error(`Failed to fetch events of question ${questionId}:`, err);
+        return [];
+      })
+  ));
+  const eventsByQuestion = new Map(questionIds.map((questionId, i) => [questionId, questionEvents[i]]));
+
+  return runEvents.flatMap(event =>
+    event.event_type === 'question_started'
+      ? [event, ...(eventsByQuestion.get(event.output?.question_id) || [])]
+      : [event]
+  );
+}
+
 function App() {
   const [runs, setRuns] = useState([]);
   const [selectedRun, setSelectedRun] = useState(null);
@@ -32,16 +61,20 @@ function App() {
 
   // Fetch events
   useEffect(() => {
-    if (selectedRun) {
-      fetch(`${API_BASE}/runs/${selectedRun}/events`)
-        .then(res => res.json())
-        .then(data => {
-          setEvents(data);
-          setStages(buildWorkflowHierarchy(data));
-          setGraphData(buildGraphData(data));
-        })
-        .catch(err => console.error("Failed to fetch events:", err));
-    }
+    if (!selectedRun) return;
+    // Ignores a slow response for a run that is no longer selected
+    let isCurrent = true;
+    fetchRunEvents(selectedRun)
+      .then(data => {
+        if (!isCurrent) return;
+        setEvents(data);
+        setStages(buildWorkflowHierarchy(data));
+        setGraphData(buildGraphData(data));
+      })
+      .catch(err => console.error("Failed to fetch events:", err));
+    return () => {
+      isCurrent = false;
+    };
   }, [selectedRun]);
 
   return (
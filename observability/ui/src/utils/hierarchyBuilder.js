@@ -132,7 +132,8 @@ export function buildGraphData(events) {
     const edges = [];
 
     events.forEach((event, index) => {
-        const nodeId = index.toString();
+        // Older runs have no event_id, their ids are the line numbers
+        const nodeId = (event.event_id ?? index).toString();
         const type = event.event_type;
         const source = event.source;
 